@@ -24,10 +24,10 @@ from typing import Final, Mapping, Sequence
 import numpy as np
 import torch
 
-from moviepy import AudioFileClip
 from pyannote.audio import Pipeline
 
 from open_dubbing import logger
+from open_dubbing.audio_timeline import AudioTimeline
 from open_dubbing.pydub_audio_segment import AudioSegment
 
 _DEFAULT_DUBBED_VOCALS_AUDIO_FILE: Final[str] = "dubbed_vocals.mp3"
@@ -107,8 +107,9 @@ def _cut_and_save_audio(
     utterance: Mapping[str, str | float],
     prefix: str,
     output_directory: str,
+    audio_format: str = "mp3",
 ) -> str:
-    """Cuts a specified segment from an audio file, saves it as an MP3, and returns the path of the saved file.
+    """Cuts a specified segment from an audio file, saves it, and returns the path of the saved file.
 
     Args:
         audio: The audio file from which to extract the segment.
@@ -119,16 +120,17 @@ def _cut_and_save_audio(
           segment.
         output_directory: The directory path where the cut audio segment will be
           saved.
+        audio_format: The format of the saved file (wav, flac or mp3).
 
     Returns:
-        The path of the saved MP3 file.
+        The path of the saved file.
     """
     start_time_ms = int(utterance["start"] * 1000)
     end_time_ms = int(utterance["end"] * 1000)
     chunk = audio[start_time_ms:end_time_ms]
-    chunk_filename = f"{prefix}_{utterance['start']}_{utterance['end']}.mp3"
+    chunk_filename = f"{prefix}_{utterance['start']}_{utterance['end']}.{audio_format}"
     chunk_path = os.path.join(output_directory, chunk_filename)
-    chunk.export(chunk_path, format="mp3")
+    chunk.export(chunk_path, format=audio_format)
     return chunk_path
 
 
@@ -137,9 +139,12 @@ def run_cut_and_save_audio(
     utterance_metadata: Sequence[Mapping[str, float]],
     audio_file: str,
     output_directory: str,
+    audio_format: str = "mp3",
 ) -> Sequence[Mapping[str, float]]:
     """Cuts an audio file into chunks based on provided time ranges and saves each chunk to a file.
 
+    The chunks are saved in audio_format (wav, flac or mp3).
+
     Returns:
         A list of dictionaries, each containing the path to the saved chunk, and
         the original start and end times.
@@ -155,6 +160,7 @@ def run_cut_and_save_audio(
             utterance=utterance,
             prefix=prefix,
             output_directory=output_directory,
+            audio_format=audio_format,
         )
         utterance_copy = utterance.copy()
         utterance_copy[key] = chunk_path
@@ -168,11 +174,19 @@ def insert_audio_at_timestamps(
     background_audio_file: str,
     output_directory: str,
     input_srt: str | None = None,
+    dubbed_audio: Mapping[str, AudioSegment] | None = None,
 ) -> str:
-    """Inserts audio chunks into a background audio track at specified timestamps."""
+    """Inserts audio chunks into a background audio track at specified timestamps.
+
+    The chunks found in dubbed_audio, keyed by their path, are used from memory
+    instead of reading their files.
+    """
     background_audio = AudioSegment.from_mp3(background_audio_file)
     total_duration = background_audio.duration_seconds
-    output_audio = AudioSegment.silent(duration=total_duration * 1000)
+    del background_audio
+
+    # Each chunk is mixed as soon as it is decoded, keeping only one in memory
+    timeline = AudioTimeline(duration=total_duration)
     for item in utterance_metadata:
         _file = ""
         try:
@@ -192,10 +206,10 @@ def insert_audio_at_timestamps(
 
             start_time = int(item["start"] * 1000)
             logger().debug(f"insert_audio_at_timestamps. Open: {_file}")
-            audio_chunk = AudioSegment.from_mp3(_file)
-            output_audio = output_audio.overlay(
-                audio_chunk, position=start_time, loop=False
-            )
+            audio_chunk = dubbed_audio.get(_file) if dubbed_audio else None
+            if audio_chunk is None:
+                audio_chunk = AudioSegment.from_file(_file)
+            timeline.add(segment=audio_chunk, position=start_time)
         except Exception as e:
             start = int(item["start"])
             end = int(item["end"])
@@ -203,6 +217,8 @@ def insert_audio_at_timestamps(
                 f"insert_audio_at_timestamps. Error on file: {_file} at start time {start} and end at {end}, error: {e}"
             )
 
+    output_audio = timeline.to_audio_segment()
+
     dubbed_vocals_audio_file = os.path.join(
         output_directory, _DEFAULT_DUBBED_VOCALS_AUDIO_FILE
     )
@@ -210,28 +226,33 @@ def insert_audio_at_timestamps(
     return dubbed_vocals_audio_file
 
 
-def _needs_background_normalization(
-    *, background_audio_file: str, threshold: float = 0.1
-):
-    try:
-        chunk_size = 1024
-        fps = 44100
+def _get_peak_amplitude(audio: AudioSegment) -> float:
+    """Returns the peak amplitude of the audio scaled to the [0, 1] range."""
+    if len(audio.raw_data) == 0:
+        return 0
 
-        clip = AudioFileClip(background_audio_file)
-        duration = clip.duration
-        num_chunks = int(duration * fps / chunk_size)
+    samples = np.frombuffer(audio.raw_data, dtype=audio.array_type)
+    # Use max and -min instead of abs() to avoid overflowing on the most negative value
+    peak = max(int(samples.max()), -int(samples.min()))
+    return peak / audio.max_possible_amplitude
 
-        max_amplitude = 0
 
-        for i in range(num_chunks):
-            start = i * chunk_size / fps
-            end = (i + 1) * chunk_size / fps
-            audio_chunk = clip.subclipped(start, end).to_soundarray(fps=fps)
+def _needs_background_normalization(
+    *,
+    background_audio_file: str,
+    threshold: float = 0.1,
+    background_audio: AudioSegment | None = None,
+):
+    """Returns if the background needs to be normalized and its peak amplitude.
 
-            # Calculate maximum amplitude of this chunk
-            chunk_amplitude = np.abs(audio_chunk).max(axis=1).max()
-            max_amplitude = max(max_amplitude, chunk_amplitude)
+    The background is decoded once (or reused if background_audio is given) and
+    the peak is computed over all the samples at once.
+    """
+    try:
+        if background_audio is None:
+            background_audio = AudioSegment.from_file(background_audio_file)
 
+        max_amplitude = _get_peak_amplitude(background_audio)
         needs = max_amplitude > threshold
         logger().debug(
             f"_needs_background_normalization. max_amplitude: {max_amplitude}, needs {needs}"
@@ -242,9 +263,6 @@ def _needs_background_normalization(
         logger().error(f"_needs_background_normalization. Error: {e}")
         return True, 1.0
 
-    finally:
-        clip.close()
-
 
 def merge_background_and_vocals(
     *,
@@ -268,7 +286,8 @@ def merge_background_and_vocals(
     # If background normalization is not needed, we skip it since it sometimes raises up
     # residuals vocals not properly split in the demucs processes
     needs, max_amplitude = _needs_background_normalization(
-        background_audio_file=background_audio_file
+        background_audio_file=background_audio_file,
+        background_audio=background,
     )
     if needs:
         logger().info(
@@ -0,0 +1,134 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Final
+
+import numpy as np
+
+from open_dubbing.pydub_audio_segment import AudioSegment
+
+_SAMPLE_WIDTH_TO_DTYPE: Final[dict] = {1: np.int8, 2: np.int16, 4: np.int32}
+
+# Format of AudioSegment.silent(), which is the base track of the overlay path
+_BASE_FRAME_RATE: Final[int] = 11025
+_BASE_CHANNELS: Final[int] = 1
+_BASE_SAMPLE_WIDTH: Final[int] = 2
+
+
+class AudioTimeline:
+    """Mixes audio chunks into a single preallocated sample buffer.
+
+    Using AudioSegment.overlay once per chunk rebuilds the whole output every
+    time. The timeline allocates the buffer once and adds every chunk in place,
+    so the cost depends on the amount of audio inserted and not on the number
+    of chunks multiplied by the track length.
+
+    Like overlay, the buffer is converted to a higher frame rate, number of
+    channels or sample width when a chunk that has it is added.
+    """
+
+    def __init__(
+        self,
+        *,
+        duration: float,
+        frame_rate: int = _BASE_FRAME_RATE,
+        channels: int = _BASE_CHANNELS,
+        sample_width: int = _BASE_SAMPLE_WIDTH,
+    ):
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self._dtype = _SAMPLE_WIDTH_TO_DTYPE[sample_width]
+        frames = self._get_frame_count(duration)
+        self._samples = np.zeros((frames, channels), dtype=self._dtype)
+
+    def _get_frame_count(self, duration: float) -> int:
+        frames = int(_BASE_FRAME_RATE * duration)
+        if self.frame_rate != _BASE_FRAME_RATE and frames > 0:
+            # Same length that audioop.ratecv gives when the silent track is resampled
+            frames = (frames - 1) * self.frame_rate // _BASE_FRAME_RATE + 1
+
+        return self._round_to_milliseconds(frames)
+
+    def _round_to_milliseconds(self, frames: int) -> int:
+        # Overlay rebuilds the track from millisecond slices, rounding its length
+        milliseconds = round(1000 * frames / self.frame_rate)
+        return int(milliseconds * (self.frame_rate / 1000.0))
+
+    def _widen(self, segment: AudioSegment) -> None:
+        """Converts the buffer to the format that overlaying segment on it gives."""
+        frame_rate = max(self.frame_rate, segment.frame_rate)
+        channels = max(self.channels, segment.channels)
+        sample_width = max(self.sample_width, segment.sample_width)
+        if (frame_rate, channels, sample_width) == (
+            self.frame_rate,
+            self.channels,
+            self.sample_width,
+        ):
+            return
+
+        converted = (
+            self.to_audio_segment()
+            .set_channels(channels)
+            .set_frame_rate(frame_rate)
+            .set_sample_width(sample_width)
+        )
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self._dtype = _SAMPLE_WIDTH_TO_DTYPE[sample_width]
+        samples = np.frombuffer(converted.raw_data, dtype=self._dtype)
+        samples = samples.reshape(-1, channels)
+        self._samples = np.zeros(
+            (self._round_to_milliseconds(len(samples)), channels), dtype=self._dtype
+        )
+        frames = min(len(samples), len(self._samples))
+        self._samples[:frames] = samples[:frames]
+
+    def __len__(self):
+        """Returns the length of the timeline in milliseconds."""
+        return round(1000 * len(self._samples) / self.frame_rate)
+
+    def _to_timeline_format(self, segment: AudioSegment) -> np.ndarray:
+        segment = (
+            segment.set_channels(self.channels)
+            .set_frame_rate(self.frame_rate)
+            .set_sample_width(self.sample_width)
+        )
+        samples = np.frombuffer(segment.raw_data, dtype=self._dtype)
+        return samples.reshape(-1, self.channels)
+
+    def add(self, *, segment: AudioSegment, position: int) -> None:
+        """Adds a segment at the given position (milliseconds), clipping like audioop.add does."""
+        self._widen(segment)
+        start = int(position * (self.frame_rate / 1000.0))
+        if start >= len(self._samples):
+            return
+
+        samples = self._to_timeline_format(segment)
+        end = min(start + len(samples), len(self._samples))
+        region = self._samples[start:end]
+
+        info = np.iinfo(self._dtype)
+        mixed = region.astype(np.int64) + samples[: end - start]
+        np.clip(mixed, info.min, info.max, out=mixed)
+        region[:] = mixed
+
+    def to_audio_segment(self) -> AudioSegment:
+        return AudioSegment(
+            data=self._samples.tobytes(),
+            sample_width=self.sample_width,
+            frame_rate=self.frame_rate,
+            channels=self.channels,
+        )
@@ -108,10 +108,11 @@ class CommandLine:
             "--translator",
             type=str,
             default="nllb",
-            choices=["nllb", "apertium", "sotra", "passthrough"],
+            choices=["nllb", "nllb-ctranslate2", "apertium", "sotra", "passthrough"],
             help=(
                 "Translation engine to use. Choices are:\n"
                 "'nllb': Meta's no Language Left Behind (NLLB).\n"
+                "'nllb-ctranslate2': NLLB running on CTranslate2 with int8 weights (faster on CPU).\n"
                 "'apertium': Apertium compatible API server.\n"
                 "'sotra': A very custom implementation.\n"
                 "'passthrough': Do not translate at all.\n"
@@ -151,6 +152,19 @@ class CommandLine:
             action="store_true",
             help="clean intermediate files used during the dubbing process",
         )
+        parser.add_argument(
+            "--intermediate_format",
+            type=str,
+            default=None,
+            choices=["wav", "flac", "mp3"],
+            help=(
+                "Audio format of the intermediate chunk_* and dubbed_chunk_* files. Choices are:\n"
+                "'wav': no encoding, the fastest.\n"
+                "'flac': lossless and smaller than WAV.\n"
+                "'mp3': the smallest, convenient to inspect them.\n"
+                "Defaults to 'wav' with --clean-intermediate-files and to 'mp3' otherwise."
+            ),
+        )
 
         parser.add_argument(
             "--nllb_model",
@@ -161,6 +175,40 @@ class CommandLine:
             "'nllb-200-3.3B': gives best translation quality.\n"
             "'nllb-200-1.3B': is the fastest.\n",
         )
+        parser.add_argument(
+            "--translation_batch_size",
+            type=int,
+            default=8,
+            help="Number of segments translated in a single model call by the translation engines that support batching (NLLB)",
+        )
+        parser.add_argument(
+            "--translation_max_in_flight",
+            type=int,
+            default=4,
+            help="Maximum number of concurrent requests sent to the translation servers (Apertium and Sotra)",
+        )
+        parser.add_argument(
+            "--translation_max_request_chars",
+            type=int,
+            default=None,
+            help=(
+                "Maximum number of characters of the segments packed in a single request to the translation servers (Apertium and Sotra). "
+                "Use 0 to send one segment per request. "
+                "Defaults to 1000 for Apertium and to 0 for Sotra, since it may not keep one line per packed segment"
+            ),
+        )
+        parser.add_argument(
+            "--translation_cache_dir",
+            type=str,
+            default="",
+            help="Directory where translations are cached between runs. If not specified, translations are not cached",
+        )
+        parser.add_argument(
+            "--translation_cache_size",
+            type=int,
+            default=100000,
+            help="Maximum number of translations kept in the translation cache. The least recently used are removed",
+        )
 
         parser.add_argument(
             "--whisper_model",
@@ -191,7 +239,52 @@ class CommandLine:
             "--tts_api_server",
             type=str,
             default="",
-            help=("TTS api server URL when using the 'API' tts"),
+            help=(
+                "TTS api server URL when using the 'API' tts. "
+                "The text is sent to /speak with a form encoded POST, servers that only accept GET (answering 405) are called with GET"
+            ),
+        )
+        parser.add_argument(
+            "--tts_batch_size",
+            type=int,
+            default=8,
+            help="Maximum number of utterances synthesized in a single model call by the TTS engines that support batching (MMS)",
+        )
+        parser.add_argument(
+            "--tts_workers",
+            type=int,
+            default=1,
+            help="Number of utterances synthesized in parallel by the TTS engines that support it (edge, api, bamborak, openai, cli)",
+        )
+        parser.add_argument(
+            "--tts_hedge_percentile",
+            type=float,
+            default=0,
+            help="When using the 'api' or 'bamborak' TTS, send a duplicate request if a request takes longer than this percentile (e.g. 95) of the latencies measured during the run. 0 disables it",
+        )
+        parser.add_argument(
+            "--tts_coqui_max_memory",
+            type=int,
+            default=4096,
+            help="When using the 'coqui' TTS, maximum memory in MB used by the models kept loaded. The least recently used models are unloaded, but the one in use is always kept",
+        )
+        parser.add_argument(
+            "--tts_cache_dir",
+            type=str,
+            default="",
+            help="Directory where synthesized utterances are cached between runs. If not specified, they are not cached",
+        )
+        parser.add_argument(
+            "--tts_cache_size",
+            type=int,
+            default=1024,
+            help="Maximum disk space in MB used by the TTS cache. The least recently used clips are removed",
+        )
+        parser.add_argument(
+            "--tts_speaking_rate_file",
+            type=str,
+            default="",
+            help="File where the speaking rate of each voice is kept between runs. It is used to synthesize directly at the needed speed with the TTS that support speeds (edge). If not specified, the rates are only learned during the run",
         )
         parser.add_argument(
             "--update",
@@ -15,16 +15,23 @@
 import re
 import subprocess
 
+from collections import OrderedDict
+
 from TTS.api import TTS
 
+from open_dubbing import logger
+
 
 class Coqui:
     """Builds a list models available per each language"""
 
-    def __init__(self, device="cpu"):
+    def __init__(self, device="cpu", max_memory_mb: int = 4096):
         language_models = self._build_list_language_model()
         self.language_model = self._select_model_per_language(language_models)
         self.device = device
+        self.max_memory_mb = max_memory_mb
+        # model name -> (TTS instance, size in MB), least recently used first
+        self._models = OrderedDict()
 
     @property
     def languages_model(self):
@@ -81,9 +88,42 @@ class Coqui:
 
         return language_models
 
+    def _get_model_size_mb(self, tts) -> float:
+        size = 0
+        synthesizer = getattr(tts, "synthesizer", None)
+        for name in ["tts_model", "vocoder_model"]:
+            module = getattr(synthesizer, name, None)
+            if module is None:
+                continue
+
+            for parameter in module.parameters():
+                size += parameter.numel() * parameter.element_size()
+
+        return size / 1024**2
+
+    def _get_model(self, model: str):
+        """Returns a loaded TTS instance, loading it if needed and evicting the least recently used ones over the memory budget."""
+        if model in self._models:
+            self._models.move_to_end(model)
+            return self._models[model][0]
+
+        logger().debug(f"coqui._get_model. Loading model '{model}'")
+        tts = TTS(model).to(self.device)
+        self._models[model] = (tts, self._get_model_size_mb(tts))
+
+        # Always keep the model just loaded even if it does not fit in the budget
+        while len(self._models) > 1 and self._get_used_memory_mb() > self.max_memory_mb:
+            evicted, _ = self._models.popitem(last=False)
+            logger().debug(f"coqui._get_model. Evicted model '{evicted}'")
+
+        return tts
+
+    def _get_used_memory_mb(self) -> float:
+        return sum(size for _, size in self._models.values())
+
     def get_voices_language(self, language):
         model = self.language_model[language]
-        voices = TTS(model).speakers
+        voices = self._get_model(model).speakers
         #      print(f"voices: {voices}")
         return voices
 
@@ -91,7 +131,7 @@ class Coqui:
         self, input_text, language, file_path, voice=None, audio_config=None
     ):
         model = self.language_model[language]
-        tts = TTS(model).to(self.device)
+        tts = self._get_model(model)
         tts.tts_to_file(
             text=input_text, speaker=voice, split_sentences=False, file_path=file_path
         )
@@ -109,6 +109,7 @@ class Dubber:
         device_pyannote: str,
         cpu_threads: int = 0,
         clean_intermediate_files: bool = False,
+        intermediate_format: str = "mp3",
         original_subtitles: bool = False,
         dubbed_subtitles: bool = False,
         input_srt: str | None = None,
@@ -131,6 +132,7 @@ class Dubber:
         self.device_pyannote = device_pyannote
         self.cpu_threads = cpu_threads
         self.clean_intermediate_files = clean_intermediate_files
+        self.intermediate_format = intermediate_format
         self.preprocessing_output = None
         self.original_subtitles = original_subtitles
         self.dubbed_subtitles = dubbed_subtitles
@@ -167,6 +169,14 @@ class Dubber:
 
         logger().info(f"Maximum memory used: {max_rss_self:.0f} MB")
 
+    def log_run_stats(self):
+        if self.translation.cache is not None:
+            self.translation.cache.log_stats()
+        if self.tts.cache is not None:
+            self.tts.cache.log_stats()
+        self.tts.speaking_rate.log_stats()
+        self.tts.log_stats()
+
     def log_debug_task_and_getime(self, text, start_time):
         process = psutil.Process(os.getpid())
         current_rss = process.memory_info().rss / 1024**2
@@ -253,6 +263,7 @@ class Dubber:
             utterance_metadata=utterance_metadata,
             audio_file=audio_file,
             output_directory=self.output_directory,
+            audio_format=self.intermediate_format,
         )
         self.utterance_metadata = utterance_metadata
         self.preprocessing_output = PreprocessingArtifacts(
@@ -323,6 +334,10 @@ class Dubber:
             assigned_voices=assigned_voices,
         )
 
+    def run_text_to_speech_warm_up(self) -> None:
+        """Loads the Text-To-Speech models before synthesizing any utterance."""
+        self.tts.warm_up(target_language=self.target_language)
+
     def run_text_to_speech(self) -> None:
         """Converts translated text to speech and dubs utterance"""
         self.utterance_metadata = self.tts.dub_utterances(
@@ -366,6 +381,7 @@ class Dubber:
             background_audio_file=self.preprocessing_output.audio_background_file,
             output_directory=self.output_directory,
             input_srt=self.input_srt,
+            dubbed_audio=self.tts.dubbed_audio,
         )
         dubbed_audio_file = audio_processing.merge_background_and_vocals(
             background_audio_file=self.preprocessing_output.audio_background_file,
@@ -444,6 +460,7 @@ class Dubber:
             assigned_voices=assigned_voices,
         )
 
+        self.run_text_to_speech_warm_up()
         self.utterance_metadata = self.tts.dub_utterances(
             utterance_metadata=self.utterance_metadata,
             output_directory=self.output_directory,
@@ -470,6 +487,7 @@ class Dubber:
             per = _time * 100 / total_time
             logger().info(f" Task '{task}' in {_time:.2f} secs ({per:.2f}%)")
 
+        self.log_run_stats()
         self.log_maxrss_memory()
         logger().info("Output files saved in: %s.", self.output_directory)
 
@@ -564,6 +582,7 @@ class Dubber:
 
         task_start_time = time.time()
         self.run_configure_text_to_speech()
+        self.run_text_to_speech_warm_up()
         self.run_text_to_speech()
         times["tts"] = self.log_debug_task_and_getime(
             "Text to speech completed", task_start_time
@@ -586,6 +605,7 @@ class Dubber:
             per = _time * 100 / total_time
             logger().info(f" Task '{task}' in {_time:.2f} secs ({per:.2f}%)")
 
+        self.log_run_stats()
         self.log_maxrss_memory()
         if logger().getEffectiveLevel() == logging.getLevelName("DEBUG"):
             self.stt.dump_transcriptions(
@@ -0,0 +1,166 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, TypeVar
+
+import numpy as np
+
+from open_dubbing import logger
+
+T = TypeVar("T")
+
+
+class HedgedRequests:
+    """Sends a duplicate request when the first one is slower than usual.
+
+    The latency of the requests is measured during the run. Once there are
+    min_samples measures, if a request is still pending after the given
+    percentile of the latencies a second identical request is sent, and the
+    first one that succeeds is used. The other one is left to finish in the
+    background and its result is discarded, so the requests must not have
+    side effects. A percentile of 0 disables hedging.
+
+    The latency measured is the time the function takes, so it must include
+    all the work of the request (e.g. downloading the body of a streamed
+    response), otherwise the hedges are sent too early.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        percentile: float = 0,
+        min_samples: int = 10,
+        max_samples: int = 200,
+        max_workers: int = 1,
+    ):
+        self.name = name
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._latencies = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self._executor = None
+        self.set_max_workers(max_workers)
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """Sizes the executor for max_workers concurrent calls.
+
+        Each call uses up to two threads, one for the request and one for its hedge.
+        """
+        if self.percentile <= 0:
+            return
+
+        executor = self._executor
+        self._executor = ThreadPoolExecutor(max_workers=2 * max_workers)
+        if executor is not None:
+            # The requests in flight finish in the background
+            executor.shutdown(wait=False)
+
+    def _get_hedge_delay(self) -> float | None:
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            return float(np.percentile(self._latencies, self.percentile))
+
+    def _add_latency(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    @staticmethod
+    def _close(result) -> None:
+        close = getattr(result, "close", None)
+        if close is not None:
+            close()
+
+    def _discard_when_done(self, future: Future, discard: Callable[[T], None]) -> None:
+        """Discards the result of a request that lost the race once it finishes."""
+
+        def _discard(future: Future) -> None:
+            if future.cancelled() or future.exception() is not None:
+                return
+            try:
+                discard(future.result())
+            except Exception as e:
+                logger().warning(f"{self.name}. Error discarding a result: {e}")
+
+        future.add_done_callback(_discard)
+
+    def call(
+        self,
+        function: Callable[[], T],
+        discard: Callable[[T], None] | None = None,
+    ) -> T:
+        """Calls function, hedging it if it is slower than usual.
+
+        discard releases the result of the request that loses the race. By
+        default the result is closed if it has a close method (e.g. a
+        requests.Response that would hold its connection otherwise).
+        """
+        if self._executor is None:
+            return function()
+
+        if discard is None:
+            discard = self._close
+
+        start_time = time.monotonic()
+        delay = self._get_hedge_delay()
+        primary = self._executor.submit(function)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            result = primary.result()
+            self._add_latency(time.monotonic() - start_time)
+            return result
+
+        hedge = self._executor.submit(function)
+        with self._lock:
+            self.hedges_sent += 1
+        logger().debug(
+            f"{self.name}. Request pending after {delay:.2f} secs, sending hedged request"
+        )
+
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+
+                if future is hedge:
+                    with self._lock:
+                        self.hedges_won += 1
+                self._add_latency(time.monotonic() - start_time)
+                loser = hedge if future is primary else primary
+                self._discard_when_done(loser, discard)
+                return result
+
+        raise error
+
+    def log_stats(self) -> None:
+        if self._executor is None:
+            return
+
+        logger().info(
+            f"{self.name}. Hedged requests: {self.hedges_sent} sent, {self.hedges_won} won"
+        )
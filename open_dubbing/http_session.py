@@ -0,0 +1,62 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+
+from typing import Callable, Final, Tuple
+
+import requests
+
+from requests.adapters import HTTPAdapter
+
+# Seconds to connect and to wait for data while reading the response, so a
+# stalled server fails the request instead of holding it forever
+REQUEST_TIMEOUT: Final[Tuple[float, float]] = (10, 120)
+
+
+def create_session(*, pool_size: int) -> requests.Session:
+    """Creates a session that keeps alive up to pool_size connections per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def download_to_file(
+    response: requests.Response, filename: str, chunk_size: int = 64 * 1024
+) -> None:
+    """Writes the body of a response requested with stream=True to filename."""
+    with open(filename, "wb") as file:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            file.write(chunk)
+
+
+def download_to_temporary_file(send: Callable[[], requests.Response]) -> str:
+    """Sends a request with stream=True and writes its body to a new temporary file.
+
+    The response is closed once read. Returns the name of the file, that the
+    caller must remove.
+    """
+    with tempfile.NamedTemporaryFile(delete=False) as temporary_file:
+        filename = temporary_file.name
+
+    try:
+        with send() as response:
+            download_to_file(response, filename)
+    except BaseException:
+        os.remove(filename)
+        raise
+    return filename
@@ -35,8 +35,12 @@ from open_dubbing.text_to_speech_cli import TextToSpeechCLI
 from open_dubbing.text_to_speech_edge import TextToSpeechEdge
 from open_dubbing.text_to_speech_mms import TextToSpeechMMS
 from open_dubbing.text_to_speech_bamborak import TextToSpeechBamborak
+from open_dubbing.speaking_rate import SpeakingRateModel
+from open_dubbing.text_to_speech_cache import TextToSpeechCache
 from open_dubbing.translation_apertium import TranslationApertium
+from open_dubbing.translation_cache import TranslationCache
 from open_dubbing.translation_nllb import TranslationNLLB
+from open_dubbing.translation_nllb_ctranslate2 import TranslationNLLBCTranslate2
 from open_dubbing.translation_sotra import TranslationSotra
 from open_dubbing.translation_passthrough import TranslationPassthrough
 
@@ -154,9 +158,12 @@ def _get_selected_tts(
     tts_api_server: str,
     device: str,
     openai_api_key: str,
+    tts_batch_size: int = 8,
+    tts_hedge_percentile: float = 0,
+    tts_coqui_max_memory: int = 4096,
 ):
     if selected_tts == "mms":
-        tts = TextToSpeechMMS(device)
+        tts = TextToSpeechMMS(device, batch_size=tts_batch_size)
     elif selected_tts == "edge":
         tts = TextToSpeechEdge(device)
     elif selected_tts == "coqui":
@@ -167,7 +174,7 @@ def _get_selected_tts(
             msg = "Make sure that Coqui-tts is installed by running 'pip install open-dubbing[coqui]'"
             log_error_and_exit(msg, ExitCode.NO_COQUI_TTS)
 
-        tts = TextToSpeechCoqui(device)
+        tts = TextToSpeechCoqui(device, max_memory_mb=tts_coqui_max_memory)
         if not Coqui.is_espeak_ng_installed():
             msg = "To use Coqui-tts you have to have espeak or espeak-ng installed"
             log_error_and_exit(msg, ExitCode.NO_COQUI_ESPEAK)
@@ -178,7 +185,9 @@ def _get_selected_tts(
 
         tts = TextToSpeechCLI(device, tts_cli_cfg_file)
     elif selected_tts == "api":
-        tts = TextToSpeechAPI(device, tts_api_server)
+        tts = TextToSpeechAPI(
+            device, tts_api_server, hedge_percentile=tts_hedge_percentile
+        )
         if len(tts_api_server) == 0:
             msg = "When using TTS's API, you need to specify with --tts_api_server the URL of the server"
             log_error_and_exit(msg, ExitCode.NO_TTS_API_SERVER)
@@ -192,7 +201,9 @@ def _get_selected_tts(
         key = _get_openai_key(key=openai_api_key)
         tts = TextToSpeechOpenAI(device=device, api_key=key)
     elif selected_tts == "bamborak":
-        tts = TextToSpeechBamborak(device, tts_api_server)
+        tts = TextToSpeechBamborak(
+            device, tts_api_server, hedge_percentile=tts_hedge_percentile
+        )
         if len(tts_api_server) == 0:
             msg = "When using TTS's API, you need to specify with --tts_api_server the URL of the server"
             log_error_and_exit(msg, ExitCode.NO_TTS_API_SERVER)
@@ -203,10 +214,22 @@ def _get_selected_tts(
 
 
 def _get_selected_translator(
-    translator: str, nllb_model: str, apertium_server: str, device: str
+    translator: str,
+    nllb_model: str,
+    apertium_server: str,
+    device: str,
+    translation_batch_size: int = 8,
+    cpu_threads: int = 0,
+    translation_max_in_flight: int = 4,
+    translation_max_request_chars: int | None = None,
 ):
     if translator == "nllb":
-        translation = TranslationNLLB(device)
+        translation = TranslationNLLB(device, batch_size=translation_batch_size)
+        translation.load_model(nllb_model)
+    elif translator == "nllb-ctranslate2":
+        translation = TranslationNLLBCTranslate2(
+            device, batch_size=translation_batch_size, cpu_threads=cpu_threads
+        )
         translation.load_model(nllb_model)
     elif translator == "apertium":
         server = apertium_server
@@ -214,7 +237,15 @@ def _get_selected_translator(
             msg = "When using Apertium's API, you need to specify with --apertium_server the URL of the server"
             log_error_and_exit(msg, ExitCode.NO_APERTIUM_SERVER)
 
-        translation = TranslationApertium(device)
+        translation = TranslationApertium(
+            device,
+            max_in_flight=translation_max_in_flight,
+            max_request_chars=(
+                1000
+                if translation_max_request_chars is None
+                else translation_max_request_chars
+            ),
+        )
         translation.set_server(server)
     elif translator == "sotra":
         server = apertium_server
@@ -222,7 +253,16 @@ def _get_selected_translator(
             msg = "When using Sotra's API, you need to specify with --apertium_server the URL of the server"
             log_error_and_exit(msg, ExitCode.NO_APERTIUM_SERVER)
 
-        translation = TranslationSotra(device)
+        # Packing is off by default, Sotra may not keep a line per segment
+        translation = TranslationSotra(
+            device,
+            max_in_flight=translation_max_in_flight,
+            max_request_chars=(
+                0
+                if translation_max_request_chars is None
+                else translation_max_request_chars
+            ),
+        )
         translation.set_server(server)
     elif translator == "passthrough":
         translation = TranslationPassthrough(device)
@@ -245,6 +285,16 @@ def _get_openai_key(*, key: str):
     log_error_and_exit(msg, ExitCode.NO_OPENAI_KEY)
 
 
+def _get_intermediate_format(
+    *, intermediate_format: str | None, clean_intermediate_files: bool
+) -> str:
+    if intermediate_format:
+        return intermediate_format
+
+    # Files that are removed at the end are not worth encoding
+    return "wav" if clean_intermediate_files else "mp3"
+
+
 def main():
 
     args = CommandLine.read_parameters()
@@ -264,7 +314,30 @@ def main():
         args.tts_api_server,
         args.device,
         args.openai_api_key,
+        args.tts_batch_size,
+        args.tts_hedge_percentile,
+        args.tts_coqui_max_memory,
+    )
+    tts.set_max_workers(args.tts_workers)
+    # Without intermediate files the clips of the engines that synthesize to
+    # memory are mixed without writing them to disk
+    tts.set_keep_intermediate_files(not args.clean_intermediate_files)
+    intermediate_format = _get_intermediate_format(
+        intermediate_format=args.intermediate_format,
+        clean_intermediate_files=args.clean_intermediate_files,
     )
+    tts.set_intermediate_format(intermediate_format)
+    if args.tts_cache_dir:
+        tts.set_cache(
+            TextToSpeechCache(
+                directory=args.tts_cache_dir,
+                max_bytes=args.tts_cache_size * 1024**2,
+            )
+        )
+    if args.tts_speaking_rate_file:
+        tts.set_speaking_rate_model(
+            SpeakingRateModel(filename=args.tts_speaking_rate_file)
+        )
 
     if sys.platform == "darwin":
         os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -300,8 +373,22 @@ def main():
         logger().info(f"Detected language '{source_language}'")
 
     translation = _get_selected_translator(
-        args.translator, args.nllb_model, args.apertium_server, args.device
+        args.translator,
+        args.nllb_model,
+        args.apertium_server,
+        args.device,
+        args.translation_batch_size,
+        args.cpu_threads,
+        args.translation_max_in_flight,
+        args.translation_max_request_chars,
     )
+    if args.translation_cache_dir:
+        translation.set_cache(
+            TranslationCache(
+                directory=args.translation_cache_dir,
+                max_entries=args.translation_cache_size,
+            )
+        )
 
     check_languages(
         source_language,
@@ -345,6 +432,7 @@ def main():
         device_pyannote=args.device_pyannote,
         cpu_threads=args.cpu_threads,
         clean_intermediate_files=args.clean_intermediate_files,
+        intermediate_format=intermediate_format,
         original_subtitles=args.original_subtitles,
         dubbed_subtitles=args.dubbed_subtitles,
         input_srt=args.input_srt,
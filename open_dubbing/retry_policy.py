@@ -0,0 +1,188 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import random
+import threading
+import time
+
+from typing import Awaitable, Callable, Tuple, Type, TypeVar
+
+from open_dubbing import logger
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the endpoint when it has failed repeatedly."""
+
+
+class RetryPolicy:
+    """Retries calls to a network endpoint.
+
+    - Waits between attempts with exponential backoff and full jitter.
+    - Stops retrying once the errors of the run exceed the error budget.
+    - Opens a circuit after failure_threshold consecutive failures. While the
+      circuit is open calls fail immediately; after reset_timeout seconds a
+      single call is let through to check whether the endpoint is back, and
+      the other calls fail immediately until it finishes.
+
+    A policy is shared by all the calls to the same endpoint and is thread safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        error_budget: int = 50,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+    ):
+        self.name = name
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.error_budget = error_budget
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.errors = 0
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._half_open_probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _get_delay(self, attempt: int) -> float:
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+    def _check_circuit(self) -> bool:
+        """Raises CircuitOpenError if the endpoint must not be called.
+
+        Returns True if the call is the probe that checks whether the endpoint is back.
+        """
+        with self._lock:
+            if self._half_open_probe_in_flight:
+                raise CircuitOpenError(
+                    f"{self.name}. Checking if the endpoint is back, not calling it"
+                )
+
+            if self._opened_at is None:
+                return False
+
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError(
+                    f"{self.name}. Endpoint failed {self._consecutive_failures} times in a row, not calling it"
+                )
+
+            # Half open: let only this call through and open again if it fails
+            self._opened_at = None
+            self._consecutive_failures = self.failure_threshold - 1
+            self._half_open_probe_in_flight = True
+            return True
+
+    def _end_probe(self, probe: bool) -> None:
+        if probe:
+            with self._lock:
+                self._half_open_probe_in_flight = False
+
+    def _on_success(self, probe: bool) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            if probe:
+                self._half_open_probe_in_flight = False
+
+    def _on_failure(self, attempt: int, probe: bool) -> bool:
+        """Records a failed attempt and returns True if it should be retried."""
+        with self._lock:
+            if probe:
+                self._half_open_probe_in_flight = False
+            self.errors += 1
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger().error(
+                        f"{self.name}. {self._consecutive_failures} consecutive failures, opening circuit for {self.reset_timeout:.0f} secs."
+                    )
+                self._opened_at = time.monotonic()
+                return False
+
+            if self.errors > self.error_budget:
+                logger().error(
+                    f"{self.name}. Error budget of {self.error_budget} errors exhausted, not retrying."
+                )
+                return False
+
+            if attempt == self.max_attempts:
+                logger().error(f"{self.name}. Max retries reached.")
+                return False
+
+            return True
+
+    def call(
+        self,
+        function: Callable[[], T],
+        *,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    ) -> T:
+        for attempt in range(1, self.max_attempts + 1):
+            probe = self._check_circuit()
+            try:
+                result = function()
+            except retry_on:
+                if not self._on_failure(attempt, probe):
+                    raise
+
+                delay = self._get_delay(attempt)
+                logger().warning(
+                    f"{self.name}. Call failed, retrying attempt {attempt} in {delay:.2f} secs."
+                )
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self._end_probe(probe)
+                raise
+
+            self._on_success(probe)
+            return result
+
+    async def call_async(
+        self,
+        function: Callable[[], Awaitable[T]],
+        *,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    ) -> T:
+        for attempt in range(1, self.max_attempts + 1):
+            probe = self._check_circuit()
+            try:
+                result = await function()
+            except retry_on:
+                if not self._on_failure(attempt, probe):
+                    raise
+
+                delay = self._get_delay(attempt)
+                logger().warning(
+                    f"{self.name}. Call failed, retrying attempt {attempt} in {delay:.2f} secs."
+                )
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self._end_probe(probe)
+                raise
+
+            self._on_success(probe)
+            return result
@@ -0,0 +1,126 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from open_dubbing.pydub_audio_segment import AudioSegment
+
+SILENCE_THRESHOLD_DB = -50.0
+
+
+def _get_samples(audio: AudioSegment) -> np.ndarray:
+    """Returns the samples as a (frames, channels) array scaled to [-1, 1]."""
+    samples = np.asarray(audio.get_array_of_samples(), dtype=np.float32)
+    samples = samples.reshape(-1, audio.channels)
+    return samples / float(1 << (8 * audio.sample_width - 1))
+
+
+def _get_threshold(threshold_db: float) -> float:
+    return 10 ** (threshold_db / 20)
+
+
+def _slice_frames(audio: AudioSegment, keep: np.ndarray) -> AudioSegment:
+    """Returns an AudioSegment with only the frames where keep is True."""
+    raw = np.frombuffer(audio.raw_data, dtype=np.uint8)
+    frames = raw.reshape(-1, audio.frame_width)[keep]
+    return audio._spawn(frames.tobytes())
+
+
+def _is_sound(samples: np.ndarray, threshold: float, window: int) -> np.ndarray:
+    """Returns for each frame if the RMS of a channel over the preceding window frames reaches threshold.
+
+    As in sox, the window starts filled with zeros.
+    """
+    power = np.square(samples, dtype=np.float64)
+    cumulative = np.concatenate(
+        (np.zeros((1, samples.shape[1])), np.cumsum(power, axis=0))
+    )
+    starts = np.clip(np.arange(len(samples)) - window + 1, 0, None)
+    rms = np.sqrt((cumulative[1:] - cumulative[starts]) / window)
+    return (rms >= threshold).any(axis=1)
+
+
+def trim_silence(
+    audio: AudioSegment,
+    *,
+    threshold_db: float = SILENCE_THRESHOLD_DB,
+    window_duration: float = 0.02,
+) -> AudioSegment:
+    """Removes the leading and trailing silence.
+
+    Same as 'sox in out silence 1 1 -50d reverse silence 1 1 -50d reverse'. The
+    level of each frame is the RMS of each channel over the preceding
+    window_duration seconds (the following ones for the end), and the trim
+    stops at the first frame that reaches threshold_db. A click loud enough
+    to raise the RMS of its window stops the trim, a quieter one does not.
+    """
+    samples = _get_samples(audio)
+    if len(samples) == 0:
+        return audio
+
+    threshold = _get_threshold(threshold_db)
+    window = max(1, int(audio.frame_rate * window_duration))
+    sound = np.flatnonzero(_is_sound(samples, threshold, window))
+    if len(sound) == 0:
+        return audio._spawn(b"")
+
+    start = sound[0]
+    # sox trims the end by reversing the audio, so its window looks ahead
+    reversed_sound = np.flatnonzero(_is_sound(samples[start:][::-1], threshold, window))
+    end = len(samples) - reversed_sound[0]
+
+    keep = np.zeros(len(samples), dtype=bool)
+    keep[start:end] = True
+    return _slice_frames(audio, keep)
+
+
+def remove_silence(
+    audio: AudioSegment,
+    *,
+    threshold_db: float = SILENCE_THRESHOLD_DB,
+    min_silence_duration: float = 0.1,
+    window_duration: float = 0.02,
+) -> AudioSegment:
+    """Shortens the runs of silence after the first sound to min_silence_duration.
+
+    Same as ffmpeg's 'silenceremove=stop_periods=-1:stop_duration=0.1:stop_threshold=-50dB'.
+    The level of each frame is the RMS over the preceding window_duration seconds
+    and the leading silence is left untouched.
+    """
+    samples = _get_samples(audio)
+    frame_count = len(samples)
+    if frame_count == 0:
+        return audio
+
+    window = max(1, int(audio.frame_rate * window_duration))
+    power = np.square(samples).mean(axis=1)
+    cumulative = np.concatenate(([0.0], np.cumsum(power, dtype=np.float64)))
+    starts = np.clip(np.arange(frame_count) - window + 1, 0, None)
+    lengths = np.arange(frame_count) - starts + 1
+    rms = np.sqrt((cumulative[1:] - cumulative[starts]) / lengths)
+    silent = rms < _get_threshold(threshold_db)
+
+    # Boundaries of the runs of silent frames
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    min_frames = int(audio.frame_rate * min_silence_duration)
+    long_runs = ((run_ends - run_starts) > min_frames) & (run_starts > 0)
+    if not long_runs.any():
+        return audio
+
+    keep = np.ones(frame_count, dtype=bool)
+    for start, end in zip(run_starts[long_runs], run_ends[long_runs]):
+        keep[start + min_frames : end] = False
+    return _slice_frames(audio, keep)
@@ -0,0 +1,108 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import threading
+
+from open_dubbing import logger
+
+
+class SpeakingRateModel:
+    """Predicts how long a voice takes to say a text.
+
+    For each voice it keeps the characters and the seconds, normalised to
+    speed 1.0, of the clips synthesized so far. The duration of a text is
+    its characters divided by the speaking rate of the voice and by the
+    speed. If filename is given the measures are loaded from it and saved
+    back with save(), so they are kept between runs.
+    """
+
+    def __init__(
+        self, *, filename: str = "", min_samples: int = 3, tolerance: float = 0.1
+    ):
+        self.filename = filename
+        self.min_samples = min_samples
+        self.tolerance = tolerance
+        self.predictions = 0
+        self.misses = 0
+        self._voices = {}
+        self._lock = threading.Lock()
+        if filename and os.path.exists(filename):
+            with open(filename, "r", encoding="utf-8") as file:
+                self._voices = json.load(file)
+
+    @staticmethod
+    def _count_characters(text: str) -> int:
+        return len("".join(text.split()))
+
+    def add(self, *, voice: str, text: str, speed: float, duration: float) -> None:
+        characters = self._count_characters(text)
+        if characters == 0 or duration <= 0:
+            return
+
+        with self._lock:
+            measures = self._voices.setdefault(
+                voice, {"characters": 0, "seconds": 0.0, "samples": 0}
+            )
+            measures["characters"] += characters
+            measures["seconds"] += duration * speed
+            measures["samples"] += 1
+
+    def get_needed_samples(self, voice: str) -> int:
+        """Returns how many more clips of the voice are needed to predict its durations."""
+        with self._lock:
+            measures = self._voices.get(voice)
+            samples = measures["samples"] if measures else 0
+        return max(0, self.min_samples - samples)
+
+    def predict_duration(self, *, voice: str, text: str, speed: float) -> float | None:
+        """Returns the predicted duration in seconds, or None if the voice has too few measures."""
+        with self._lock:
+            measures = self._voices.get(voice)
+            if measures is None or measures["samples"] < self.min_samples:
+                return None
+            rate = measures["characters"] / measures["seconds"]
+
+        return self._count_characters(text) / rate / speed
+
+    def record_prediction(self, *, missed: bool) -> None:
+        with self._lock:
+            self.predictions += 1
+            if missed:
+                self.misses += 1
+
+    def save(self) -> None:
+        if not self.filename:
+            return
+
+        with self._lock:
+            data = json.dumps(self._voices, indent=2, ensure_ascii=False)
+
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_filename = f"{self.filename}.tmp"
+        with open(temp_filename, "w", encoding="utf-8") as file:
+            file.write(data)
+        os.replace(temp_filename, self.filename)
+
+    def log_stats(self) -> None:
+        if self.predictions == 0:
+            return
+
+        per = self.misses * 100 / self.predictions
+        logger().info(
+            f"Speaking rate model: {self.predictions} predicted speeds, {self.misses} needed a second pass ({per:.2f}%)"
+        )
@@ -15,16 +15,36 @@
 import math
 import os
 import re
+import shutil
 
 from abc import ABC, abstractmethod
-from typing import Final, List, Mapping, NamedTuple, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    Dict,
+    Final,
+    List,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+import numpy as np
 
 from open_dubbing import logger
 from open_dubbing.ffmpeg import FFmpeg
 from open_dubbing.pydub_audio_segment import AudioSegment
+from open_dubbing.silence import remove_silence
+from open_dubbing.speaking_rate import SpeakingRateModel
+from open_dubbing.text_to_speech_cache import TextToSpeechCache, TextToSpeechCacheKey
+from open_dubbing.time_stretch import time_stretch
 from open_dubbing.utterance import Utterance
 from open_dubbing.speaker_list import SpeakerList
 
+T = TypeVar("T")
+
 
 class Voice(NamedTuple):
     name: str
@@ -32,12 +52,29 @@ class Voice(NamedTuple):
     region: str = ""
 
 
+class SpeechRequest(NamedTuple):
+    assigned_voice: str
+    target_language: str
+    output_filename: str
+    text: str
+    speed: float
+
+
 class TextToSpeech(ABC):
 
     def __init__(self):
         self._SSML_MALE: Final[str] = "Male"
         self._SSML_FEMALE: Final[str] = "Female"
         self._DEFAULT_SPEED: Final[float] = 1.5
+        # some of our voices are really slow
+        self._MAX_SPEED: Final[float] = 2.5
+        self.max_workers = 1
+        self.cache = None
+        self.speaking_rate = SpeakingRateModel()
+        self.keep_intermediate_files = True
+        self.intermediate_format = "mp3"
+        # Output filename -> clip of the engines that synthesize to memory
+        self.dubbed_audio: Dict[str, AudioSegment] = {}
 
     @abstractmethod
     def get_available_voices(self, language_code: str) -> List[Voice]:
@@ -115,8 +152,18 @@ class TextToSpeech(ABC):
         logger().info(f"text_to_speech.assign_voices. Returns: {voice_assignment}")
         return voice_assignment
 
-    def _convert_to_mp3(self, input_file, output_mp3):
-        FFmpeg().convert_to_format(source=input_file, target=output_mp3)
+    def _convert_to_output_format(self, input_file, output_file):
+        """Converts input_file to the format of the extension of output_file and removes it."""
+        if input_file == output_file:
+            return
+
+        input_extension = os.path.splitext(input_file)[1].lower()
+        if input_extension and input_extension == os.path.splitext(output_file)[1].lower():
+            # Already in the output format, no need to transcode it
+            shutil.move(input_file, output_file)
+            return
+
+        FFmpeg().convert_to_format(source=input_file, target=output_file)
         os.remove(input_file)
 
     def _add_text_to_speech_properties(
@@ -166,6 +213,46 @@ class TextToSpeech(ABC):
     def get_languages(self):
         pass
 
+    def warm_up(self, *, target_language: str):
+        """Loads the resources needed to synthesize target_language before dubbing starts."""
+        pass
+
+    def log_stats(self) -> None:
+        """Logs engine statistics at the end of the run."""
+        pass
+
+    def set_cache(self, cache: TextToSpeechCache | None) -> None:
+        self.cache = cache
+
+    def set_keep_intermediate_files(self, keep_intermediate_files: bool) -> None:
+        """Sets if the clips synthesized to memory are also written to disk."""
+        self.keep_intermediate_files = keep_intermediate_files
+
+    def set_intermediate_format(self, intermediate_format: str) -> None:
+        """Sets the audio format (wav, flac or mp3) of the dubbed clips."""
+        self.intermediate_format = intermediate_format
+
+    def _get_output_format(self) -> str:
+        """Returns the format of the dubbed clips.
+
+        Engines that receive encoded audio from their service return its format
+        to store it without transcoding.
+        """
+        return self.intermediate_format
+
+    def _get_cache_engine_name(self) -> str:
+        """Identifies the engine, and its server or configuration, for the audio cache."""
+        return type(self).__name__
+
+    def _get_cache_key(self, request: SpeechRequest) -> TextToSpeechCacheKey:
+        return TextToSpeechCacheKey(
+            engine=self._get_cache_engine_name(),
+            voice=request.assigned_voice,
+            language=request.target_language,
+            text=request.text,
+            speed=request.speed,
+        )
+
     """ TTS add silence at the end that we want to remove to prevent increasing the speech of next
         segments if is not necessary."""
 
@@ -178,6 +265,46 @@ class TextToSpeech(ABC):
         text: str,
         speed: float,
     ) -> str:
+        request = SpeechRequest(
+            assigned_voice=assigned_voice,
+            target_language=target_language,
+            output_filename=output_filename,
+            text=text,
+            speed=speed,
+        )
+        # A previous pass kept in memory is replaced by this one
+        self.dubbed_audio.pop(output_filename, None)
+        if self.cache is not None and self.cache.get(
+            self._get_cache_key(request), output_filename
+        ):
+            return output_filename
+
+        dubbed_file = self._synthesize_without_end_silence(**request._asdict())
+        if self.cache is not None:
+            self._write_audio_file(dubbed_file)
+            self.cache.put(self._get_cache_key(request), dubbed_file)
+        return dubbed_file
+
+    def _synthesize_without_end_silence(
+        self,
+        *,
+        assigned_voice: str,
+        target_language: str,
+        output_filename: str,
+        text: str,
+        speed: float,
+    ) -> str:
+
+        if self._supports_samples():
+            samples, frame_rate = self._convert_text_to_speech_samples(
+                assigned_voice=assigned_voice,
+                target_language=target_language,
+                text=text,
+                speed=speed,
+            )
+            audio = remove_silence(self._samples_to_audio(samples, frame_rate))
+            self._save_audio(filename=output_filename, audio=audio, in_memory=True)
+            return output_filename
 
         dubbed_file = self._convert_text_to_speech(
             assigned_voice=assigned_voice,
@@ -186,14 +313,15 @@ class TextToSpeech(ABC):
             text=text,
             speed=speed,
         )
+        return self._remove_end_silence(dubbed_file)
 
-        dubbed_audio = AudioSegment.from_file(dubbed_file)
+    def _remove_end_silence(self, dubbed_file: str) -> str:
+        dubbed_audio = self._load_audio(dubbed_file)
+        trimmed_audio = remove_silence(dubbed_audio)
         pre_duration = len(dubbed_audio)
-
-        FFmpeg().remove_silence(filename=dubbed_file)
-        dubbed_audio = AudioSegment.from_file(dubbed_file)
-        post_duration = len(dubbed_audio)
+        post_duration = len(trimmed_audio)
         if pre_duration != post_duration:
+            self._save_audio(filename=dubbed_file, audio=trimmed_audio)
             logger().debug(
                 f"text_to_speech._convert_text_to_speech_without_end_silence. File {dubbed_file} shorten from {pre_duration} to {post_duration}"
             )
@@ -212,6 +340,86 @@ class TextToSpeech(ABC):
     ) -> str:
         pass
 
+    def _supports_samples(self) -> bool:
+        """True if the engine overrides _convert_text_to_speech_samples."""
+        return (
+            type(self)._convert_text_to_speech_samples
+            is not TextToSpeech._convert_text_to_speech_samples
+        )
+
+    def _convert_text_to_speech_samples(
+        self,
+        *,
+        assigned_voice: str,
+        target_language: str,
+        text: str,
+        speed: float,
+    ) -> Tuple[np.ndarray, int]:
+        """Synthesizes text to memory. Engines that support it override it.
+
+        Returns:
+            A mono 16-bit PCM array and its sample rate.
+        """
+        raise NotImplementedError
+
+    def _convert_text_to_speech_batch_samples(
+        self, *, requests: Sequence[SpeechRequest]
+    ) -> List[Tuple[np.ndarray, int]]:
+        """Synthesizes several texts to memory. Engines that support batching override it."""
+        return [
+            self._convert_text_to_speech_samples(
+                assigned_voice=request.assigned_voice,
+                target_language=request.target_language,
+                text=request.text,
+                speed=request.speed,
+            )
+            for request in requests
+        ]
+
+    @staticmethod
+    def _samples_to_audio(samples: np.ndarray, frame_rate: int) -> AudioSegment:
+        return AudioSegment(
+            data=samples.astype(np.int16).tobytes(),
+            sample_width=2,
+            frame_rate=frame_rate,
+            channels=1,
+        )
+
+    def _save_audio(
+        self, *, filename: str, audio: AudioSegment, in_memory: bool = False
+    ) -> None:
+        """Stores the clip of filename.
+
+        Clips synthesized to memory (in_memory or already in dubbed_audio) stay
+        in dubbed_audio and are only written if intermediate files are kept.
+        """
+        if in_memory or filename in self.dubbed_audio:
+            self.dubbed_audio[filename] = audio
+            if not self.keep_intermediate_files:
+                return
+
+        self._export_audio(audio, filename)
+
+    def _export_audio(self, audio: AudioSegment, filename: str) -> None:
+        """Writes audio in the format of the extension of filename."""
+        extension = os.path.splitext(filename)[1][1:]
+        audio.export(filename, format=extension or "mp3")
+
+    def _write_audio_file(self, filename: str) -> None:
+        """Writes a clip kept only in memory to filename."""
+        audio = self.dubbed_audio.get(filename)
+        if audio is not None and not os.path.exists(filename):
+            self._export_audio(audio, filename)
+
+    def _copy_audio(self, *, source: str, target: str) -> None:
+        audio = self.dubbed_audio.get(source)
+        if audio is not None:
+            # Clips are immutable, the speed adjustment creates a new one
+            self._save_audio(filename=target, audio=audio, in_memory=True)
+        else:
+            self.dubbed_audio.pop(target, None)
+            shutil.copyfile(source, target)
+
     def _calculate_target_utterance_speed(
         self,
         *,
@@ -221,8 +429,12 @@ class TextToSpeech(ABC):
         utterance_metadata: Sequence[Mapping[str, float | str]],
         audio_file=str,
         seek_next_start=False,
+        dubbed_duration: float | None = None,
     ) -> float:
-        """Returns the ratio between the reference and target duration."""
+        """Returns the ratio between the reference and target duration.
+
+        If dubbed_duration is given it is used instead of reading dubbed_file.
+        """
 
         if seek_next_start == True:
             end = self.get_start_time_of_next_speech_utterance(
@@ -233,17 +445,76 @@ class TextToSpeech(ABC):
             )
 
         reference_length = end - start
-        dubbed_audio = AudioSegment.from_file(dubbed_file)
-        dubbed_duration = dubbed_audio.duration_seconds
+        if dubbed_duration is None:
+            dubbed_duration = self._load_audio(dubbed_file).duration_seconds
         r = (
             math.ceil(dubbed_duration / reference_length * 10) / 10
         )  # Rounds up with .1 decimal precision
         logger().debug(f"text_to_speech._calculate_target_utterance_speed: {r}")
         return r
 
+    def _adjust_audio_speed(
+        self, *, filename: str, speed: float, audio: AudioSegment | None = None
+    ) -> None:
+        """Makes the clip in filename speed times faster keeping its pitch.
+
+        audio is the already decoded clip, if available.
+        """
+        if audio is None:
+            audio = self._load_audio(filename)
+        self._save_audio(filename=filename, audio=time_stretch(audio, speed=speed))
+
+    def _load_audio(self, filename: str) -> AudioSegment:
+        audio = self.dubbed_audio.get(filename)
+        if audio is not None:
+            return audio
+        return AudioSegment.from_file(filename)
+
+    def set_speaking_rate_model(self, speaking_rate: SpeakingRateModel) -> None:
+        self.speaking_rate = speaking_rate
+
+    def _predict_speed(self, *, utterance: Mapping[str, str | float]) -> float | None:
+        """Returns the speed that the utterance needs to fit its slot.
+
+        The speed is predicted from the speaking rate of the voice for the
+        engines that support speeds. Returns None if it cannot be predicted.
+        """
+        if not self._does_voice_supports_speeds():
+            return None
+
+        duration = self.speaking_rate.predict_duration(
+            voice=utterance["assigned_voice"],
+            text=utterance["translated_text"],
+            speed=utterance["speed"],
+        )
+        if duration is None:
+            return None
+
+        speed = self._calculate_target_utterance_speed(
+            start=utterance["start"],
+            end=utterance["end"],
+            dubbed_file=None,
+            utterance_metadata=[],
+            dubbed_duration=duration,
+        )
+        if speed > 1.0:
+            return min(speed, self._MAX_SPEED)
+        return utterance["speed"]
+
     def _does_voice_supports_speeds(self):
         return False
 
+    def _supports_batching(self):
+        return False
+
+    def _convert_text_to_speech_batch(
+        self, *, requests: Sequence[SpeechRequest]
+    ) -> List[str]:
+        """Synthesizes several texts at once. Engines that support batching override it."""
+        return [
+            self._convert_text_to_speech(**request._asdict()) for request in requests
+        ]
+
     def get_start_time_of_next_speech_utterance(
         self,
         *,
@@ -284,113 +555,406 @@ class TextToSpeech(ABC):
         )
         return result
 
-    def dub_utterances(
+    def _get_output_filename(
+        self, *, utterance: Mapping[str, str | float], output_directory: str
+    ) -> str:
+        extension = self._get_output_format()
+        try:
+            path = utterance["path"]
+            base_filename = os.path.splitext(os.path.basename(path))[0]
+            return os.path.join(output_directory, f"dubbed_{base_filename}.{extension}")
+        except KeyError:
+            return os.path.join(
+                output_directory,
+                f"dubbed_chunk_{utterance['start']}_{utterance['end']}.{extension}",
+            )
+
+    def _get_speech_request(
         self,
         *,
-        utterance_metadata: Sequence[Mapping[str, str | float]],
+        utterance: Mapping[str, str | float],
         output_directory: str,
         target_language: str,
-        audio_file: str,
-        modified_metadata: Sequence[Mapping[str, str | float]] | None = None,
-    ) -> Sequence[Mapping[str, str | float]]:
-        """Processes a list of utterance metadata, generating dubbed audio files."""
+    ) -> SpeechRequest:
+        return SpeechRequest(
+            assigned_voice=utterance["assigned_voice"],
+            target_language=target_language,
+            output_filename=self._get_output_filename(
+                utterance=utterance, output_directory=output_directory
+            ),
+            text=utterance["translated_text"],
+            speed=utterance["speed"],
+        )
 
-        modified_ids = {}
-        if modified_metadata is not None:
-            modified_ids = {utterance["id"] for utterance in modified_metadata}
+    def _dub_utterances_in_batch(
+        self, *, requests: Mapping[int, SpeechRequest]
+    ) -> Mapping[int, str]:
+        """Synthesizes the first pass of the given utterances with a single batch call.
+
+        Returns:
+            A dictionary from the utterance position to its dubbed file without end silence.
+        """
+        dubbed_paths = {}
+        for idx, request in requests.items():
+            self.dubbed_audio.pop(request.output_filename, None)
+            if self.cache is not None and self.cache.get(
+                self._get_cache_key(request), request.output_filename
+            ):
+                dubbed_paths[idx] = request.output_filename
+
+        missing = [
+            (idx, request)
+            for idx, request in requests.items()
+            if idx not in dubbed_paths
+        ]
+        if missing and self._supports_samples():
+            outputs = self._convert_text_to_speech_batch_samples(
+                requests=[request for _, request in missing]
+            )
+            for (idx, request), (samples, frame_rate) in zip(missing, outputs):
+                audio = remove_silence(self._samples_to_audio(samples, frame_rate))
+                self._save_audio(
+                    filename=request.output_filename, audio=audio, in_memory=True
+                )
+                dubbed_paths[idx] = request.output_filename
+        elif missing:
+            dubbed_files = self._convert_text_to_speech_batch(
+                requests=[request for _, request in missing]
+            )
+            for (idx, _), dubbed_file in zip(missing, dubbed_files):
+                dubbed_paths[idx] = self._remove_end_silence(dubbed_file)
+
+        if self.cache is not None:
+            for idx, request in missing:
+                self._write_audio_file(dubbed_paths[idx])
+                self.cache.put(self._get_cache_key(request), dubbed_paths[idx])
+
+        return dubbed_paths
+
+    def _group_identical_requests(
+        self, requests: Mapping[int, SpeechRequest]
+    ) -> Mapping[int, int]:
+        """Returns a dictionary from each repeated utterance to the first identical one.
+
+        Utterances are identical when they have the same voice, text and speed.
+        """
+        first_indexes = {}
+        duplicates = {}
+        for idx, request in requests.items():
+            key = (request.assigned_voice, request.text, request.speed)
+            if key in first_indexes:
+                duplicates[idx] = first_indexes[key]
+            else:
+                first_indexes[key] = idx
+        return duplicates
 
-        updated_utterance_metadata = []
-        for utterance in utterance_metadata:
-            if modified_metadata is not None and utterance["id"] not in modified_ids:
-                utterance_copy = utterance.copy()
-                updated_utterance_metadata.append(utterance_copy)
-                continue
+    def _map(self, function: Callable[[int], T], indexes: Sequence[int]) -> List[T]:
+        """Calls function for each index, in parallel when the engine allows it."""
+        if self.max_workers > 1 and self._is_thread_safe():
+            logger().debug(f"text_to_speech._map. Using {self.max_workers} workers")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(function, indexes))
 
-            utterance_copy = utterance.copy()
-            if not utterance_copy["for_dubbing"]:
-                try:
-                    dubbed_path = utterance_copy["path"]
-                except KeyError:
-                    dubbed_path = f"chunk_{utterance['start']}_{utterance['end']}.mp3"
-            else:
-                assigned_voice = utterance_copy["assigned_voice"]
-                text = utterance_copy["translated_text"]
-                try:
-                    path = utterance_copy["path"]
-                    base_filename = os.path.splitext(os.path.basename(path))[0]
-                    output_filename = os.path.join(
-                        output_directory, f"dubbed_{base_filename}.mp3"
-                    )
-                except KeyError:
-                    output_filename = os.path.join(
-                        output_directory,
-                        f"dubbed_chunk_{utterance['start']}_{utterance['end']}.mp3",
-                    )
+        return [function(idx) for idx in indexes]
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """Sets how many utterances dub_utterances processes in parallel."""
+        self.max_workers = max_workers
+
+    def _is_thread_safe(self) -> bool:
+        """Engines that can synthesize from several threads at once return True."""
+        return False
 
-                speed = utterance_copy["speed"]
+    def _dub_utterance(
+        self,
+        *,
+        idx: int,
+        utterance_metadata: Sequence[Mapping[str, str | float]],
+        output_directory: str,
+        target_language: str,
+        audio_file: str,
+        dubbed_path: str | None = None,
+        predicted_speed: float | None = None,
+    ) -> Mapping[str, str | float]:
+        """Dubs a single utterance and adjusts its speed to fit its time slot.
+
+        If dubbed_path is given, it is the already synthesized first pass, at
+        predicted_speed if given or at the speed of the utterance otherwise.
+        """
+        utterance = utterance_metadata[idx]
+        utterance_copy = utterance.copy()
+        if not utterance_copy["for_dubbing"]:
+            try:
+                dubbed_path = utterance_copy["path"]
+            except KeyError:
+                dubbed_path = f"chunk_{utterance['start']}_{utterance['end']}.{self.intermediate_format}"
+        else:
+            assigned_voice = utterance_copy["assigned_voice"]
+            text = utterance_copy["translated_text"]
+            output_filename = self._get_output_filename(
+                utterance=utterance, output_directory=output_directory
+            )
+
+            first_speed = utterance_copy["speed"]
+            if dubbed_path is None:
+                predicted_speed = self._predict_speed(utterance=utterance)
+            dubbed_speed = first_speed if predicted_speed is None else predicted_speed
+            if dubbed_path is None:
                 dubbed_path = self._convert_text_to_speech_without_end_silence(
                     assigned_voice=assigned_voice,
                     target_language=target_language,
                     output_filename=output_filename,
                     text=text,
-                    speed=speed,
+                    speed=dubbed_speed,
                 )
-                assigned_voice = utterance_copy.get("assigned_voice", None)
-                assigned_voice = assigned_voice if assigned_voice else ""
-                support_speeds = self._does_voice_supports_speeds()
-
-                start = utterance["start"]
-                end = utterance["end"]
-                speed = self._calculate_target_utterance_speed(
-                    start=start,
-                    end=end,
-                    dubbed_file=dubbed_path,
-                    utterance_metadata=utterance_metadata,
-                    audio_file=audio_file,
+            assigned_voice = utterance_copy.get("assigned_voice", None)
+            assigned_voice = assigned_voice if assigned_voice else ""
+            support_speeds = self._does_voice_supports_speeds()
+
+            start = utterance["start"]
+            end = utterance["end"]
+            # Decoded once to measure it and, if needed, to change its speed
+            dubbed_audio = self._load_audio(dubbed_path)
+            dubbed_duration = dubbed_audio.duration_seconds
+            if support_speeds:
+                self.speaking_rate.add(
+                    voice=assigned_voice,
+                    text=text,
+                    speed=dubbed_speed,
+                    duration=dubbed_duration,
                 )
+                # The speeds are calculated for a clip at the utterance speed
+                dubbed_duration = dubbed_duration * dubbed_speed / first_speed
+
+            speed = self._calculate_target_utterance_speed(
+                start=start,
+                end=end,
+                dubbed_file=dubbed_path,
+                utterance_metadata=utterance_metadata,
+                audio_file=audio_file,
+                dubbed_duration=dubbed_duration,
+            )
 
-                logger().debug(f"support_speeds: {support_speeds}, speed: {speed}")
+            logger().debug(f"support_speeds: {support_speeds}, speed: {speed}")
 
-                # only compensate for longer dubbed audio, not for shorter one
-                if speed > 1.0:
-                    translated_text = utterance_copy["translated_text"]
+            # A predicted speed close enough to the needed one avoids a second pass
+            tolerance = 0.0
+            if predicted_speed is not None:
+                tolerance = self.speaking_rate.tolerance
+            second_pass = False
+
+            # only compensate for longer dubbed audio, not for shorter one
+            if speed > 1.0:
+                translated_text = utterance_copy["translated_text"]
+                logger().debug(
+                    f"text_to_speech.dub_utterances. Need to increase speed for '{translated_text}'"
+                )
+
+                if speed > self._MAX_SPEED:
                     logger().debug(
-                        f"text_to_speech.dub_utterances. Need to increase speed for '{translated_text}'"
+                        f"text_to_speech.dub_utterances: Reduced speed from {speed} to {self._MAX_SPEED}"
                     )
+                    speed = self._MAX_SPEED
 
-                    # some of our voices are really slow
-                    MAX_SPEED = 2.5
-                    if speed > MAX_SPEED:
-                        logger().debug(
-                            f"text_to_speech.dub_utterances: Reduced speed from {speed} to {MAX_SPEED}"
-                        )
-                        speed = MAX_SPEED
+                translated_text = utterance_copy["translated_text"]
+                logger().debug(
+                    f"text_to_speech.dub_utterances: Adjusting speed to {speed} for '{translated_text}'"
+                )
 
-                    translated_text = utterance_copy["translated_text"]
+                utterance_copy["speed"] = speed
+                if support_speeds:
+                    second_pass = abs(speed - dubbed_speed) > tolerance
+                    if not second_pass:
+                        utterance_copy["speed"] = dubbed_speed
+                else:
+                    self._adjust_audio_speed(
+                        filename=dubbed_path, speed=speed, audio=dubbed_audio
+                    )
                     logger().debug(
-                        f"text_to_speech.dub_utterances: Adjusting speed to {speed} for '{translated_text}'"
+                        f"text_to_speech.adjust_audio_speed: dubbed_audio: {dubbed_path}, speed: {speed}"
                     )
+            else:
+                utterance_copy["speed"] = self._DEFAULT_SPEED
+                # The prediction sped up an utterance that did not need it
+                if abs(dubbed_speed - first_speed) > tolerance:
+                    second_pass = True
+                    speed = first_speed
 
-                    utterance_copy["speed"] = speed
-                    if support_speeds:
-                        dubbed_path = self._convert_text_to_speech_without_end_silence(
-                            assigned_voice=assigned_voice,
-                            target_language=target_language,
-                            output_filename=output_filename,
-                            text=text,
-                            speed=speed,
-                        )
-                    else:
-                        FFmpeg().adjust_audio_speed(
-                            filename=dubbed_path,
-                            speed=speed,
-                        )
-                        logger().debug(
-                            f"text_to_speech.adjust_audio_speed: dubbed_audio: {dubbed_path}, speed: {speed}"
-                        )
-                else:
-                    utterance_copy["speed"] = self._DEFAULT_SPEED
+            if second_pass:
+                dubbed_path = self._convert_text_to_speech_without_end_silence(
+                    assigned_voice=assigned_voice,
+                    target_language=target_language,
+                    output_filename=output_filename,
+                    text=text,
+                    speed=speed,
+                )
+            if predicted_speed is not None:
+                self.speaking_rate.record_prediction(missed=second_pass)
 
-            utterance_copy["dubbed_path"] = dubbed_path
-            updated_utterance_metadata.append(utterance_copy)
-        return updated_utterance_metadata
+        utterance_copy["dubbed_path"] = dubbed_path
+        return utterance_copy
+
+    def dub_utterances(
+        self,
+        *,
+        utterance_metadata: Sequence[Mapping[str, str | float]],
+        output_directory: str,
+        target_language: str,
+        audio_file: str,
+        modified_metadata: Sequence[Mapping[str, str | float]] | None = None,
+    ) -> Sequence[Mapping[str, str | float]]:
+        """Processes a list of utterance metadata, generating dubbed audio files.
+
+        When the engine is thread safe and more than one worker is set, the
+        utterances are dubbed in parallel keeping their order. Utterances with
+        the same voice, text and speed are synthesized once. The engines that
+        synthesize to memory keep the clips in dubbed_audio and only write them
+        to disk if intermediate files are kept.
+        """
+
+        modified_ids = {}
+        if modified_metadata is not None:
+            modified_ids = {utterance["id"] for utterance in modified_metadata}
+
+        indexes = [
+            idx
+            for idx, utterance in enumerate(utterance_metadata)
+            if modified_metadata is None or utterance["id"] in modified_ids
+        ]
+        dubbed = {}
+        if self._supports_batching() and self._does_voice_supports_speeds():
+            # Dub a few utterances of each voice first so the speaking rate
+            # model can predict the speed of the rest of the batch
+            warm_up_indexes = self._get_warm_up_indexes(
+                utterance_metadata=utterance_metadata, indexes=indexes
+            )
+            dubbed = self._dub_indexes(
+                indexes=warm_up_indexes,
+                utterance_metadata=utterance_metadata,
+                output_directory=output_directory,
+                target_language=target_language,
+                audio_file=audio_file,
+            )
+            indexes = [idx for idx in indexes if idx not in dubbed]
+
+        dubbed.update(
+            self._dub_indexes(
+                indexes=indexes,
+                utterance_metadata=utterance_metadata,
+                output_directory=output_directory,
+                target_language=target_language,
+                audio_file=audio_file,
+            )
+        )
+        self.speaking_rate.save()
+
+        return [
+            dubbed[idx] if idx in dubbed else utterance.copy()
+            for idx, utterance in enumerate(utterance_metadata)
+        ]
+
+    def _get_warm_up_indexes(
+        self,
+        *,
+        utterance_metadata: Sequence[Mapping[str, str | float]],
+        indexes: Sequence[int],
+    ) -> List[int]:
+        """Returns the utterances needed for the speaking rate model to predict every voice."""
+        needed = {}
+        warm_up_indexes = []
+        for idx in indexes:
+            utterance = utterance_metadata[idx]
+            if not utterance["for_dubbing"]:
+                continue
+
+            voice = utterance["assigned_voice"]
+            if voice not in needed:
+                needed[voice] = self.speaking_rate.get_needed_samples(voice)
+            if needed[voice] > 0:
+                needed[voice] -= 1
+                warm_up_indexes.append(idx)
+
+        return warm_up_indexes
+
+    def _dub_indexes(
+        self,
+        *,
+        indexes: Sequence[int],
+        utterance_metadata: Sequence[Mapping[str, str | float]],
+        output_directory: str,
+        target_language: str,
+        audio_file: str,
+    ) -> Mapping[int, Mapping[str, str | float]]:
+        """Dubs the utterances at the given positions."""
+        requests = {}
+        predicted_speeds = {}
+        for idx in indexes:
+            utterance = utterance_metadata[idx]
+            if not utterance["for_dubbing"]:
+                continue
+
+            request = self._get_speech_request(
+                utterance=utterance,
+                output_directory=output_directory,
+                target_language=target_language,
+            )
+            predicted_speed = self._predict_speed(utterance=utterance)
+            if predicted_speed is not None:
+                predicted_speeds[idx] = predicted_speed
+                request = request._replace(speed=predicted_speed)
+            requests[idx] = request
+
+        duplicates = self._group_identical_requests(requests)
+
+        first_pass_paths = {}
+        if self._supports_batching():
+            first_pass_paths = self._dub_utterances_in_batch(
+                requests={
+                    idx: request
+                    for idx, request in requests.items()
+                    if idx not in duplicates
+                }
+            )
+        elif duplicates:
+            # The first pass of the repeated utterances is synthesized before
+            # dubbing since the speed adjustment rewrites the files
+            repeated = sorted(set(duplicates.values()))
+            dubbed_paths = self._map(
+                lambda idx: self._convert_text_to_speech_without_end_silence(
+                    **requests[idx]._asdict()
+                ),
+                repeated,
+            )
+            first_pass_paths = dict(zip(repeated, dubbed_paths))
+
+        # Copies instead of hard links, the speed adjustment rewrites files in place
+        for idx, first_idx in duplicates.items():
+            output_filename = requests[idx].output_filename
+            if output_filename != first_pass_paths[first_idx]:
+                self._copy_audio(
+                    source=first_pass_paths[first_idx], target=output_filename
+                )
+            first_pass_paths[idx] = output_filename
+
+        if duplicates:
+            logger().info(
+                f"text_to_speech.dub_utterances. Skipped {len(duplicates)} synthesis calls of repeated utterances"
+            )
+
+        def _dub(idx: int) -> Mapping[str, str | float]:
+            # Without a first pass the speed is predicted when dubbing, with
+            # the speaking rates learned up to then
+            dubbed_path = first_pass_paths.get(idx)
+            return self._dub_utterance(
+                idx=idx,
+                utterance_metadata=utterance_metadata,
+                output_directory=output_directory,
+                target_language=target_language,
+                audio_file=audio_file,
+                dubbed_path=dubbed_path,
+                predicted_speed=(
+                    predicted_speeds.get(idx) if dubbed_path is not None else None
+                ),
+            )
+
+        return dict(zip(indexes, self._map(_dub, indexes)))
@@ -12,30 +12,49 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import tempfile
-import time
+import os
 
 from typing import List
 from urllib.parse import urljoin
 
-import requests
-
 from open_dubbing import logger
+from open_dubbing.hedged_requests import HedgedRequests
+from open_dubbing.http_session import (
+    REQUEST_TIMEOUT,
+    create_session,
+    download_to_temporary_file,
+)
+from open_dubbing.retry_policy import RetryPolicy
 from open_dubbing.text_to_speech import TextToSpeech, Voice
 
 
 class TextToSpeechAPI(TextToSpeech):
 
-    def __init__(self, device="cpu", server=""):
+    def __init__(self, device="cpu", server="", hedge_percentile: float = 0):
         super().__init__()
         self.server = server
         self.device = device
         self.voices = None
+        self.retry_policy = RetryPolicy(name="text_to_speech_api")
+        self.hedged_requests = HedgedRequests(
+            name="text_to_speech_api",
+            percentile=hedge_percentile,
+            max_workers=self.max_workers,
+        )
+        self.session = create_session(pool_size=2 * self.max_workers)
+        # Servers that implement the previous contract only accept GET on /speak
+        self.speak_with_get = False
+
+    def set_max_workers(self, max_workers: int) -> None:
+        super().set_max_workers(max_workers)
+        # Leave room in the pool for the hedged duplicates
+        self.session = create_session(pool_size=2 * max_workers)
+        self.hedged_requests.set_max_workers(max_workers)
 
     def _get_voices(self):
         if not self.voices:
             url = urljoin(self.server, "/voices")
-            response = requests.get(url)
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             self.voices = response.json()
 
         return self.voices
@@ -61,6 +80,9 @@ class TextToSpeechAPI(TextToSpeech):
 
         return voices
 
+    def _is_thread_safe(self) -> bool:
+        return True
+
     def _does_voice_supports_speeds(self):
         return False
 
@@ -75,45 +97,56 @@ class TextToSpeechAPI(TextToSpeech):
     ) -> str:
 
         url = urljoin(self.server, "/speak")
-        url = f"{url}?voice={assigned_voice}&text={text}"
-
-        max_retries = 3
-        for attempt in range(1, max_retries + 1):
-            try:
-                response = requests.get(url)
-
-                temp_filename = None
-                with tempfile.NamedTemporaryFile(delete=False) as temporary_file:
-                    temp_filename = temporary_file.name
-
-                    if response.status_code == 200:
-                        with open(temp_filename, "wb") as f:
-                            f.write(response.content)
-                    else:
-                        response.raise_for_status()
-
-                    self._convert_to_mp3(temp_filename, output_filename)
-                    break
-            except Exception:
-                if attempt == max_retries:
-                    logger().error(
-                        f"text_to_speech_api._convert_text_to_speech. Failed to download the file. Status code: {response.status_code}"
-                    )
-                    logger().error(
-                        "text_to_speech_api._convert_text_to_speech. Max retries reached. Could not complete translation API call."
-                    )
-                    raise
-                else:
-                    logger().warning(
-                        f"text_to_speech_api._convert_text_to_speech. Could not complete translation API call, retrying attempt {attempt}."
-                    )
-                    time.sleep(30)
+        data = {"voice": assigned_voice, "text": text}
+
+        def _check(response):
+            if response.status_code != 200:
+                logger().warning(
+                    f"text_to_speech_api._convert_text_to_speech. Failed to download the file. Status code: {response.status_code}"
+                )
+                response.raise_for_status()
+            return response
+
+        def _request():
+            if not self.speak_with_get:
+                response = self.session.post(
+                    url, data=data, stream=True, timeout=REQUEST_TIMEOUT
+                )
+                if response.status_code != 405:
+                    return _check(response)
+
+                response.close()
+                logger().warning(
+                    "text_to_speech_api._convert_text_to_speech. The server does not accept POST on /speak, using GET. Update the server to accept POST, GET fails with long texts"
+                )
+                self.speak_with_get = True
+
+            response = self.session.get(
+                url, params=data, stream=True, timeout=REQUEST_TIMEOUT
+            )
+            return _check(response)
+
+        def _download():
+            # The body is downloaded within the hedged call, so the latencies
+            # measured include it. Each attempt writes its own file.
+            return self.hedged_requests.call(
+                lambda: download_to_temporary_file(_request), discard=os.remove
+            )
+
+        temp_filename = self.retry_policy.call(_download)
+        self._convert_to_output_format(temp_filename, output_filename)
 
         logger().debug(
             f"text_to_speech_api._convert_text_to_speech: assigned_voice: {assigned_voice}, output_filename: '{output_filename}'"
         )
         return output_filename
 
+    def _get_cache_engine_name(self) -> str:
+        return f"{type(self).__name__}:{self.server}"
+
+    def log_stats(self) -> None:
+        self.hedged_requests.log_stats()
+
     def get_languages(self):
         languages = set()
         for server_voice in self._get_voices():
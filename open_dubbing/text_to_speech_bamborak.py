@@ -13,27 +13,46 @@
 # limitations under the License.
 
 import logging
-import tempfile
+import os
 
 from typing import List
 from urllib.parse import urljoin
 
-import requests
 import json
 
 from open_dubbing import logger
+from open_dubbing.hedged_requests import HedgedRequests
+from open_dubbing.http_session import (
+    REQUEST_TIMEOUT,
+    create_session,
+    download_to_temporary_file,
+)
+from open_dubbing.pydub_audio_segment import AudioSegment
+from open_dubbing.retry_policy import RetryPolicy
+from open_dubbing.silence import remove_silence, trim_silence
 from open_dubbing.text_to_speech import TextToSpeech, Voice
-from open_dubbing.ffmpeg import FFmpeg
-from open_dubbing.sox import sox
 
 
 class TextToSpeechBamborak(TextToSpeech):
 
-    def __init__(self, device="cpu", server=""):
+    def __init__(self, device="cpu", server="", hedge_percentile: float = 0):
         super().__init__()
         self.server = server
         self.device = device
         self.voices = None
+        self.retry_policy = RetryPolicy(name="text_to_speech_bamborak")
+        self.hedged_requests = HedgedRequests(
+            name="text_to_speech_bamborak",
+            percentile=hedge_percentile,
+            max_workers=self.max_workers,
+        )
+        self.session = create_session(pool_size=2 * self.max_workers)
+
+    def set_max_workers(self, max_workers: int) -> None:
+        super().set_max_workers(max_workers)
+        # Leave room in the pool for the hedged duplicates
+        self.session = create_session(pool_size=2 * max_workers)
+        self.hedged_requests.set_max_workers(max_workers)
 
     def get_available_voices(self, language_code: str) -> List[Voice]:
         voices = []
@@ -86,19 +105,14 @@ class TextToSpeechBamborak(TextToSpeech):
 
         return voices
 
+    def _is_thread_safe(self) -> bool:
+        return True
+
     def _does_voice_supports_speeds(self):
         return False
 
-    def _convert_text_to_speech(
-        self,
-        *,
-        assigned_voice: str,
-        target_language: str,
-        output_filename: str,
-        text: str,
-        speed: float,
-    ) -> str:
-
+    def _request_audio(self, *, assigned_voice: str, text: str) -> AudioSegment:
+        """Requests the audio to the server and decodes it once into memory."""
         voice_parts = assigned_voice.split('+')
         
         voice_name = voice_parts[0]
@@ -115,30 +129,85 @@ class TextToSpeechBamborak(TextToSpeech):
         headers = {'Content-Type':'application/json'}
 
         logger().debug(payload)
-        response = requests.post(self.server, headers=headers, data=json.dumps(payload))
 
-        temp_filename = None
-        with tempfile.NamedTemporaryFile(delete=False) as temporary_file:
-            temp_filename = temporary_file.name
-
-            if response.status_code == 200:
-                with open(temp_filename, "wb") as f:
-                    f.write(response.content)
-            else:
+        def _post():
+            response = self.session.post(
+                self.server,
+                headers=headers,
+                data=json.dumps(payload),
+                stream=True,
+                timeout=REQUEST_TIMEOUT,
+            )
+            if response.status_code != 200:
                 logger().error(
                     f"Failed to download the file. Status code: {response.status_code}"
                 )
-            
-            temp_filename_wav = temp_filename + '.wav';
-            FFmpeg().convert_to_format(source=temp_filename,target=temp_filename_wav)
-            sox().trim_silence(filename=temp_filename_wav)
-            self._convert_to_mp3(temp_filename_wav, output_filename)
+                response.raise_for_status()
+            return response
+
+        def _download():
+            # The body is downloaded within the hedged call, so the latencies
+            # measured include it. Each attempt writes its own file.
+            return self.hedged_requests.call(
+                lambda: download_to_temporary_file(_post), discard=os.remove
+            )
+
+        temp_filename = self.retry_policy.call(_download)
+        try:
+            # WAV is parsed in-process, other formats are decoded by ffmpeg
+            with open(temp_filename, "rb") as file:
+                is_wav = file.read(4) == b"RIFF"
+            return AudioSegment.from_file(
+                temp_filename, format="wav" if is_wav else None
+            )
+        finally:
+            os.remove(temp_filename)
+
+    def _convert_text_to_speech(
+        self,
+        *,
+        assigned_voice: str,
+        target_language: str,
+        output_filename: str,
+        text: str,
+        speed: float,
+    ) -> str:
+
+        audio = self._request_audio(assigned_voice=assigned_voice, text=text)
+        self._export_audio(trim_silence(audio), output_filename)
 
         logger().debug(
             f"text_to_speech_api._convert_text_to_speech: assigned_voice: {assigned_voice}, output_filename: '{output_filename}'"
         )
         return output_filename
 
+    def _synthesize_without_end_silence(
+        self,
+        *,
+        assigned_voice: str,
+        target_language: str,
+        output_filename: str,
+        text: str,
+        speed: float,
+    ) -> str:
+        # Trims and removes the silences in memory, the clip is only written if
+        # intermediate files are kept
+        audio = self._request_audio(assigned_voice=assigned_voice, text=text)
+        trimmed = remove_silence(trim_silence(audio))
+        self._save_audio(filename=output_filename, audio=trimmed, in_memory=True)
+
+        if len(audio) != len(trimmed):
+            logger().debug(
+                f"text_to_speech_bamborak._synthesize_without_end_silence. File {output_filename} shorten from {len(audio)} to {len(trimmed)}"
+            )
+        return output_filename
+
+    def _get_cache_engine_name(self) -> str:
+        return f"{type(self).__name__}:{self.server}"
+
+    def log_stats(self) -> None:
+        self.hedged_requests.log_stats()
+
     def get_languages(self):
         languages = set()
         languages.add("hsb")
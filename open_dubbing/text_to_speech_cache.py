@@ -0,0 +1,120 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from typing import NamedTuple
+
+from open_dubbing import logger
+
+
+class TextToSpeechCacheKey(NamedTuple):
+    engine: str
+    voice: str
+    language: str
+    text: str
+    speed: float
+
+
+class TextToSpeechCache:
+    """Persistent cache of synthesized clips stored as files in a directory.
+
+    Each clip is stored under the SHA-256 of its key, so identical requests
+    share one file. When the files take more than max_bytes the least
+    recently used ones are removed; the modification time of a file is
+    updated every time it is used.
+    """
+
+    def __init__(self, *, directory: str, max_bytes: int = 1024**3):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size = sum(size for _, size, _ in self._get_entries())
+
+    def _get_entries(self):
+        """Returns (path, size, last used) for each cached clip."""
+        entries = []
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+                stat = entry.stat()
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _get_path(self, key: TextToSpeechCacheKey, extension: str) -> str:
+        data = json.dumps(list(key), ensure_ascii=False)
+        digest = hashlib.sha256(data.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}{extension}")
+
+    def get(self, key: TextToSpeechCacheKey, filename: str) -> bool:
+        """Copies the cached clip for key to filename and returns True if it was cached."""
+        path = self._get_path(key, os.path.splitext(filename)[1])
+        try:
+            shutil.copyfile(path, filename)
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def put(self, key: TextToSpeechCacheKey, filename: str) -> None:
+        path = self._get_path(key, os.path.splitext(filename)[1])
+        # Copy to a temporary file first so readers never see a partial clip
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".")
+        os.close(handle)
+        shutil.copyfile(filename, temp_path)
+        size = os.path.getsize(temp_path)
+        with self._lock:
+            if os.path.exists(path):
+                self._size -= os.path.getsize(path)
+            os.replace(temp_path, path)
+            self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        removed = 0
+        for path, size, _ in sorted(self._get_entries(), key=lambda entry: entry[2]):
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self._size -= size
+            removed += 1
+
+        self.evictions += removed
+        logger().debug(f"text_to_speech_cache._evict. Removed {removed} clips")
+
+    def log_stats(self) -> None:
+        total = self.hits + self.misses
+        per = self.hits * 100 / total if total else 0
+        logger().info(
+            f"Text to speech cache: {self.hits} hits, {self.misses} misses ({per:.2f}% hit rate), {self.evictions} evicted, {self._size / 1024**2:.1f} MB used"
+        )
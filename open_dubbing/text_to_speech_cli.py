@@ -13,12 +13,14 @@
 # limitations under the License.
 
 import json
-import os
+import subprocess
+import tempfile
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence
 
 from open_dubbing import logger
-from open_dubbing.text_to_speech import TextToSpeech, Voice
+from open_dubbing.text_to_speech import SpeechRequest, TextToSpeech, Voice
 
 
 class TextToSpeechCLI(TextToSpeech):
@@ -27,7 +29,6 @@ class TextToSpeechCLI(TextToSpeech):
         super().__init__()
         self.device = device
         self.configuration = self.load_json(configuration_file)
-        self.output_dir = os.path.abspath("tts-output/")
 
     def load_json(self, configuration_file):
         with open(configuration_file, "r") as file:
@@ -83,25 +84,72 @@ class TextToSpeechCLI(TextToSpeech):
         speed: float,
     ) -> str:
 
-        cmd = self._get_command(
-            assigned_voice=assigned_voice, text=text, directory=self.output_dir
-        )
-        return_code = os.system(cmd)
-        if return_code != 0:
-            raise RuntimeError(
-                f"Command '{cmd}' failed with return code: {return_code}"
+        # Each invocation writes in its own directory so they can run in parallel
+        with tempfile.TemporaryDirectory(prefix="tts-cli-") as directory:
+            cmd = self._get_command(
+                assigned_voice=assigned_voice, text=text, directory=directory
             )
-
-        wav_file = self._get_output_pattern(
-            assigned_voice=assigned_voice,
-            text=text,
-            directory=self.output_dir,
-        )
-        self._convert_to_mp3(wav_file, output_filename)
+            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(
+                    f"Command '{cmd}' failed with return code: {result.returncode}. Error: '{result.stderr.strip()}'"
+                )
+
+            wav_file = self._get_output_pattern(
+                assigned_voice=assigned_voice,
+                text=text,
+                directory=directory,
+            )
+            self._convert_to_output_format(wav_file, output_filename)
 
         logger().debug(f"text_to_speech_cli._convert_text_to_speech: {text}")
         return output_filename
 
+    def _get_cache_engine_name(self) -> str:
+        configuration = json.dumps(self.configuration, sort_keys=True)
+        return f"{type(self).__name__}:{configuration}"
+
+    def _is_thread_safe(self) -> bool:
+        return True
+
+    def _supports_batching(self):
+        return True
+
+    def _convert_text_to_speech_batch(
+        self, *, requests: Sequence[SpeechRequest]
+    ) -> List[str]:
+        """Runs the commands with up to max_workers in parallel.
+
+        All the requests are run even if some fail, and then the failed
+        utterances are reported.
+        """
+
+        def _convert(request: SpeechRequest):
+            try:
+                return self._convert_text_to_speech(**request._asdict()), None
+            except Exception as e:
+                return None, e
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            results = list(executor.map(_convert, requests))
+
+        errors = [
+            (request, error)
+            for request, (_, error) in zip(requests, results)
+            if error is not None
+        ]
+        for request, error in errors:
+            logger().error(
+                f"text_to_speech_cli. Failed to synthesize '{request.text}' into '{request.output_filename}': {error}"
+            )
+
+        if errors:
+            raise RuntimeError(
+                f"Text to speech command failed for {len(errors)} of {len(requests)} utterances"
+            )
+
+        return [output_filename for output_filename, _ in results]
+
     def get_languages(self):
         languages = set()
         for voice_cfg in self.configuration["voices"]:
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+
 from typing import List
 
 from iso639 import Lang
@@ -25,9 +27,9 @@ class TextToSpeechCoqui(TextToSpeech):
 
     DEFAULT_VOICE = "default"
 
-    def __init__(self, device="cpu"):
+    def __init__(self, device="cpu", max_memory_mb: int = 4096):
         super().__init__()
-        self.coqui = Coqui(device)
+        self.coqui = Coqui(device, max_memory_mb=max_memory_mb)
 
     def get_languages(self):
         languages = []
@@ -70,7 +72,7 @@ class TextToSpeechCoqui(TextToSpeech):
         if assigned_voice == self.DEFAULT_VOICE:
             assigned_voice = None
 
-        wav_file = output_filename.replace(".mp3", ".wav")
+        wav_file = os.path.splitext(output_filename)[0] + ".wav"
         logger().debug(
             f"text_to_speech.client.synthesize_speech: pre synthesize_speech: '{text}', '{target_language}', file: {wav_file}, speed: {speed}, voice: {assigned_voice}"
         )
@@ -79,7 +81,7 @@ class TextToSpeechCoqui(TextToSpeech):
             text, iso_639_1, file_path=wav_file, voice=assigned_voice
         )
 
-        self._convert_to_mp3(wav_file, output_filename)
+        self._convert_to_output_format(wav_file, output_filename)
         logger().debug(
             f"text_to_speech.client.synthesize_speech: output_filename: '{output_filename}'"
         )
@@ -13,37 +13,91 @@
 # limitations under the License.
 
 import asyncio
+import json
+import os
 import re
+import time
 
-from typing import List
+from typing import List, Sequence
 
 import edge_tts
 
-from edge_tts import VoicesManager, list_voices
+from edge_tts import list_voices
 from edge_tts.exceptions import NoAudioReceived
 from iso639 import Lang
 
 from open_dubbing import logger
-from open_dubbing.text_to_speech import TextToSpeech, Voice
+from open_dubbing.retry_policy import RetryPolicy
+from open_dubbing.text_to_speech import SpeechRequest, TextToSpeech, Voice
 
 
 class TextToSpeechEdge(TextToSpeech):
 
-    async def _create_manager(self):
-        voice_manager = await VoicesManager.create()
-        return voice_manager
+    # Voice catalogue shared by all the instances of the process
+    _voices = None
 
-    def __init__(self, device="cpu"):
+    def __init__(
+        self,
+        device="cpu",
+        max_concurrency: int = 8,
+        cache_directory: str = "",
+        voices_cache_ttl: float = 24 * 60 * 60,
+    ):
         super().__init__()
         self.device = device
+        self.max_concurrency = max_concurrency
+        self.cache_directory = cache_directory or os.path.join(
+            os.path.expanduser("~"), ".cache", "open_dubbing"
+        )
+        self.voices_cache_ttl = voices_cache_ttl
+        self.retry_policy = RetryPolicy(name="text_to_speech_edge")
+
+    def _get_voices_cache_filename(self) -> str:
+        return os.path.join(self.cache_directory, "edge_voices.json")
+
+    def _read_cached_voices(self):
+        filename = self._get_voices_cache_filename()
+        try:
+            if time.time() - os.path.getmtime(filename) > self.voices_cache_ttl:
+                return None
+
+            with open(filename, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cached_voices(self, voices) -> None:
+        filename = self._get_voices_cache_filename()
+        try:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            with open(filename, "w", encoding="utf-8") as file:
+                json.dump(voices, file)
+        except OSError as e:
+            logger().warning(
+                f"text_to_speech_edge._write_cached_voices. Cannot write '{filename}': {e}"
+            )
+
+    def _get_voices(self):
+        """Returns Edge's voice catalogue, fetched once per process and cached on disk."""
+        if TextToSpeechEdge._voices is None:
+            voices = self._read_cached_voices()
+            if voices is None:
+                voices = asyncio.run(self._get_list_voices())
+                self._write_cached_voices(voices)
+
+            TextToSpeechEdge._voices = voices
+
+        return TextToSpeechEdge._voices
 
     def get_available_voices(self, language_code: str) -> List[Voice]:
         voices = []
         iso_639_1 = self._get_iso_639_1(language_code)
 
-        voice_manager = asyncio.run(self._create_manager())
-
-        edge_voices = voice_manager.find(Language=iso_639_1)
+        edge_voices = [
+            voice
+            for voice in self._get_voices()
+            if voice.get("Locale", "").split("-")[0] == iso_639_1
+        ]
         for edge_voice in edge_voices:
             if not all(key in edge_voice for key in ["ShortName", "Gender", "Locale"]):
                 logger().warning(
@@ -72,29 +126,25 @@ class TextToSpeechEdge(TextToSpeech):
         iso_639_1 = o.pt1
         return iso_639_1
 
+    def _is_thread_safe(self) -> bool:
+        return True
+
     def _does_voice_supports_speeds(self):
         return True
 
+    def _get_output_format(self) -> str:
+        # The service returns MP3, stored without transcoding
+        return "mp3"
+
     async def _save(self, text, speed, assigned_voice, output_filename):
         per = (100 * speed) - 100
         str_per = f"+{per:0.0f}%"
-        max_retries = 3
-        for attempt in range(1, max_retries + 1):
-            try:
-                communicate = edge_tts.Communicate(text, assigned_voice, rate=str_per)
-                await communicate.save(output_filename)
-                return
-            except NoAudioReceived:
-                if attempt == max_retries:
-                    logger().error(
-                        "text_to_speech_edge._save. Max retries reached. Could not save audio."
-                    )
-                    raise
-                else:
-                    logger().warning(
-                        f"text_to_speech_edge._save. No audio received, retrying attempt {attempt}."
-                    )
-                    await asyncio.sleep(30)
+
+        async def _communicate():
+            communicate = edge_tts.Communicate(text, assigned_voice, rate=str_per)
+            await communicate.save(output_filename)
+
+        await self.retry_policy.call_async(_communicate, retry_on=(NoAudioReceived,))
 
     def _convert_text_to_speech(
         self,
@@ -112,11 +162,39 @@ class TextToSpeechEdge(TextToSpeech):
         )
         return output_filename
 
+    def _supports_batching(self):
+        return True
+
+    async def _save_all(self, requests: Sequence[SpeechRequest]):
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def _save_request(request: SpeechRequest):
+            async with semaphore:
+                await self._save(
+                    request.text,
+                    request.speed,
+                    request.assigned_voice,
+                    request.output_filename,
+                )
+            return request.output_filename
+
+        return await asyncio.gather(*[_save_request(request) for request in requests])
+
+    def _convert_text_to_speech_batch(
+        self, *, requests: Sequence[SpeechRequest]
+    ) -> List[str]:
+        """Synthesizes the requests concurrently on a single event loop."""
+        dubbed_files = asyncio.run(self._save_all(requests))
+        logger().debug(
+            f"text_to_speech_edge._convert_text_to_speech_batch: synthesized {len(dubbed_files)} utterances"
+        )
+        return dubbed_files
+
     async def _get_list_voices(self):
         return await list_voices()
 
     def get_languages(self):
-        voices = asyncio.run(self._get_list_voices())
+        voices = self._get_voices()
 
         pattern = r"^([a-z]{2})-(.*)$"
         locales = set()
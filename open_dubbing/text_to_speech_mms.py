@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
+import os
+
+from collections import OrderedDict
+from typing import List, Mapping, Sequence, Tuple
 
 import numpy as np
 import scipy.io.wavfile
@@ -21,18 +24,56 @@ import torch
 from transformers import AutoTokenizer, VitsModel
 
 from open_dubbing import logger
-from open_dubbing.text_to_speech import TextToSpeech, Voice
+from open_dubbing.text_to_speech import SpeechRequest, TextToSpeech, Voice
 
 
 class TextToSpeechMMS(TextToSpeech):
 
-    def __init__(self, device="cpu"):
+    def __init__(
+        self,
+        device="cpu",
+        max_cached_languages: int = 2,
+        batch_size: int = 8,
+        max_batch_tokens: int = 2048,
+    ):
         super().__init__()
         self.device = device
+        self.max_cached_languages = max_cached_languages
+        self.batch_size = batch_size
+        # Caps the padded input size (utterances x longest tokens) of a batch to bound memory
+        self.max_batch_tokens = max_batch_tokens
+        # language -> (model, tokenizer), least recently used first
+        self._models = OrderedDict()
 
     def get_available_voices(self, language_code: str) -> List[Voice]:
         return [Voice(name="voice", gender=self._SSML_MALE)]
 
+    def _load_model(self, language: str):
+        local_files_only = False
+        model = VitsModel.from_pretrained(
+            f"facebook/mms-tts-{language}", local_files_only=local_files_only
+        ).to(self.device)
+        tokenizer = AutoTokenizer.from_pretrained(
+            f"facebook/mms-tts-{language}", local_files_only=local_files_only
+        )
+        return model, tokenizer
+
+    def _get_model(self, language: str):
+        if language in self._models:
+            self._models.move_to_end(language)
+            return self._models[language]
+
+        logger().debug(f"TextToSpeechMMS._get_model. Loading model for '{language}'")
+        self._models[language] = self._load_model(language)
+        while len(self._models) > self.max_cached_languages:
+            evicted, _ = self._models.popitem(last=False)
+            logger().debug(f"TextToSpeechMMS._get_model. Evicted model for '{evicted}'")
+
+        return self._models[language]
+
+    def warm_up(self, *, target_language: str):
+        self._get_model(target_language)
+
     def _convert_text_to_speech(
         self,
         *,
@@ -43,51 +84,150 @@ class TextToSpeechMMS(TextToSpeech):
         speed: float,
     ) -> str:
 
-        logger().debug(f"TextToSpeechMMS._convert_text_to_speech: {text}")
-        local_files_only = False
-
-        # Load pre-trained model and tokenizer
-        model = VitsModel.from_pretrained(
-            f"facebook/mms-tts-{target_language}", local_files_only=local_files_only
-        ).to(self.device)
-        tokenizer = AutoTokenizer.from_pretrained(
-            f"facebook/mms-tts-{target_language}", local_files_only=local_files_only
+        output_np, sampling_rate = self._convert_text_to_speech_samples(
+            assigned_voice=assigned_voice,
+            target_language=target_language,
+            text=text,
+            speed=speed,
         )
+        self._write_output(output_np, sampling_rate, output_filename)
+        return output_filename
+
+    def _convert_text_to_speech_samples(
+        self,
+        *,
+        assigned_voice: str,
+        target_language: str,
+        text: str,
+        speed: float,
+    ) -> Tuple[np.ndarray, int]:
+
+        logger().debug(f"TextToSpeechMMS._convert_text_to_speech_samples: {text}")
+        model, tokenizer = self._get_model(target_language)
         inputs = tokenizer(text, return_tensors="pt").to(self.device)
 
         # Model returns for some sequences of tokens no result
         if inputs["input_ids"].shape[1] == 0:
-            sampling_rate = 16000
-            duration_seconds = 1
-            # If we fill the array with (np.zeros) the ffmpeg process later fails
-            output_np = np.ones(sampling_rate * duration_seconds, dtype=np.int16)
-            logger().warning(
-                f"TextToSpeechMMS._convert_text_to_speech. Model returns input tokens for text '{text}', generating an empty WAV file."
-            )
+            output_np, sampling_rate = self._get_empty_output(text)
         else:
             with torch.no_grad():
                 output = model(**inputs).waveform
 
-            # Convert waveform to NumPy array and scale to 16-bit PCM
             # Assuming `output` is a 2D tensor with shape (batch_size, samples)
-            output_np = (
+            output_np = self._to_pcm(
                 output.squeeze().cpu().numpy()
             )  # Remove batch dimension if present
-            output_np = np.clip(output_np, -1, 1)  # Clip values to be between -1 and 1
-            output_np = (output_np * 32767).astype(np.int16)  # Scale to 16-bit PCM
 
             # Get the sampling rate
             sampling_rate = model.config.sampling_rate
 
-        # Write to WAV file
-        wav_file = output_filename.replace(".mp3", ".wav")
+        return output_np, sampling_rate
+
+    def _get_empty_output(self, text):
+        sampling_rate = 16000
+        duration_seconds = 1
+        # If we fill the array with (np.zeros) the ffmpeg process later fails
+        output_np = np.ones(sampling_rate * duration_seconds, dtype=np.int16)
+        logger().warning(
+            f"TextToSpeechMMS._convert_text_to_speech. Model returns input tokens for text '{text}', generating an empty WAV file."
+        )
+        return output_np, sampling_rate
+
+    def _to_pcm(self, waveform: np.ndarray) -> np.ndarray:
+        """Converts a waveform to 16-bit PCM."""
+        output_np = np.clip(waveform, -1, 1)  # Clip values to be between -1 and 1
+        return (output_np * 32767).astype(np.int16)  # Scale to 16-bit PCM
+
+    def _write_output(self, output_np, sampling_rate, output_filename):
+        wav_file = os.path.splitext(output_filename)[0] + ".wav"
         scipy.io.wavfile.write(wav_file, rate=sampling_rate, data=output_np)
 
-        self._convert_to_mp3(wav_file, output_filename)
+        self._convert_to_output_format(wav_file, output_filename)
         logger().debug(
             f"text_to_speech.client.synthesize_speech: output_filename: '{output_filename}'"
         )
-        return output_filename
+
+    def _supports_batching(self):
+        return True
+
+    def _get_batches(self, lengths: Mapping[int, int]) -> List[List[int]]:
+        """Groups request indexes into batches of similar token length.
+
+        Sorting by length minimizes padding. A batch is closed when it reaches
+        batch_size or when padding it to its longest input would exceed max_batch_tokens.
+        """
+        batches = []
+        batch = []
+        for idx in sorted(lengths, key=lambda idx: lengths[idx]):
+            # Sorted ascending, so the new request is the longest of the batch
+            padded_tokens = (len(batch) + 1) * lengths[idx]
+            if batch and (
+                len(batch) >= self.batch_size or padded_tokens > self.max_batch_tokens
+            ):
+                batches.append(batch)
+                batch = []
+            batch.append(idx)
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _synthesize_batch(
+        self, *, model, tokenizer, requests: List[SpeechRequest]
+    ) -> List[Tuple[np.ndarray, int]]:
+        texts = [request.text for request in requests]
+        inputs = tokenizer(texts, padding=True, return_tensors="pt").to(self.device)
+        with torch.no_grad():
+            output = model(**inputs)
+
+        waveforms = output.waveform.cpu().numpy()
+        sequence_lengths = output.sequence_lengths.cpu().numpy()
+        sampling_rate = model.config.sampling_rate
+        return [
+            (self._to_pcm(waveform[:length]), sampling_rate)
+            for waveform, length in zip(waveforms, sequence_lengths)
+        ]
+
+    def _convert_text_to_speech_batch_samples(
+        self, *, requests: Sequence[SpeechRequest]
+    ) -> List[Tuple[np.ndarray, int]]:
+        languages = {}
+        for idx, request in enumerate(requests):
+            languages.setdefault(request.target_language, []).append(idx)
+
+        outputs = [None] * len(requests)
+        for language, indexes in languages.items():
+            model, tokenizer = self._get_model(language)
+            lengths = {}
+            for idx in indexes:
+                text = requests[idx].text
+                length = len(tokenizer(text)["input_ids"])
+                if length == 0:
+                    outputs[idx] = self._get_empty_output(text)
+                else:
+                    lengths[idx] = length
+
+            for batch in self._get_batches(lengths):
+                logger().debug(
+                    f"TextToSpeechMMS._convert_text_to_speech_batch_samples. Synthesizing {len(batch)} utterances for '{language}'"
+                )
+                batch_outputs = self._synthesize_batch(
+                    model=model,
+                    tokenizer=tokenizer,
+                    requests=[requests[idx] for idx in batch],
+                )
+                for idx, output in zip(batch, batch_outputs):
+                    outputs[idx] = output
+
+        return outputs
+
+    def _convert_text_to_speech_batch(
+        self, *, requests: Sequence[SpeechRequest]
+    ) -> List[str]:
+        outputs = self._convert_text_to_speech_batch_samples(requests=requests)
+        for request, (output_np, sampling_rate) in zip(requests, outputs):
+            self._write_output(output_np, sampling_rate, request.output_filename)
+        return [request.output_filename for request in requests]
 
     # Reference: https://dl.fbaipublicfiles.com/mms/tts/all-tts-languages.html
     def get_languages(self):
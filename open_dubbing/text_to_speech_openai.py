@@ -56,9 +56,16 @@ class TextToSpeechOpenAI(TextToSpeech):
 
         return voices
 
+    def _is_thread_safe(self) -> bool:
+        return True
+
     def _does_voice_supports_speeds(self):
         return False
 
+    def _get_output_format(self) -> str:
+        # The service returns MP3, stored without transcoding
+        return "mp3"
+
     def _convert_text_to_speech(
         self,
         *,
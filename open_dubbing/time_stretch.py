@@ -0,0 +1,112 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from open_dubbing.pydub_audio_segment import AudioSegment
+
+
+def _find_best_shift(region: np.ndarray, template: np.ndarray) -> int:
+    """Returns the offset in region where template fits best (cross-correlation)."""
+    return int(np.argmax(np.correlate(region, template, mode="valid")))
+
+
+def time_stretch_samples(
+    samples: np.ndarray,
+    *,
+    frame_rate: int,
+    speed: float,
+    frame_duration: float = 0.03,
+    tolerance_duration: float = 0.01,
+    search_rate: int = 8000,
+) -> np.ndarray:
+    """Changes the tempo of samples without changing their pitch using WSOLA.
+
+    samples is a float array of shape (frames, channels). The result has
+    round(frames / speed) frames. Each output frame is the input frame, within
+    tolerance_duration seconds of its nominal position, that best continues
+    the previous one, so no filters need to be chained for large speeds. The
+    search is done on a mono mix decimated to about search_rate and refined
+    at the full rate.
+    """
+    frame_count = len(samples)
+    output_count = int(round(frame_count / speed))
+    if speed == 1.0 or frame_count == 0:
+        return samples[:output_count]
+
+    window_size = max(4, int(frame_rate * frame_duration) // 2 * 2)
+    synthesis_hop = window_size // 2
+    analysis_hop = synthesis_hop * speed
+    tolerance = max(1, int(frame_rate * tolerance_duration))
+    decimation = max(1, frame_rate // search_rate)
+    window = np.hanning(window_size + 1)[:window_size].astype(np.float32)
+
+    frames = output_count // synthesis_hop + 2
+    padding = window_size + 2 * tolerance + 2 * decimation
+    needed = int(frames * analysis_hop) + synthesis_hop + window_size + padding
+    channels = samples.shape[1]
+    padded = np.zeros((needed + padding, channels), dtype=np.float32)
+    padded[padding : padding + frame_count] = samples
+    mono = padded @ np.full(channels, 1 / channels, dtype=np.float32)
+    coarse = mono[: len(mono) // decimation * decimation]
+    coarse = coarse.reshape(-1, decimation).mean(axis=1)
+    coarse_window = window_size // decimation
+    coarse_region = (2 * tolerance + window_size) // decimation
+
+    # The first frame is centred on the first sample so that every output
+    # sample is covered by two windows
+    start_position = padding - synthesis_hop
+    positions = np.empty(frames, dtype=np.int64)
+    positions[0] = start_position
+    for frame in range(1, frames):
+        # Look around the nominal position for the frame most similar to the
+        # natural continuation of the previous one
+        continuation = positions[frame - 1] + synthesis_hop
+        region_start = start_position + int(round(frame * analysis_hop)) - tolerance
+        shift = _find_best_shift(
+            coarse[region_start // decimation :][:coarse_region],
+            coarse[continuation // decimation :][:coarse_window],
+        )
+        position = (region_start // decimation + shift) * decimation
+        if decimation > 1:
+            position += -decimation + _find_best_shift(
+                mono[position - decimation : position + decimation + window_size],
+                mono[continuation : continuation + window_size],
+            )
+        positions[frame] = position
+
+    # With 50% overlap the first half of each windowed frame is added to the
+    # second half of the previous one
+    indexes = positions[:, None] + np.arange(window_size)
+    windowed = padded[indexes] * window[None, :, None]
+    output = windowed[:, :synthesis_hop].copy()
+    output[1:] += windowed[:-1, synthesis_hop:]
+    output = output.reshape(-1, channels)
+    # Hann windows with 50% overlap add up to one
+    return output[synthesis_hop : synthesis_hop + output_count]
+
+
+def time_stretch(audio: AudioSegment, *, speed: float) -> AudioSegment:
+    """Returns the audio played speed times faster keeping its pitch."""
+    max_value = float(1 << (8 * audio.sample_width - 1))
+    samples = np.asarray(audio.get_array_of_samples(), dtype=np.float64)
+    samples = samples.reshape(-1, audio.channels)
+
+    stretched = time_stretch_samples(samples, frame_rate=audio.frame_rate, speed=speed)
+    # Clipped in double precision, float32 cannot hold the 32 bit limits
+    stretched = np.clip(
+        np.round(stretched.astype(np.float64)), -max_value, max_value - 1
+    )
+    dtype = {1: np.int8, 2: np.int16, 4: np.int32}[audio.sample_width]
+    return audio._spawn(stretched.astype(dtype).tobytes())
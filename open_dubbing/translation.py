@@ -17,22 +17,60 @@ import re
 import time
 
 from abc import ABC, abstractmethod
-from typing import Final, Mapping, Sequence
+from collections.abc import Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final, Iterable, List, Mapping, Sequence
 
 from open_dubbing import logger
+from open_dubbing.translation_cache import TranslationCache, TranslationCacheKey
 
 _BREAK_MARKER: Final[str] = "<BREAK>"
 
 
+class LanguagePairs(Set):
+    """All the (source, target) pairs between different languages of a set.
+
+    Answers membership checks without building every pair, which for models
+    that support hundreds of languages is a set of tens of thousands of tuples.
+    """
+
+    def __init__(self, languages: Iterable[str]):
+        self._languages = frozenset(languages)
+
+    def __contains__(self, pair) -> bool:
+        try:
+            source, target = pair
+        except (TypeError, ValueError):
+            return False
+        return source != target and {source, target} <= self._languages
+
+    def __iter__(self):
+        for source in self._languages:
+            for target in self._languages:
+                if source != target:
+                    yield (source, target)
+
+    def __len__(self) -> int:
+        return len(self._languages) * (len(self._languages) - 1)
+
+
 class Translation(ABC):
 
     def __init__(self, device="cpu"):
         self.device = device
+        self.cache = None
 
     @abstractmethod
     def load_model(self):
         pass
 
+    def set_cache(self, cache: TranslationCache | None) -> None:
+        self.cache = cache
+
+    def _get_cache_model_name(self) -> str:
+        """Identifies the model or server within the engine for the translation cache."""
+        return ""
+
     def _generate_script(self, *, utterance_metadata, key: str = "text") -> str:
         """Generates a script string from a list of utterance metadata."""
         trimmed_lines = [
@@ -53,6 +91,154 @@ class Translation(ABC):
     ) -> str:
         pass
 
+    def _translate_texts(
+        self, source_language: str, target_language: str, texts: Sequence[str]
+    ) -> List[str]:
+        """Translates several texts. Engines that can translate in batches override it."""
+        return [
+            self._translate_text(
+                source_language=source_language,
+                target_language=target_language,
+                text=text,
+            )
+            for text in texts
+        ]
+
+    def _pack_texts(
+        self, texts: Sequence[str], max_chars: int, separator: str
+    ) -> List[List[str]]:
+        """Groups consecutive texts so that each group joined with the separator fits in max_chars."""
+        groups = []
+        group = []
+        size = 0
+        for text in texts:
+            length = len(text) + len(separator)
+            fits = size + length <= max_chars and separator not in text
+            if group and not fits:
+                groups.append(group)
+                group = []
+                size = 0
+
+            group.append(text)
+            size += length
+            if separator in text:
+                # The text cannot be split back apart, it is sent alone
+                groups.append(group)
+                group = []
+                size = 0
+
+        if group:
+            groups.append(group)
+        return groups
+
+    def _translate_packed_texts(
+        self,
+        source_language: str,
+        target_language: str,
+        texts: Sequence[str],
+        separator: str,
+    ) -> List[str]:
+        """Translates the texts joined with the separator in a single call.
+
+        If the translation does not have one part per text, falls back to one
+        call per text.
+        """
+        translated = self._translate_text(
+            source_language=source_language,
+            target_language=target_language,
+            text=separator.join(texts),
+        )
+        if len(texts) == 1:
+            return [translated]
+
+        parts = translated.split(separator)
+        if len(parts) == len(texts):
+            return [part.strip() for part in parts]
+
+        logger().warning(
+            f"translation._translate_packed_texts. Expected {len(texts)} segments and got {len(parts)}, translating them one by one"
+        )
+        return [
+            self._translate_text(
+                source_language=source_language,
+                target_language=target_language,
+                text=text,
+            )
+            for text in texts
+        ]
+
+    def _translate_texts_concurrently(
+        self,
+        source_language: str,
+        target_language: str,
+        texts: Sequence[str],
+        max_workers: int,
+        max_chars: int = 0,
+        separator: str = "\n",
+    ) -> List[str]:
+        """Translates the texts with up to max_workers calls in flight, keeping their order.
+
+        When max_chars is greater than zero, consecutive texts are packed in a
+        single call up to that number of characters.
+        """
+        if max_chars > 0:
+            groups = self._pack_texts(texts, max_chars, separator)
+        else:
+            groups = [[text] for text in texts]
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = executor.map(
+                lambda group: self._translate_packed_texts(
+                    source_language, target_language, group, separator
+                ),
+                groups,
+            )
+            return [translation for result in results for translation in result]
+
+    def _translate_texts_with_cache(
+        self, source_language: str, target_language: str, texts: Sequence[str]
+    ) -> List[str]:
+        """Translates the texts that are not already in the translation cache."""
+        if self.cache is None:
+            return self._translate_texts(
+                source_language=source_language,
+                target_language=target_language,
+                texts=texts,
+            )
+
+        engine = type(self).__name__
+        model = self._get_cache_model_name()
+        keys = [
+            TranslationCacheKey(
+                engine,
+                model,
+                source_language,
+                target_language,
+                TranslationCache.normalize_text(text),
+            )
+            for text in texts
+        ]
+        translations = self.cache.get_all(keys)
+
+        missing = [
+            idx for idx, translation in enumerate(translations) if translation is None
+        ]
+        if missing:
+            translated = self._translate_texts(
+                source_language=source_language,
+                target_language=target_language,
+                texts=[texts[idx] for idx in missing],
+            )
+            for idx, translation in zip(missing, translated):
+                translations[idx] = translation
+
+            self.cache.put_all([(keys[idx], translations[idx]) for idx in missing])
+
+        logger().debug(
+            f"translation._translate_texts_with_cache. Cached {len(texts) - len(missing)} of {len(texts)}"
+        )
+        return translations
+
     def translate_utterances(
         self,
         *,
@@ -95,18 +281,16 @@ class Translation(ABC):
         # Split the input string by the <BREAK> delimiter
         parts = script.split(_BREAK_MARKER)
 
-        translated_parts = []
-        for text in parts:
-            if len(text.strip()) == 0:
-                translation = ""
-            else:
-                translation = self._translate_text(
-                    source_language=source_language,
-                    target_language=target_language,
-                    text=text,
-                )
-
-            translated_parts.append(translation)
+        indexes = [idx for idx, text in enumerate(parts) if len(text.strip()) > 0]
+        translations = self._translate_texts_with_cache(
+            source_language=source_language,
+            target_language=target_language,
+            texts=[parts[idx] for idx in indexes],
+        )
+
+        translated_parts = [""] * len(parts)
+        for idx, translation in zip(indexes, translations):
+            translated_parts[idx] = translation
 
         translation = _BREAK_MARKER.join(translated_parts)
         logger().debug(f"translation.translate_script. Translation: {translation}")
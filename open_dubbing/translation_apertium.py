@@ -12,16 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-import time
-import urllib
+from typing import List, Sequence
 
 from open_dubbing import logger
+from open_dubbing.http_session import create_session
+from open_dubbing.retry_policy import RetryPolicy
 from open_dubbing.translation import Translation
 
 
 class TranslationApertium(Translation):
 
+    def __init__(
+        self, device="cpu", max_in_flight: int = 4, max_request_chars: int = 1000
+    ):
+        super().__init__(device)
+        self.max_in_flight = max_in_flight
+        self.max_request_chars = max_request_chars
+        self.session = create_session(pool_size=max_in_flight)
+        self.retry_policy = RetryPolicy(name="translation_apertium")
+
     def load_model(self):
         pass
 
@@ -31,38 +40,48 @@ class TranslationApertium(Translation):
 
         self.server = server
 
-    def _do_api_call(self, url):
-        max_retries = 3
-        for attempt in range(1, max_retries + 1):
-            try:
-                response = urllib.request.urlopen(url)
-                r = response.read().decode("utf-8")
-                data = json.loads(r)
-                return data["responseData"]
-            except Exception:
-                if attempt == max_retries:
-                    logger().error(
-                        "translation_apertium. Max retries reached. Could not complete translation API call."
-                    )
-                    raise
-                else:
-                    logger().warning(
-                        f"translation_apertium. Could not complete translation API call, retrying attempt {attempt}."
-                    )
-                    time.sleep(30)
+    def _get_cache_model_name(self) -> str:
+        return self.server
+
+    def _do_api_call(self, url, data=None):
+        def _call():
+            if data is None:
+                response = self.session.get(url)
+            else:
+                response = self.session.post(url, data=data)
+            response.raise_for_status()
+            return response.json()["responseData"]
+
+        return self.retry_policy.call(_call)
 
     def _translate_text(
         self, source_language: str, target_language: str, text: str
     ) -> str:
 
-        langpair = f"{source_language}|{target_language}"
-        text = urllib.parse.quote_plus(text.encode("utf-8"))
         method = "translate"
-        url = f"{self.server}{method}?q={text}&langpair={langpair}&markUnknown=no"
-        translated = self._do_api_call(url)
+        url = f"{self.server}{method}"
+        data = {
+            "q": text,
+            "langpair": f"{source_language}|{target_language}",
+            "markUnknown": "no",
+        }
+        translated = self._do_api_call(url, data)
         translated = translated["translatedText"]
         return translated.rstrip()
 
+    def _translate_texts(
+        self, source_language: str, target_language: str, texts: Sequence[str]
+    ) -> List[str]:
+        # The server keeps line breaks, which is used to pack several segments
+        return self._translate_texts_concurrently(
+            source_language,
+            target_language,
+            texts,
+            self.max_in_flight,
+            max_chars=self.max_request_chars,
+            separator="\n",
+        )
+
     def get_language_pairs(self):
         method = "listPairs"
         url = f"{self.server}{method}"
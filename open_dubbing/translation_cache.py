@@ -0,0 +1,128 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+import time
+
+from typing import Final, List, NamedTuple, Sequence, Tuple
+
+from open_dubbing import logger
+
+_DATABASE_FILE: Final[str] = "translations.db"
+_KEY_CONDITION: Final[str] = (
+    "engine = ? AND model = ? AND source_language = ? AND target_language = ? AND text = ?"
+)
+
+
+class TranslationCacheKey(NamedTuple):
+    engine: str
+    model: str
+    source_language: str
+    target_language: str
+    text: str
+
+
+class TranslationCache:
+    """Persistent translation memory stored in a SQLite database.
+
+    Entries are keyed by engine, model, languages and normalised source text.
+    When the cache grows beyond max_entries the least recently used entries
+    are removed.
+    """
+
+    def __init__(self, *, directory: str, max_entries: int = 100000):
+        os.makedirs(directory, exist_ok=True)
+        self.filename = os.path.join(directory, _DATABASE_FILE)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(self.filename)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "engine TEXT NOT NULL, "
+            "model TEXT NOT NULL, "
+            "source_language TEXT NOT NULL, "
+            "target_language TEXT NOT NULL, "
+            "text TEXT NOT NULL, "
+            "translation TEXT NOT NULL, "
+            "last_used REAL NOT NULL, "
+            "PRIMARY KEY (engine, model, source_language, target_language, text))"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return " ".join(text.split())
+
+    def get_all(self, keys: Sequence[TranslationCacheKey]) -> List[str | None]:
+        """Returns the cached translation for each key, or None when it is not cached."""
+        translations = []
+        now = time.time()
+        with self._connection:
+            for key in keys:
+                row = self._connection.execute(
+                    f"SELECT translation FROM translations WHERE {_KEY_CONDITION}", key
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    translations.append(None)
+                    continue
+
+                self.hits += 1
+                self._connection.execute(
+                    f"UPDATE translations SET last_used = ? WHERE {_KEY_CONDITION}",
+                    (now, *key),
+                )
+                translations.append(row[0])
+
+        return translations
+
+    def put_all(self, entries: Sequence[Tuple[TranslationCacheKey, str]]) -> None:
+        now = time.time()
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*key, translation, now) for key, translation in entries],
+            )
+            self._evict()
+
+    def __len__(self):
+        row = self._connection.execute("SELECT COUNT(*) FROM translations").fetchone()
+        return row[0]
+
+    def _evict(self) -> None:
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return
+
+        self._connection.execute(
+            "DELETE FROM translations WHERE rowid IN "
+            "(SELECT rowid FROM translations ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        logger().debug(f"translation_cache._evict. Removed {excess} entries")
+
+    def log_stats(self) -> None:
+        total = self.hits + self.misses
+        per = self.hits * 100 / total if total else 0
+        logger().info(
+            f"Translation cache: {self.hits} hits, {self.misses} misses ({per:.2f}% hit rate)"
+        )
+
+    def close(self) -> None:
+        self._connection.close()
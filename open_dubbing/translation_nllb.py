@@ -12,26 +12,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import List, Mapping, Sequence
+
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
 
 from open_dubbing import logger
-from open_dubbing.translation import Translation
+from open_dubbing.translation import LanguagePairs, Translation
 
 
 class TranslationNLLB(Translation):
 
-    def __init__(self, device="cpu"):
+    def __init__(self, device="cpu", batch_size: int = 8):
         super().__init__(device)
         self.translator = None
         self.translator_languages = ""
+        self.batch_size = batch_size
+        self._nllb_languages = None
 
     def load_model(self, name="nllb-200-1.3B"):
         self.model_name = f"facebook/{name}"
         self.tokenizer = self._get_tokenizer_nllb()
+        self._nllb_languages = None
 
-    def _translate_text(
-        self, source_language: str, target_language: str, text: str
-    ) -> str:
+    def _get_cache_model_name(self) -> str:
+        return self.model_name
+
+    def _get_translator(self, source_language: str, target_language: str):
         languages = f"{source_language}{target_language}"
         if not self.translator or self.translator_languages != languages:
             model = self._get_model_nllb()
@@ -45,9 +51,34 @@ class TranslationNLLB(Translation):
             )
             self.translator_languages = languages
 
-        translated = self.translator(text)
+        return self.translator
+
+    def _translate_text(
+        self, source_language: str, target_language: str, text: str
+    ) -> str:
+        translator = self._get_translator(source_language, target_language)
+        translated = translator(text)
         return translated[0]["translation_text"]
 
+    def _translate_texts(
+        self, source_language: str, target_language: str, texts: Sequence[str]
+    ) -> List[str]:
+        """Translates the texts in batches of similar token length to minimize padding."""
+        translator = self._get_translator(source_language, target_language)
+        lengths = [len(self.tokenizer(text)["input_ids"]) for text in texts]
+        order = sorted(range(len(texts)), key=lambda idx: lengths[idx])
+
+        translations = [""] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start : start + self.batch_size]
+            translated = translator(
+                [texts[idx] for idx in batch], batch_size=len(batch)
+            )
+            for idx, result in zip(batch, translated):
+                translations[idx] = result["translation_text"]
+
+        return translations
+
     def _get_tokenizer_nllb(self):
         return AutoTokenizer.from_pretrained(self.model_name)
 
@@ -65,29 +96,24 @@ class TranslationNLLB(Translation):
             else:
                 raise e
 
+    def _get_nllb_languages(self) -> Mapping[str, str]:
+        """Returns a map from ISO 639-3 codes to NLLB codes, e.g. 'cat' to 'cat_Latn'."""
+        if self._nllb_languages is None:
+            nllb_languages = {}
+            for nllb_language in self.tokenizer.additional_special_tokens:
+                # Keep the first script when a language has several
+                nllb_languages.setdefault(nllb_language[:3], nllb_language)
+            self._nllb_languages = nllb_languages
+
+        return self._nllb_languages
+
     def get_language_pairs(self):
-        tokenizer = self._get_tokenizer_nllb()
-        # Returns 'cat_Latn'
-        original_list = tokenizer.additional_special_tokens
-        # Get only the language codes
-        supported_languages = [s[:3] for s in original_list]
-        pairs = set()
-        for source in supported_languages:
-            for target in supported_languages:
-                if source == target:
-                    continue
-
-                pair = (source, target)
-                pairs.add(pair)
-
-        return pairs
+        return LanguagePairs(self._get_nllb_languages().keys())
 
     def _get_nllb_language(self, source_language_iso_639_3: str) -> str:
-        tokenizer = self._get_tokenizer_nllb()
-        nllb_languages = tokenizer.additional_special_tokens
-        for nllb_language in nllb_languages:
-            if nllb_language[:3] == source_language_iso_639_3:
-                return nllb_language
+        nllb_language = self._get_nllb_languages().get(source_language_iso_639_3)
+        if nllb_language:
+            return nllb_language
 
         raise ValueError(
             f"Language {source_language_iso_639_3} not supported by Meta NLLB translation model"
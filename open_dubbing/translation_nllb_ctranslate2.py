@@ -0,0 +1,112 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+
+from typing import List, Sequence
+
+import ctranslate2
+
+from open_dubbing import logger
+from open_dubbing.translation_nllb import TranslationNLLB
+
+
+class TranslationNLLBCTranslate2(TranslationNLLB):
+    """Meta NLLB translation running on CTranslate2 with int8 weights.
+
+    The Hugging Face model is converted to CTranslate2 format the first time
+    that it is used and kept in the models directory for the next runs.
+    """
+
+    def __init__(
+        self,
+        device="cpu",
+        batch_size: int = 8,
+        cpu_threads: int = 0,
+        models_directory: str = "",
+    ):
+        super().__init__(device, batch_size=batch_size)
+        self.cpu_threads = cpu_threads
+        self.models_directory = models_directory or os.path.join(
+            os.path.expanduser("~"), ".cache", "open_dubbing", "ctranslate2"
+        )
+
+    def load_model(self, name="nllb-200-1.3B"):
+        super().load_model(name)
+        self.model_path = os.path.join(self.models_directory, f"{name}-int8")
+
+    def _convert_model(self):
+        logger().info(
+            f"Converting translation model {self.model_name} to CTranslate2 format in {self.model_path}"
+        )
+        # Converted into a temporary directory and moved into place once
+        # complete, so an interrupted conversion is redone in the next run
+        temp_path = f"{self.model_path}.tmp"
+        converter = ctranslate2.converters.TransformersConverter(self.model_name)
+        converter.convert(temp_path, quantization="int8", force=True)
+        if os.path.exists(self.model_path):
+            shutil.rmtree(self.model_path)
+        os.replace(temp_path, self.model_path)
+
+    def _get_translator(self, source_language: str, target_language: str):
+        if not self.translator:
+            if not os.path.exists(os.path.join(self.model_path, "model.bin")):
+                self._convert_model()
+
+            self.translator = ctranslate2.Translator(
+                self.model_path,
+                device=self.device,
+                compute_type="int8_float16" if self.device == "cuda" else "int8",
+                intra_threads=self.cpu_threads,
+            )
+
+        return self.translator
+
+    def _translate_text(
+        self, source_language: str, target_language: str, text: str
+    ) -> str:
+        return self._translate_texts(source_language, target_language, [text])[0]
+
+    def _translate_texts(
+        self, source_language: str, target_language: str, texts: Sequence[str]
+    ) -> List[str]:
+        translator = self._get_translator(source_language, target_language)
+        self.tokenizer.src_lang = self._get_nllb_language(source_language)
+        target_nllb_language = self._get_nllb_language(target_language)
+
+        sources = [
+            self.tokenizer.convert_ids_to_tokens(self.tokenizer.encode(text))
+            for text in texts
+        ]
+        # CTranslate2 sorts the examples by length before building the batches
+        results = translator.translate_batch(
+            sources,
+            target_prefix=[[target_nllb_language]] * len(sources),
+            max_batch_size=self.batch_size,
+            max_decoding_length=1024,
+        )
+
+        translations = []
+        for result in results:
+            # The first token is the target language code
+            tokens = result.hypotheses[0][1:]
+            translations.append(
+                self.tokenizer.decode(
+                    self.tokenizer.convert_tokens_to_ids(tokens),
+                    skip_special_tokens=True,
+                )
+            )
+
+        return translations
@@ -14,14 +14,25 @@
 
 import json
 import logging
-import urllib
-import requests
 
+from typing import List, Sequence
+
+from open_dubbing.http_session import create_session
+from open_dubbing.retry_policy import RetryPolicy
 from open_dubbing.translation import Translation
 
 
 class TranslationSotra(Translation):
 
+    def __init__(
+        self, device="cpu", max_in_flight: int = 4, max_request_chars: int = 0
+    ):
+        super().__init__(device)
+        self.max_in_flight = max_in_flight
+        self.max_request_chars = max_request_chars
+        self.session = create_session(pool_size=max_in_flight)
+        self.retry_policy = RetryPolicy(name="translation_sotra")
+
     def load_model(self):
         pass
 
@@ -31,15 +42,19 @@ class TranslationSotra(Translation):
 
         self.server = server
 
+    def _get_cache_model_name(self) -> str:
+        return self.server
+
     def _do_api_call(self, url, headers, payload):
-        #print("Sotra request to url " + url)
-        #print(headers)
-        #print(payload)
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
-        #print("Sotra response raw")
-        #print(response)
-        data = response.json()
-        return data["translation"]
+        def _call():
+            response = self.session.post(
+                url, headers=headers, data=json.dumps(payload)
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data["translation"]
+
+        return self.retry_policy.call(_call)
 
     def _translate_text(
         self, source_language: str, target_language: str, text: str
@@ -50,6 +65,22 @@ class TranslationSotra(Translation):
         # translated = translated["translation"]
         return translated.rstrip()
 
+    def _translate_texts(
+        self, source_language: str, target_language: str, texts: Sequence[str]
+    ) -> List[str]:
+        # Sotra is a neural MT server that may merge or split sentences across
+        # lines, so packing segments separated by line breaks can return a
+        # neighbour's text while keeping the number of lines. It is disabled by
+        # default (max_request_chars=0) and users can opt in
+        return self._translate_texts_concurrently(
+            source_language,
+            target_language,
+            texts,
+            self.max_in_flight,
+            max_chars=self.max_request_chars,
+            separator="\n",
+        )
+
     def get_language_pairs(self):
         source = "deu"
         target = "hsb"
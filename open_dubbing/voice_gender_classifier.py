@@ -90,12 +90,12 @@ class VoiceGenderClassifier:
         self.processor = Wav2Vec2Processor.from_pretrained(model_name)
         self.model = AgeGenderModel.from_pretrained(model_name).to(self.device)
 
-    # Function to load and process the MP3 file using pydub
+    # Function to load and process the audio file using pydub
     def load_audio_file(self, file_path, target_sampling_rate=16000):
         max_duration = 10  # Max duration in seconds
 
         # Load the audio file using pydub
-        audio = AudioSegment.from_file(file_path, format="mp3")
+        audio = AudioSegment.from_file(file_path)
 
         # If audio is longer than max_duration, trim it
         if len(audio) > max_duration * 1000:  # Convert seconds to milliseconds
@@ -17,7 +17,7 @@
 import os
 import tempfile
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pytest
@@ -68,6 +68,24 @@ class TestAudioProcessing:
                 expected_file = os.path.join(output_directory, "chunk_0.1_0.2.mp3")
                 assert os.path.exists(expected_file)
 
+    @pytest.mark.parametrize("audio_format", ["wav", "flac"])
+    def test_cut_and_save_audio_format(self, audio_format):
+        audio = AudioSegment.silent(duration=1000, frame_rate=16000)
+        with tempfile.TemporaryDirectory() as output_directory:
+            chunk_path = audio_processing._cut_and_save_audio(
+                audio=audio,
+                utterance=dict(start=0.1, end=0.6),
+                prefix="chunk",
+                output_directory=output_directory,
+                audio_format=audio_format,
+            )
+
+            assert (
+                os.path.join(output_directory, f"chunk_0.1_0.6.{audio_format}")
+                == chunk_path
+            )
+            assert 500 == len(AudioSegment.from_file(chunk_path))
+
     def test_run_cut_and_save_audio(self):
         with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as temporary_file:
             silence_duration = 10
@@ -135,6 +153,37 @@ class TestAudioProcessing:
             tolerance = 1  # Allow for a 1-byte difference across platforms
             assert abs(expected_file_size - file_size) <= tolerance
 
+    def test_insert_audio_at_timestamps_from_memory(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            background_audio_file = f"{temporary_directory}/test_background.mp3"
+            AudioSegment.silent(duration=10000).export(
+                background_audio_file, format="mp3"
+            )
+            tone = AudioSegment(
+                data=bytes([0, 64] * 32000),
+                sample_width=2,
+                frame_rate=32000,
+                channels=1,
+            )
+            utterance_metadata = [
+                {
+                    "start": 3.0,
+                    "end": 5.0,
+                    "for_dubbing": True,
+                    "dubbed_path": f"{temporary_directory}/not_written.mp3",
+                }
+            ]
+            output_path = audio_processing.insert_audio_at_timestamps(
+                utterance_metadata=utterance_metadata,
+                background_audio_file=background_audio_file,
+                output_directory=temporary_directory,
+                dubbed_audio={utterance_metadata[0]["dubbed_path"]: tone},
+            )
+            output_audio = AudioSegment.from_file(output_path)
+
+            assert 0 == output_audio[:2900].max
+            assert output_audio[3100:3900].max > 0
+
     def test_mix_music_and_vocals(self):
         with tempfile.TemporaryDirectory() as temporary_directory:
             background_audio_path = f"{temporary_directory}/test_background.mp3"
@@ -182,3 +231,19 @@ class TestAudioProcessing:
             )
             assert not needs
             assert 0 == max_amplitude
+
+    def test_needs_background_normalization_reuses_decoded_audio(self):
+        samples = np.array([0, 1000, -16384, 200], dtype=np.int16)
+        background = AudioSegment(
+            data=samples.tobytes(), sample_width=2, frame_rate=44100, channels=1
+        )
+
+        with patch.object(AudioSegment, "from_file") as mock_from_file:
+            needs, max_amplitude = audio_processing._needs_background_normalization(
+                background_audio_file="not_decoded.mp3",
+                background_audio=background,
+            )
+
+        mock_from_file.assert_not_called()
+        assert needs
+        assert 0.5 == max_amplitude
@@ -0,0 +1,88 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from open_dubbing.audio_timeline import AudioTimeline
+from open_dubbing.pydub_audio_segment import AudioSegment
+
+
+class TestAudioTimeline:
+
+    def _get_segment(self, seconds, channels=2, frame_rate=44100, seed=0):
+        rng = np.random.default_rng(seed)
+        samples = rng.integers(
+            -20000, 20000, size=(int(frame_rate * seconds), channels), dtype=np.int16
+        )
+        return AudioSegment(
+            data=samples.tobytes(),
+            sample_width=2,
+            frame_rate=frame_rate,
+            channels=channels,
+        )
+
+    def test_same_output_as_overlay(self):
+        duration = 12.5
+        chunks = [
+            (self._get_segment(2.3, seed=1), 1000),
+            (self._get_segment(1.1, seed=2), 2500),  # Overlaps previous one
+            (self._get_segment(3.0, seed=3), 11000),  # Goes beyond the end
+            (self._get_segment(1.0, channels=1, frame_rate=22050, seed=4), 6000),
+        ]
+
+        expected = AudioSegment.silent(duration=duration * 1000)
+        for segment, position in chunks:
+            expected = expected.overlay(segment, position=position)
+
+        timeline = AudioTimeline(duration=duration)
+        for segment, position in chunks:
+            timeline.add(segment=segment, position=position)
+        result = timeline.to_audio_segment()
+
+        assert expected.frame_rate == result.frame_rate
+        assert expected.channels == result.channels
+        assert expected.sample_width == result.sample_width
+        assert expected.raw_data == result.raw_data
+
+    def test_add_widens_like_overlay(self):
+        duration = 5
+        chunks = [
+            (self._get_segment(1.0, channels=1, frame_rate=16000, seed=1), 500),
+            (self._get_segment(1.2, channels=2, frame_rate=22050, seed=2), 1000),
+            (self._get_segment(0.7, channels=1, frame_rate=44100, seed=3), 4800),
+        ]
+
+        expected = AudioSegment.silent(duration=duration * 1000)
+        timeline = AudioTimeline(duration=duration)
+        for segment, position in chunks:
+            expected = expected.overlay(segment, position=position)
+            timeline.add(segment=segment, position=position)
+        result = timeline.to_audio_segment()
+
+        assert expected.frame_rate == result.frame_rate
+        assert expected.channels == result.channels
+        assert expected.raw_data == result.raw_data
+
+    def test_no_segments(self):
+        timeline = AudioTimeline(duration=10)
+        result = timeline.to_audio_segment()
+
+        assert AudioSegment.silent(duration=10 * 1000) == result
+
+    def test_add_after_end(self):
+        timeline = AudioTimeline(duration=1, frame_rate=44100, channels=2)
+        timeline.add(segment=self._get_segment(1), position=2000)
+
+        assert 1000 == len(timeline)
+        assert 0 == timeline.to_audio_segment().max
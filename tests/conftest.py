@@ -0,0 +1,95 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+
+class StandInServer:
+    """Local HTTP server that answers requests with the given handler.
+
+    The handler receives the method, path, query or form parameters and body
+    of each request and returns the status code and either the bytes of the
+    body or a JSON serialisable response.
+    """
+
+    def __init__(self):
+        self.handler = lambda method, path, params, body: (404, {})
+        self.requests = []
+        self.connections = set()
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length) if length else b""
+                query = url.query
+                if self.headers.get("Content-Type") == FORM_CONTENT_TYPE:
+                    query = body.decode("utf-8")
+                params = {k: v[0] for k, v in parse_qs(query).items()}
+                with server._lock:
+                    server.requests.append((self.command, url.path, params, body))
+                    server.connections.add(self.client_address)
+
+                status, response = server.handler(self.command, url.path, params, body)
+                if isinstance(response, bytes):
+                    data, content_type = response, "application/octet-stream"
+                else:
+                    data = json.dumps(response).encode("utf-8")
+                    content_type = "application/json"
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._reply()
+
+            def do_POST(self):
+                self._reply()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}/"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stand_in_server():
+    server = StandInServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,83 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from open_dubbing.coqui import Coqui
+
+
+class TestCoqui:
+
+    MODELS = [
+        "tts_models/ca/custom/vits",
+        "tts_models/es/css10/vits",
+        "tts_models/fr/css10/vits",
+    ]
+
+    def _get_tts(self, size_mb):
+        parameter = MagicMock()
+        parameter.numel.return_value = size_mb * 1024**2
+        parameter.element_size.return_value = 1
+        tts = MagicMock()
+        tts.synthesizer.tts_model.parameters.return_value = [parameter]
+        tts.synthesizer.vocoder_model = None
+        return tts
+
+    @pytest.fixture
+    def mock_tts(self):
+        with patch("open_dubbing.coqui.TTS") as mock_tts:
+            mock_tts.list_models.return_value = self.MODELS
+            sizes = {"ca": 1000, "es": 2000, "fr": 5000}
+            mock_tts.side_effect = lambda model: MagicMock(
+                to=MagicMock(return_value=self._get_tts(sizes[model.split("/")[1]]))
+            )
+            yield mock_tts
+
+    def test_get_model_size_mb(self, mock_tts):
+        coqui = Coqui()
+        tts = self._get_tts(300)
+        tts.synthesizer.vocoder_model = tts.synthesizer.tts_model
+        assert 600 == coqui._get_model_size_mb(tts)
+
+    def test_get_model_reuses_loaded_model(self, mock_tts):
+        coqui = Coqui()
+
+        tts = coqui._get_model(self.MODELS[0])
+        assert tts is coqui._get_model(self.MODELS[0])
+        assert 1 == mock_tts.call_count
+
+    def test_get_model_evicts_least_recently_used(self, mock_tts):
+        coqui = Coqui(max_memory_mb=3500)
+
+        coqui._get_model(self.MODELS[0])
+        coqui._get_model(self.MODELS[1])
+        coqui._get_model(self.MODELS[0])
+        # Loading a second 2000 MB model goes over the budget
+        coqui._get_model(self.MODELS[1].replace("es/css10", "es/mai"))
+
+        assert [self.MODELS[0], "tts_models/es/mai/vits"] == list(coqui._models)
+        assert 3000 == coqui._get_used_memory_mb()
+
+    def test_get_model_keeps_one_model_over_budget(self, mock_tts):
+        coqui = Coqui(max_memory_mb=3500)
+
+        coqui._get_model(self.MODELS[0])
+        coqui._get_model(self.MODELS[2])
+
+        assert [self.MODELS[2]] == list(coqui._models)
+        tts = coqui._get_model(self.MODELS[2])
+        assert tts is coqui._models[self.MODELS[2]][0]
+        assert 2 == mock_tts.call_count
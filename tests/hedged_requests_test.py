@@ -0,0 +1,118 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from open_dubbing.hedged_requests import HedgedRequests
+
+
+class TestHedgedRequests:
+
+    def test_disabled(self):
+        hedged_requests = HedgedRequests(name="test")
+        function = MagicMock(return_value="ok")
+
+        assert "ok" == hedged_requests.call(function)
+        assert 1 == function.call_count
+
+    def test_set_max_workers(self):
+        hedged_requests = HedgedRequests(name="test", percentile=50, max_workers=2)
+        assert 4 == hedged_requests._executor._max_workers
+
+        hedged_requests.set_max_workers(12)
+        assert 24 == hedged_requests._executor._max_workers
+
+    def test_no_hedge_until_min_samples(self):
+        hedged_requests = HedgedRequests(name="test", percentile=50, min_samples=3)
+        function = MagicMock(return_value="ok")
+
+        for _ in range(3):
+            hedged_requests.call(function)
+
+        assert 3 == function.call_count
+        assert 0 == hedged_requests.hedges_sent
+
+    def test_hedge_wins(self):
+        hedged_requests = HedgedRequests(name="test", percentile=50, min_samples=1)
+        hedged_requests._add_latency(0.01)
+        release = threading.Event()
+        calls = []
+
+        def function():
+            calls.append(1)
+            if len(calls) == 1:
+                # The first request hangs until the test finishes
+                release.wait(5)
+                return "slow"
+            return "fast"
+
+        assert "fast" == hedged_requests.call(function)
+        release.set()
+        assert 1 == hedged_requests.hedges_sent
+        assert 1 == hedged_requests.hedges_won
+
+    def test_both_fail(self):
+        hedged_requests = HedgedRequests(name="test", percentile=50, min_samples=1)
+        hedged_requests._add_latency(0)
+        function = MagicMock(side_effect=OSError())
+
+        with pytest.raises(OSError):
+            hedged_requests.call(function)
+
+    def test_loser_result_closed(self):
+        hedged_requests = HedgedRequests(name="test", percentile=50, min_samples=1)
+        hedged_requests._add_latency(0.01)
+        release = threading.Event()
+        responses = [MagicMock(name="slow"), MagicMock(name="fast")]
+        calls = []
+
+        def function():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+                return responses[0]
+            return responses[1]
+
+        assert responses[1] is hedged_requests.call(function)
+        responses[0].close.assert_not_called()
+        release.set()
+        hedged_requests._executor.shutdown(wait=True)
+
+        # The response of the losing request is closed to free its connection
+        responses[0].close.assert_called_once()
+        responses[1].close.assert_not_called()
+
+    def test_loser_result_discarded(self):
+        hedged_requests = HedgedRequests(name="test", percentile=50, min_samples=1)
+        hedged_requests._add_latency(0.01)
+        release = threading.Event()
+        discarded = []
+        calls = []
+
+        def function():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(5)
+                return "slow"
+            return "fast"
+
+        assert "fast" == hedged_requests.call(function, discard=discarded.append)
+        release.set()
+        hedged_requests._executor.shutdown(wait=True)
+
+        assert ["slow"] == discarded
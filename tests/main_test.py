@@ -19,6 +19,7 @@ from unittest.mock import patch
 import pytest
 
 from open_dubbing.main import (
+    _get_intermediate_format,
     _get_openai_key,
     _get_selected_translator,
     _get_selected_tts,
@@ -70,6 +71,26 @@ class TestMain:
         assert excinfo.type is SystemExit
         assert excinfo.value.code == 109
 
+    @pytest.mark.parametrize(
+        "translator, max_request_chars, expected_max_request_chars",
+        [
+            ("apertium", None, 1000),
+            ("sotra", None, 0),
+            ("sotra", 500, 500),
+        ],
+    )
+    def test_get_selected_translator_max_request_chars(
+        self, translator, max_request_chars, expected_max_request_chars
+    ):
+        translation = _get_selected_translator(
+            translator,
+            "",
+            "server_url",
+            "cpu",
+            translation_max_request_chars=max_request_chars,
+        )
+        assert expected_max_request_chars == translation.max_request_chars
+
     def test_get_openai_key_key_is_defined(self):
         provided_key = "test_key_123"
         result = _get_openai_key(key=provided_key)
@@ -89,3 +110,20 @@ class TestMain:
 
         assert excinfo.type is SystemExit
         assert excinfo.value.code == 113
+
+    @pytest.mark.parametrize(
+        "intermediate_format, clean_intermediate_files, expected_format",
+        [
+            (None, True, "wav"),
+            (None, False, "mp3"),
+            ("flac", True, "flac"),
+            ("mp3", True, "mp3"),
+        ],
+    )
+    def test_get_intermediate_format(
+        self, intermediate_format, clean_intermediate_files, expected_format
+    ):
+        assert expected_format == _get_intermediate_format(
+            intermediate_format=intermediate_format,
+            clean_intermediate_files=clean_intermediate_files,
+        )
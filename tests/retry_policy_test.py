@@ -0,0 +1,166 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from open_dubbing.retry_policy import CircuitOpenError, RetryPolicy
+
+
+class TestRetryPolicy:
+
+    @patch("time.sleep", return_value=None)
+    def test_call_retries_with_backoff(self, mock_sleep):
+        policy = RetryPolicy(name="test", base_delay=1, max_delay=3)
+        function = MagicMock(side_effect=[OSError(), OSError(), "ok"])
+
+        with patch("random.uniform", side_effect=lambda low, high: high):
+            assert "ok" == policy.call(function)
+
+        assert 3 == function.call_count
+        assert [1, 2] == [call.args[0] for call in mock_sleep.call_args_list]
+
+    @patch("time.sleep", return_value=None)
+    def test_call_max_attempts(self, _):
+        policy = RetryPolicy(name="test", max_attempts=2)
+        function = MagicMock(side_effect=OSError())
+
+        with pytest.raises(OSError):
+            policy.call(function)
+
+        assert 2 == function.call_count
+
+    @patch("time.sleep", return_value=None)
+    def test_call_does_not_retry_other_exceptions(self, mock_sleep):
+        policy = RetryPolicy(name="test")
+        function = MagicMock(side_effect=KeyError())
+
+        with pytest.raises(KeyError):
+            policy.call(function, retry_on=(OSError,))
+
+        assert 1 == function.call_count
+        assert not mock_sleep.called
+
+    @patch("time.sleep", return_value=None)
+    def test_error_budget(self, _):
+        policy = RetryPolicy(name="test", error_budget=1, failure_threshold=10)
+        function = MagicMock(side_effect=[OSError(), "ok", OSError(), "ok"])
+
+        assert "ok" == policy.call(function)
+        with pytest.raises(OSError):
+            policy.call(function)
+
+    @patch("time.sleep", return_value=None)
+    def test_circuit_breaker(self, _):
+        policy = RetryPolicy(
+            name="test", max_attempts=3, failure_threshold=3, reset_timeout=60
+        )
+        function = MagicMock(side_effect=OSError())
+
+        with patch("time.monotonic", return_value=100):
+            with pytest.raises(OSError):
+                policy.call(function)
+            with pytest.raises(CircuitOpenError):
+                policy.call(function)
+
+        assert 3 == function.call_count
+
+        # After the reset timeout one call goes through and closes the circuit
+        function.side_effect = None
+        function.return_value = "ok"
+        with patch("time.monotonic", return_value=161):
+            assert "ok" == policy.call(function)
+
+    @patch("time.sleep", return_value=None)
+    def test_circuit_breaker_single_probe(self, _):
+        policy = RetryPolicy(
+            name="test", max_attempts=1, failure_threshold=1, reset_timeout=60
+        )
+        with patch("time.monotonic", return_value=100), pytest.raises(OSError):
+            policy.call(MagicMock(side_effect=OSError()))
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def probe():
+            started.set()
+            release.wait(5)
+            return "ok"
+
+        with patch("time.monotonic", return_value=161), ThreadPoolExecutor(
+            max_workers=1
+        ) as executor:
+            result = executor.submit(policy.call, probe)
+            started.wait(5)
+
+            # Only the probe reaches the endpoint while it is in flight
+            function = MagicMock(return_value="ok")
+            with pytest.raises(CircuitOpenError):
+                policy.call(function)
+            assert not function.called
+
+            release.set()
+            assert "ok" == result.result()
+            assert "ok" == policy.call(function)
+
+    @patch("time.sleep", return_value=None)
+    def test_circuit_breaker_probe_fails(self, _):
+        policy = RetryPolicy(
+            name="test", max_attempts=1, failure_threshold=1, reset_timeout=60
+        )
+        function = MagicMock(side_effect=OSError())
+        with patch("time.monotonic", return_value=100), pytest.raises(OSError):
+            policy.call(function)
+
+        with patch("time.monotonic", return_value=161):
+            with pytest.raises(OSError):
+                policy.call(function)
+            # The failed probe opens the circuit again
+            with pytest.raises(CircuitOpenError):
+                policy.call(function)
+
+        assert 2 == function.call_count
+
+    def test_circuit_breaker_probe_other_exception(self):
+        policy = RetryPolicy(
+            name="test", max_attempts=1, failure_threshold=1, reset_timeout=60
+        )
+        with patch("time.monotonic", return_value=100), pytest.raises(OSError):
+            policy.call(MagicMock(side_effect=OSError()))
+
+        with patch("time.monotonic", return_value=161):
+            with pytest.raises(KeyError):
+                policy.call(MagicMock(side_effect=KeyError()), retry_on=(OSError,))
+            # The probe ended without telling whether the endpoint is back
+            assert "ok" == policy.call(MagicMock(return_value="ok"))
+
+    def test_call_async(self):
+        policy = RetryPolicy(name="test")
+        results = [OSError(), "ok"]
+
+        async def function():
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with patch("asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            assert "ok" == asyncio.run(policy.call_async(function))
+
+        assert 1 == mock_sleep.call_count
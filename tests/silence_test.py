@@ -0,0 +1,110 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from open_dubbing.pydub_audio_segment import AudioSegment
+from open_dubbing.silence import remove_silence, trim_silence
+
+
+class TestSilence:
+
+    def _get_segment(self, parts, channels=1, frame_rate=16000):
+        """parts is a list of (seconds, is_loud)."""
+        rng = np.random.default_rng(0)
+        samples = []
+        for seconds, is_loud in parts:
+            frames = int(frame_rate * seconds)
+            if is_loud:
+                part = rng.integers(-20000, 20000, size=(frames, channels))
+            else:
+                part = rng.integers(-10, 10, size=(frames, channels))
+            samples.append(part.astype(np.int16))
+
+        return AudioSegment(
+            data=np.concatenate(samples).tobytes(),
+            sample_width=2,
+            frame_rate=frame_rate,
+            channels=channels,
+        )
+
+    def test_trim_silence(self):
+        audio = self._get_segment(
+            [(0.5, False), (1.0, True), (0.3, False), (1.0, True), (0.7, False)]
+        )
+
+        trimmed = trim_silence(audio)
+
+        assert 2300 == len(trimmed)
+        assert audio.raw_data[16000:].startswith(trimmed.raw_data)
+
+    def test_trim_silence_stereo(self):
+        audio = self._get_segment(
+            [(0.25, False), (0.5, True), (0.25, False)], channels=2
+        )
+
+        trimmed = trim_silence(audio)
+
+        assert 2 == trimmed.channels
+        assert 500 == len(trimmed)
+
+    @pytest.mark.parametrize(
+        "click_amplitude, expected_duration",
+        [
+            (328, 1000),  # -40 dB, above the threshold but not its 20 ms RMS
+            (32767, 1250),  # Full scale, its RMS stops the trim
+        ],
+    )
+    def test_trim_silence_click(self, click_amplitude, expected_duration):
+        audio = self._get_segment([(0.5, False), (1.0, True), (0.5, False)])
+        samples = np.frombuffer(audio.raw_data, dtype=np.int16).copy()
+        samples[:8000] = 0
+        # A single sample click 0.25 secs before the sound
+        samples[4000] = click_amplitude
+        audio = audio._spawn(samples.tobytes())
+
+        trimmed = trim_silence(audio)
+
+        assert expected_duration == len(trimmed)
+
+    def test_trim_silence_all_silent(self):
+        audio = self._get_segment([(1.0, False)])
+
+        assert 0 == len(trim_silence(audio))
+
+    def test_remove_silence(self):
+        audio = self._get_segment(
+            [
+                (0.5, False),
+                (1.0, True),
+                (0.3, False),
+                (1.0, True),
+                (0.05, False),
+                (1.0, True),
+                (0.7, False),
+            ]
+        )
+
+        removed = remove_silence(audio)
+
+        # The leading silence and the 0.05 secs gap are kept, the other runs are
+        # shortened to 0.1 secs plus the 0.02 secs it takes the RMS window to
+        # detect them, as ffmpeg does
+        assert 500 + 3000 + 50 + 2 * 120 == len(removed)
+
+    def test_remove_silence_no_silence(self):
+        audio = self._get_segment([(1.0, True)])
+
+        assert audio.raw_data == remove_silence(audio).raw_data
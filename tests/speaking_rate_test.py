@@ -0,0 +1,56 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from open_dubbing.speaking_rate import SpeakingRateModel
+
+
+class TestSpeakingRateModel:
+
+    def test_predict_duration(self):
+        model = SpeakingRateModel(min_samples=2)
+        # 10 characters per second at speed 1.0
+        model.add(voice="voice", text="Hello world", speed=1.0, duration=1.0)
+
+        assert model.predict_duration(voice="voice", text="Hello", speed=1.0) is None
+        assert 1 == model.get_needed_samples("voice")
+
+        model.add(voice="voice", text="abcde fghij", speed=2.0, duration=0.5)
+
+        assert 0.5 == pytest.approx(
+            model.predict_duration(voice="voice", text="Hello", speed=1.0)
+        )
+        assert 0.25 == pytest.approx(
+            model.predict_duration(voice="voice", text="Hello", speed=2.0)
+        )
+        assert model.predict_duration(voice="other", text="Hello", speed=1.0) is None
+
+    def test_persisted(self, tmp_path):
+        filename = str(tmp_path / "rates" / "speaking_rates.json")
+        model = SpeakingRateModel(filename=filename, min_samples=1)
+        model.add(voice="voice", text="Hello world", speed=1.0, duration=1.0)
+        model.save()
+
+        model = SpeakingRateModel(filename=filename, min_samples=1)
+        assert 0.5 == pytest.approx(
+            model.predict_duration(voice="voice", text="Hello", speed=1.0)
+        )
+
+    def test_ignores_empty_clips(self):
+        model = SpeakingRateModel(min_samples=1)
+        model.add(voice="voice", text=" ", speed=1.0, duration=1.0)
+        model.add(voice="voice", text="Hello", speed=1.0, duration=0)
+
+        assert 1 == model.get_needed_samples("voice")
@@ -12,22 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 import unittest.mock as mock
 
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
-from open_dubbing.text_to_speech_api import TextToSpeechAPI
-
+import pytest
+import requests
 
-class MockResponse:
-    def __init__(self, content, status_code=200):
-        self.content = content
-        self.status_code = status_code
+from open_dubbing.text_to_speech_api import TextToSpeechAPI
 
 
 class TestTextToSpeechAPI:
-    # Mock response class to simulate requests.get
-
     # Mock voices data that would be returned by the server
     mock_voices_data = [
         {"id": "voice1", "language": "cat", "gender": "female", "region": "US"},
@@ -51,58 +48,123 @@ class TestTextToSpeechAPI:
 
         assert languages == ["cat", "eng"]
 
-    # Path to a real .wav file that exists on your disk for testing
-    WAV_FILE_PATH = "/path/to/your/test.wav"
-
-    @mock.patch("requests.get")
-    @mock.patch.object(TextToSpeechAPI, "_convert_to_mp3")
-    def test_convert_text_to_speech(self, mock_convert_to_mp3, mock_requests_get):
-        tts_api = TextToSpeechAPI(server="http://dummyserver.com")
-
-        mock_requests_get.return_value = MockResponse(
-            bytes("dummy", "utf-8"), status_code=200
-        )
-
-        tts_api._convert_text_to_speech(
-            assigned_voice="test_voice",
-            target_language="en",
-            output_filename="None",
-            text="Hello, world!",
-            speed=1.0,
-        )
-
-        # Ensure requests.get was called with the correct URL
-        expected_url = (
-            "http://dummyserver.com/speak?voice=test_voice&text=Hello, world!"
+    def _get_speak_handler(self, failures=0):
+        calls = []
+
+        def handler(method, path, params, body):
+            calls.append(params)
+            if len(calls) <= failures:
+                return 500, {}
+            return 200, f"{params['voice']}:{params['text']}".encode("utf-8")
+
+        return handler
+
+    def _convert_text_to_speech(self, tts_api, output_filename, text):
+        def convert_to_mp3(input_file, output_mp3):
+            with open(input_file, "rb") as source, open(output_mp3, "wb") as target:
+                target.write(source.read())
+
+        with patch.object(
+            tts_api, "_convert_to_output_format", side_effect=convert_to_mp3
+        ):
+            return tts_api._convert_text_to_speech(
+                assigned_voice="test_voice",
+                target_language="en",
+                output_filename=output_filename,
+                text=text,
+                speed=1.0,
+            )
+
+    def test_convert_text_to_speech(self, stand_in_server, tmp_path):
+        stand_in_server.handler = self._get_speak_handler()
+        tts_api = TextToSpeechAPI(server=stand_in_server.url)
+        output_filename = str(tmp_path / "output.mp3")
+
+        self._convert_text_to_speech(tts_api, output_filename, "Hello, world & co!")
+
+        method, path, params, _ = stand_in_server.requests[0]
+        assert "POST" == method
+        assert "/speak" == path
+        assert {"voice": "test_voice", "text": "Hello, world & co!"} == params
+        with open(output_filename, "rb") as file:
+            assert b"test_voice:Hello, world & co!" == file.read()
+
+    def test_convert_text_to_speech_get_fallback(self, stand_in_server, tmp_path):
+        speak_handler = self._get_speak_handler()
+
+        def handler(method, path, params, body):
+            if method == "POST":
+                return 405, {}
+            return speak_handler(method, path, params, body)
+
+        stand_in_server.handler = handler
+        tts_api = TextToSpeechAPI(server=stand_in_server.url)
+
+        for i in range(2):
+            output_filename = str(tmp_path / f"output_{i}.mp3")
+            self._convert_text_to_speech(tts_api, output_filename, f"Hello {i} & co!")
+            with open(output_filename, "rb") as file:
+                assert f"test_voice:Hello {i} & co!".encode("utf-8") == file.read()
+
+        # Once POST is rejected the next requests use GET directly
+        assert ["POST", "GET", "GET"] == [
+            method for method, _, _, _ in stand_in_server.requests
+        ]
+        assert {"voice": "test_voice", "text": "Hello 1 & co!"} == (
+            stand_in_server.requests[-1][2]
         )
-        mock_requests_get.assert_called_once_with(expected_url)
-        assert mock_convert_to_mp3.called
 
     @mock.patch("time.sleep", return_value=None)
-    @mock.patch("requests.get")
-    @mock.patch.object(TextToSpeechAPI, "_convert_to_mp3")
-    def test_convert_text_to_speech_with_one_retry(
-        self, mock_convert_to_mp3, mock_requests_get, _
-    ):
-        tts_api = TextToSpeechAPI(server="http://dummyserver.com")
-
-        mock_requests_get.side_effect = [
-            MockResponse(bytes("dummy", "utf-8"), status_code=500),
-            MockResponse(bytes("dummy", "utf-8"), status_code=200),
-        ]
+    def test_convert_text_to_speech_with_one_retry(self, _, stand_in_server, tmp_path):
+        stand_in_server.handler = self._get_speak_handler(failures=1)
+        tts_api = TextToSpeechAPI(server=stand_in_server.url)
+        output_filename = str(tmp_path / "output.mp3")
 
-        tts_api._convert_text_to_speech(
-            assigned_voice="test_voice",
-            target_language="en",
-            output_filename="None",
-            text="Hello, world!",
-            speed=1.0,
-        )
+        self._convert_text_to_speech(tts_api, output_filename, "Hello, world!")
 
-        # Ensure requests.get was called twice with the correct URL
-        expected_url = (
-            "http://dummyserver.com/speak?voice=test_voice&text=Hello, world!"
-        )
-        assert mock_requests_get.call_count == 2
-        mock_requests_get.assert_called_with(expected_url)
-        assert mock_convert_to_mp3.called
+        assert 2 == len(stand_in_server.requests)
+        with open(output_filename, "rb") as file:
+            assert b"test_voice:Hello, world!" == file.read()
+
+    @mock.patch("time.sleep", return_value=None)
+    def test_convert_text_to_speech_stalled_server(self, _, stand_in_server, tmp_path):
+        stalled = threading.Event()
+
+        def handler(method, path, params, body):
+            stalled.wait(1)
+            return 200, b"audio"
+
+        stand_in_server.handler = handler
+        tts_api = TextToSpeechAPI(server=stand_in_server.url)
+
+        with patch(
+            "open_dubbing.text_to_speech_api.REQUEST_TIMEOUT", (1, 0.1)
+        ), pytest.raises(requests.exceptions.Timeout):
+            self._convert_text_to_speech(
+                tts_api, str(tmp_path / "output.mp3"), "Hello, world!"
+            )
+
+        assert tts_api.retry_policy.max_attempts == len(stand_in_server.requests)
+        stalled.set()
+
+    def test_convert_text_to_speech_keep_alive(self, stand_in_server, tmp_path):
+        stand_in_server.handler = self._get_speak_handler()
+        tts_api = TextToSpeechAPI(server=stand_in_server.url)
+        tts_api.set_max_workers(4)
+
+        def convert(i):
+            return tts_api._convert_text_to_speech(
+                assigned_voice="test_voice",
+                target_language="en",
+                output_filename=str(tmp_path / f"output_{i}.mp3"),
+                text=f"Text {i}",
+                speed=1.0,
+            )
+
+        with patch.object(tts_api, "_convert_to_output_format"), ThreadPoolExecutor(
+            max_workers=4
+        ) as executor:
+            list(executor.map(convert, range(20)))
+
+        assert 20 == len(stand_in_server.requests)
+        assert len(stand_in_server.connections) <= 4
@@ -0,0 +1,85 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+
+from open_dubbing.pydub_audio_segment import AudioSegment
+from open_dubbing.text_to_speech_bamborak import TextToSpeechBamborak
+
+
+class TestTextToSpeechBamborak:
+
+    def _get_wav(self):
+        frame_rate = 16000
+        rng = np.random.default_rng(0)
+        silence = np.zeros(int(frame_rate * 0.5), dtype=np.int16)
+        speech = rng.integers(-20000, 20000, size=frame_rate, dtype=np.int16)
+        samples = np.concatenate([silence, speech, silence, speech, silence])
+        audio = AudioSegment(
+            data=samples.tobytes(), sample_width=2, frame_rate=frame_rate, channels=1
+        )
+        wav = io.BytesIO()
+        audio.export(wav, format="wav")
+        return wav.getvalue()
+
+    def _convert(self, stand_in_server, tmp_path, method, keep_intermediate_files=True):
+        wav = self._get_wav()
+        stand_in_server.handler = lambda method, path, params, body: (200, wav)
+        tts = TextToSpeechBamborak(server=stand_in_server.url)
+        tts.set_keep_intermediate_files(keep_intermediate_files)
+        output_filename = str(tmp_path / "output.mp3")
+
+        result = getattr(tts, method)(
+            assigned_voice="katka_2025_07+timbre+happy",
+            target_language="hsb",
+            output_filename=output_filename,
+            text="Witaj",
+            speed=1.0,
+        )
+
+        assert output_filename == result
+        assert keep_intermediate_files == os.path.exists(output_filename)
+        return tts._load_audio(output_filename)
+
+    def test_convert_text_to_speech(self, stand_in_server, tmp_path):
+        audio = self._convert(stand_in_server, tmp_path, "_convert_text_to_speech")
+
+        _, _, _, body = stand_in_server.requests[0]
+        assert {
+            "text": "Witaj",
+            "speaker_id": "katka_2025_07",
+            "timbre_id": "timbre",
+            "emotion": "happy",
+        } == json.loads(body)
+        # Leading and trailing silence trimmed
+        assert abs(2500 - len(audio)) < 100
+
+    @pytest.mark.parametrize("keep_intermediate_files", [False, True])
+    def test_convert_text_to_speech_without_end_silence(
+        self, stand_in_server, tmp_path, keep_intermediate_files
+    ):
+        audio = self._convert(
+            stand_in_server,
+            tmp_path,
+            "_convert_text_to_speech_without_end_silence",
+            keep_intermediate_files,
+        )
+
+        # The silence in the middle is also shortened
+        assert abs(2120 - len(audio)) < 100
@@ -0,0 +1,86 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from open_dubbing.text_to_speech_cache import TextToSpeechCache, TextToSpeechCacheKey
+
+
+class TestTextToSpeechCache:
+
+    def _get_key(self, text="Hello", speed=1.0):
+        return TextToSpeechCacheKey(
+            engine="engine",
+            voice="voice+timbre+happy",
+            language="eng",
+            text=text,
+            speed=speed,
+        )
+
+    def _write(self, path, data):
+        with open(path, "wb") as file:
+            file.write(data)
+        return str(path)
+
+    def _read(self, path):
+        with open(path, "rb") as file:
+            return file.read()
+
+    def test_get_put(self, tmp_path):
+        cache = TextToSpeechCache(directory=str(tmp_path / "cache"))
+        clip = self._write(tmp_path / "clip.mp3", b"audio")
+        output = str(tmp_path / "output.mp3")
+
+        assert not cache.get(self._get_key(), output)
+        cache.put(self._get_key(), clip)
+        assert cache.get(self._get_key(), output)
+        assert not cache.get(self._get_key(speed=1.5), output)
+
+        assert b"audio" == self._read(output)
+        assert 1 == cache.hits
+        assert 2 == cache.misses
+
+    def test_extension_is_part_of_the_entry(self, tmp_path):
+        cache = TextToSpeechCache(directory=str(tmp_path / "cache"))
+        cache.put(self._get_key(), self._write(tmp_path / "clip.mp3", b"audio"))
+
+        assert not cache.get(self._get_key(), str(tmp_path / "output.wav"))
+
+    def test_persisted(self, tmp_path):
+        directory = str(tmp_path / "cache")
+        TextToSpeechCache(directory=directory).put(
+            self._get_key(), self._write(tmp_path / "clip.mp3", b"audio")
+        )
+
+        cache = TextToSpeechCache(directory=directory)
+        assert cache.get(self._get_key(), str(tmp_path / "output.mp3"))
+        assert 5 == cache._size
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = TextToSpeechCache(directory=str(tmp_path / "cache"), max_bytes=25)
+        output = str(tmp_path / "output.mp3")
+        for idx, text in enumerate(["one", "two", "three"]):
+            clip = self._write(tmp_path / "clip.mp3", b"x" * 10)
+            cache.put(self._get_key(text=text), clip)
+            # Make the modification times distinct and in insertion order
+            path = cache._get_path(self._get_key(text=text), ".mp3")
+            os.utime(path, (idx, idx))
+            if text == "two":
+                cache.get(self._get_key(text="one"), output)
+
+        assert cache.get(self._get_key(text="one"), output)
+        assert not cache.get(self._get_key(text="two"), output)
+        assert cache.get(self._get_key(text="three"), output)
+        assert 1 == cache.evictions
+        assert 20 == cache._size
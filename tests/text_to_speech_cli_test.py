@@ -14,6 +14,11 @@
 
 import os
 
+from unittest.mock import patch
+
+import pytest
+
+from open_dubbing.text_to_speech import SpeechRequest
 from open_dubbing.text_to_speech_cli import TextToSpeechCLI
 
 
@@ -58,3 +63,58 @@ class TestTextToSpeech:
             assigned_voice="myvoice", directory="dir", text="hello world"
         )
         assert "dir/spk_myvoice/synth.wav" == pattern
+
+    def _get_request(self, text):
+        return SpeechRequest(
+            assigned_voice="0",
+            target_language="cat",
+            output_filename=f"{text}.mp3",
+            text=text,
+            speed=1.0,
+        )
+
+    def test_convert_text_to_speech_batch(self):
+        self.tts.configuration["command"] = (
+            "mkdir -p {directory}/spk_{assigned_voice} && "
+            "echo {text} {directory} > {directory}/spk_{assigned_voice}/synth.wav"
+        )
+        self.tts.set_max_workers(3)
+        contents = {}
+
+        def convert_to_mp3(wav_file, output_filename):
+            with open(wav_file) as file:
+                contents[output_filename] = file.read().split()
+
+        with patch.object(
+            self.tts, "_convert_to_output_format", side_effect=convert_to_mp3
+        ):
+            dubbed_files = self.tts._convert_text_to_speech_batch(
+                requests=[self._get_request(text) for text in ["one", "two", "three"]]
+            )
+
+        assert ["one.mp3", "two.mp3", "three.mp3"] == dubbed_files
+        assert ["one", "two", "three"] == [contents[f][0] for f in dubbed_files]
+        # Every invocation has its own scratch directory, removed afterwards
+        directories = [contents[f][1] for f in dubbed_files]
+        assert 3 == len(set(directories))
+        assert not any(os.path.exists(directory) for directory in directories)
+
+    def test_convert_text_to_speech_batch_reports_failures(self):
+        self.tts.configuration["command"] = 'test "{text}" != "two"'
+
+        with patch.object(
+            self.tts, "_convert_to_output_format"
+        ) as mock_convert_to_mp3, patch(
+            "open_dubbing.text_to_speech_cli.logger"
+        ) as mock_logger:
+            with pytest.raises(RuntimeError, match="1 of 3 utterances"):
+                self.tts._convert_text_to_speech_batch(
+                    requests=[
+                        self._get_request(text) for text in ["one", "two", "three"]
+                    ]
+                )
+
+        assert 2 == mock_convert_to_mp3.call_count
+        errors = [call.args[0] for call in mock_logger().error.call_args_list]
+        assert 1 == len(errors)
+        assert "'two'" in errors[0]
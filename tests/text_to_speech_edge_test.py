@@ -0,0 +1,92 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from open_dubbing.text_to_speech import SpeechRequest
+from open_dubbing.text_to_speech_edge import TextToSpeechEdge
+
+
+class TestTextToSpeechEdge:
+
+    voices = [
+        {"ShortName": "ca-ES-JoanaNeural", "Gender": "Female", "Locale": "ca-ES"},
+        {"ShortName": "en-US-GuyNeural", "Gender": "Male", "Locale": "en-US"},
+    ]
+
+    @pytest.fixture(autouse=True)
+    def reset_voices(self):
+        TextToSpeechEdge._voices = None
+        yield
+        TextToSpeechEdge._voices = None
+
+    def test_get_available_voices_fetches_catalogue_once(self, tmp_path):
+        tts = TextToSpeechEdge(cache_directory=str(tmp_path))
+        with patch.object(
+            TextToSpeechEdge,
+            "_get_list_voices",
+            new=AsyncMock(return_value=self.voices),
+        ) as mock_list_voices, patch.object(
+            TextToSpeechEdge, "_get_iso_639_1", return_value="ca"
+        ):
+            voices = tts.get_available_voices("cat")
+            tts.get_available_voices("cat")
+            TextToSpeechEdge(cache_directory=str(tmp_path)).get_available_voices("cat")
+
+        assert ["ca-ES-JoanaNeural"] == [voice.name for voice in voices]
+        assert 1 == mock_list_voices.call_count
+        assert os.path.exists(tmp_path / "edge_voices.json")
+
+    def test_voices_disk_cache_ttl(self, tmp_path):
+        tts = TextToSpeechEdge(cache_directory=str(tmp_path), voices_cache_ttl=60)
+        tts._write_cached_voices(self.voices)
+
+        assert self.voices == tts._read_cached_voices()
+
+        old = os.path.getmtime(tts._get_voices_cache_filename()) - 120
+        os.utime(tts._get_voices_cache_filename(), (old, old))
+        assert tts._read_cached_voices() is None
+
+    def test_convert_text_to_speech_batch_concurrency(self):
+        tts = TextToSpeechEdge(max_concurrency=2)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def save(text, speed, assigned_voice, output_filename):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        requests = [
+            SpeechRequest(
+                assigned_voice="ca-ES-JoanaNeural",
+                target_language="cat",
+                output_filename=f"dubbed_{i}.mp3",
+                text=f"Text {i}",
+                speed=1.0,
+            )
+            for i in range(5)
+        ]
+        with patch.object(tts, "_save", side_effect=save):
+            dubbed_files = tts._convert_text_to_speech_batch(requests=requests)
+
+        assert [f"dubbed_{i}.mp3" for i in range(5)] == dubbed_files
+        assert 2 == max_in_flight
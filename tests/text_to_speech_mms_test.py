@@ -12,6 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from open_dubbing.text_to_speech import SpeechRequest
 from open_dubbing.text_to_speech_mms import TextToSpeechMMS
 
 
@@ -26,3 +31,67 @@ class TestTextToSpeechMMS:
         api = TextToSpeechMMS()
         languages = api.get_languages()
         assert len(languages) == 1074
+
+    def test_get_model_cached(self):
+        api = TextToSpeechMMS()
+        with patch.object(
+            api, "_load_model", side_effect=lambda language: (language, language)
+        ) as mock_load_model:
+            api.warm_up(target_language="cat")
+            model, tokenizer = api._get_model("cat")
+
+        mock_load_model.assert_called_once_with("cat")
+        assert ("cat", "cat") == (model, tokenizer)
+
+    def test_get_model_evicts_least_recently_used(self):
+        api = TextToSpeechMMS(max_cached_languages=2)
+        with patch.object(
+            api, "_load_model", side_effect=lambda language: (language, language)
+        ) as mock_load_model:
+            api._get_model("cat")
+            api._get_model("eng")
+            api._get_model("cat")
+            api._get_model("spa")
+            api._get_model("cat")
+
+        assert 3 == mock_load_model.call_count
+        assert ["spa", "cat"] == list(api._models.keys())
+
+    def test_get_batches(self):
+        api = TextToSpeechMMS(batch_size=2, max_batch_tokens=500)
+        batches = api._get_batches({0: 10, 1: 5, 2: 300, 3: 7})
+        assert [[1, 3], [0], [2]] == batches
+
+    def test_convert_text_to_speech_batch(self):
+        api = TextToSpeechMMS(batch_size=8)
+
+        tokenizer = MagicMock()
+        tokenizer.side_effect = lambda text, **kwargs: (
+            {"input_ids": list(text)} if isinstance(text, str) else MagicMock()
+        )
+        model = MagicMock()
+        model.config.sampling_rate = 16000
+        output = model.return_value
+        output.waveform.cpu.return_value.numpy.return_value = np.full(
+            (2, 100), 0.5, dtype=np.float32
+        )
+        output.sequence_lengths.cpu.return_value.numpy.return_value = np.array(
+            [40, 100]
+        )
+
+        requests = [
+            SpeechRequest("voice", "cat", "long.mp3", "Hello world", 1.0),
+            SpeechRequest("voice", "cat", "short.mp3", "Hi", 1.0),
+        ]
+        with patch.object(
+            api, "_get_model", return_value=(model, tokenizer)
+        ), patch.object(api, "_write_output") as mock_write_output:
+            result = api._convert_text_to_speech_batch(requests=requests)
+
+        assert ["long.mp3", "short.mp3"] == result
+        model.assert_called_once()
+        written = {
+            call.args[2]: len(call.args[0]) for call in mock_write_output.call_args_list
+        }
+        # Sorted by length, so "Hi" is the first waveform of the batch
+        assert {"short.mp3": 40, "long.mp3": 100} == written
@@ -15,14 +15,19 @@
 
 import os
 import tempfile
+import threading
+import time
 
 from typing import List
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
 
 from open_dubbing.pydub_audio_segment import AudioSegment
+from open_dubbing.speaking_rate import SpeakingRateModel
 from open_dubbing.text_to_speech import TextToSpeech, Voice
+from open_dubbing.text_to_speech_cache import TextToSpeechCache
 
 
 class TextToSpeechUT(TextToSpeech):
@@ -55,6 +60,31 @@ class TextToSpeechUT(TextToSpeech):
         pass
 
 
+class TextToSpeechSamplesUT(TextToSpeech):
+    """Engine that synthesizes 1 sec of tone followed by 0.5 secs of silence."""
+
+    def _convert_text_to_speech_samples(
+        self,
+        *,
+        assigned_voice: str,
+        target_language: str,
+        text: str,
+        speed: float,
+    ):
+        samples = np.zeros(24000, dtype=np.int16)
+        samples[:16000:2] = 16384
+        return samples, 16000
+
+    def _convert_text_to_speech(self, **kwargs) -> str:
+        pass
+
+    def get_available_voices(self, language_code: str) -> List[Voice]:
+        pass
+
+    def get_languages(self):
+        pass
+
+
 class TestTextToSpeech:
 
     @pytest.mark.parametrize(
@@ -137,10 +167,12 @@ class TestTextToSpeech:
             tts,
             "_convert_text_to_speech_without_end_silence",
             return_value="dubbed_file_path",
-        ), patch(
-            "open_dubbing.ffmpeg.FFmpeg.adjust_audio_speed"
+        ), patch.object(
+            tts, "_adjust_audio_speed"
         ) as mock_adjust_speed, patch.object(
             tts, "_calculate_target_utterance_speed", return_value=calculated_speed
+        ), patch.object(
+            tts, "_load_audio"
         ):
             result = tts.dub_utterances(
                 utterance_metadata=utterance_metadata,
@@ -171,10 +203,12 @@ class TestTextToSpeech:
             tts,
             "_convert_text_to_speech_without_end_silence",
             return_value="dubbed_file_path",
-        ), patch(
-            "open_dubbing.ffmpeg.FFmpeg.adjust_audio_speed"
+        ), patch.object(
+            tts, "_adjust_audio_speed"
         ) as mock_adjust_speed, patch.object(
             tts, "_calculate_target_utterance_speed", return_value=1.0
+        ), patch.object(
+            tts, "_load_audio"
         ):
             result = tts.dub_utterances(
                 utterance_metadata=utterance_metadata,
@@ -207,10 +241,12 @@ class TestTextToSpeech:
             tts,
             "_convert_text_to_speech_without_end_silence",
             return_value="dubbed_file_path",
-        ), patch(
-            "open_dubbing.ffmpeg.FFmpeg.adjust_audio_speed"
+        ), patch.object(
+            tts, "_adjust_audio_speed"
         ) as mock_adjust_speed, patch.object(
             tts, "_calculate_target_utterance_speed", return_value=NEW_SPEED
+        ), patch.object(
+            tts, "_load_audio"
         ):
             result = tts.dub_utterances(
                 utterance_metadata=utterance_metadata,
@@ -250,10 +286,12 @@ class TestTextToSpeech:
             tts,
             "_convert_text_to_speech_without_end_silence",
             return_value="dubbed_file_path",
-        ), patch(
-            "open_dubbing.ffmpeg.FFmpeg.adjust_audio_speed"
+        ), patch.object(
+            tts, "_adjust_audio_speed"
         ) as mock_adjust_speed, patch.object(
             tts, "_calculate_target_utterance_speed", return_value=NEW_SPEED
+        ), patch.object(
+            tts, "_load_audio"
         ):
             result = tts.dub_utterances(
                 utterance_metadata=utterance_metadata,
@@ -270,6 +308,326 @@ class TestTextToSpeech:
             assert utterance_metadata[0] == result[0]
             assert expected_medata[0] == result[1]
 
+    def test_dub_utterances_in_batch(self):
+        tts = TextToSpeechUT()
+
+        utterance_metadata = self._get_dub_metadata()
+        utterance_metadata[1]["path"] = "some/path/file2.mp3"
+
+        with patch.object(tts, "_supports_batching", return_value=True), patch.object(
+            tts,
+            "_convert_text_to_speech_batch",
+            return_value=["/output/dubbed_file.mp3", "/output/dubbed_file2.mp3"],
+        ) as mock_batch, patch.object(
+            tts, "_remove_end_silence", side_effect=lambda dubbed_file: dubbed_file
+        ), patch.object(
+            tts, "_convert_text_to_speech_without_end_silence"
+        ) as mock_single, patch.object(
+            tts, "_calculate_target_utterance_speed", return_value=1.0
+        ), patch.object(
+            tts, "_load_audio"
+        ):
+            result = tts.dub_utterances(
+                utterance_metadata=utterance_metadata,
+                output_directory="/output",
+                target_language="eng",
+                audio_file="",
+            )
+
+        mock_single.assert_not_called()
+        requests = mock_batch.call_args.kwargs["requests"]
+        assert ["Hello world", "How are you?"] == [r.text for r in requests]
+        assert "/output/dubbed_file.mp3" == result[0]["dubbed_path"]
+        assert "/output/dubbed_file2.mp3" == result[1]["dubbed_path"]
+
+    def test_convert_text_to_speech_without_end_silence_cached(self, tmp_path):
+        tts = TextToSpeechUT()
+        tts.set_cache(TextToSpeechCache(directory=str(tmp_path / "cache")))
+
+        def synthesize(**kwargs):
+            with open(kwargs["output_filename"], "w") as file:
+                file.write(kwargs["text"])
+            return kwargs["output_filename"]
+
+        def convert(output_filename, voice="voice+timbre+happy"):
+            return TextToSpeech._convert_text_to_speech_without_end_silence(
+                tts,
+                assigned_voice=voice,
+                target_language="hsb",
+                output_filename=str(tmp_path / output_filename),
+                text="Witaj",
+                speed=1.0,
+            )
+
+        with patch.object(
+            tts, "_synthesize_without_end_silence", side_effect=synthesize
+        ) as mock_synthesize:
+            convert("first.mp3")
+            cached = convert("second.mp3")
+            convert("third.mp3", voice="voice+timbre+sad")
+
+        assert 2 == mock_synthesize.call_count
+        assert str(tmp_path / "second.mp3") == cached
+        with open(cached) as file:
+            assert "Witaj" == file.read()
+        assert 1 == tts.cache.hits
+        assert 2 == tts.cache.misses
+
+    def test_dub_utterances_in_batch_cached(self, tmp_path):
+        tts = TextToSpeechUT()
+        tts.set_cache(TextToSpeechCache(directory=str(tmp_path / "cache")))
+        utterance_metadata = self._get_dub_metadata()
+        utterance_metadata[1]["path"] = "some/path/file2.mp3"
+
+        def convert_batch(requests):
+            for request in requests:
+                with open(request.output_filename, "w") as file:
+                    file.write(request.text)
+            return [request.output_filename for request in requests]
+
+        def dub(output_directory):
+            os.makedirs(output_directory)
+            return tts.dub_utterances(
+                utterance_metadata=utterance_metadata,
+                output_directory=output_directory,
+                target_language="eng",
+                audio_file="",
+            )
+
+        with patch.object(tts, "_supports_batching", return_value=True), patch.object(
+            tts, "_convert_text_to_speech_batch", side_effect=convert_batch
+        ) as mock_batch, patch.object(
+            tts, "_remove_end_silence", side_effect=lambda dubbed_file: dubbed_file
+        ), patch.object(
+            tts, "_calculate_target_utterance_speed", return_value=1.0
+        ), patch.object(
+            tts, "_load_audio"
+        ):
+            dub(str(tmp_path / "first"))
+            utterance_metadata[1]["translated_text"] = "How old are you?"
+            result = dub(str(tmp_path / "second"))
+
+        requests = mock_batch.call_args.kwargs["requests"]
+        assert ["How old are you?"] == [r.text for r in requests]
+        with open(result[0]["dubbed_path"]) as file:
+            assert "Hello world" == file.read()
+        assert str(tmp_path / "second") == os.path.dirname(result[0]["dubbed_path"])
+
+    def test_dub_utterances_deduplicates(self, tmp_path):
+        tts = TextToSpeechUT()
+        utterance_metadata = self._get_dub_metadata()
+        utterance_metadata[1]["path"] = "some/path/file2.mp3"
+        repeated = utterance_metadata[0].copy()
+        repeated.update({"id": 3, "start": 10, "end": 15, "path": "file3.mp3"})
+        utterance_metadata.append(repeated)
+
+        def convert(**kwargs):
+            with open(kwargs["output_filename"], "w") as file:
+                file.write(kwargs["text"])
+            return kwargs["output_filename"]
+
+        with patch.object(
+            tts, "_convert_text_to_speech_without_end_silence", side_effect=convert
+        ) as mock_convert, patch.object(
+            tts, "_calculate_target_utterance_speed", return_value=1.0
+        ), patch.object(
+            tts, "_load_audio"
+        ):
+            result = tts.dub_utterances(
+                utterance_metadata=utterance_metadata,
+                output_directory=str(tmp_path),
+                target_language="eng",
+                audio_file="",
+            )
+
+        assert ["Hello world", "How are you?"] == sorted(
+            call.kwargs["text"] for call in mock_convert.call_args_list
+        )
+        assert str(tmp_path / "dubbed_file3.mp3") == result[2]["dubbed_path"]
+        with open(result[2]["dubbed_path"]) as file:
+            assert "Hello world" == file.read()
+        assert result[0]["dubbed_path"] != result[2]["dubbed_path"]
+
+    @pytest.mark.parametrize(
+        "characters_per_second, expected_speeds",
+        [
+            (10, [2.0]),  # As learned, no second pass
+            (5, [2.0, 2.5]),  # Slower than learned, second pass
+        ],
+    )
+    def test_dub_utterances_predicted_speed(
+        self, characters_per_second, expected_speeds
+    ):
+        tts = TextToSpeechUT()
+        tts.set_speaking_rate_model(SpeakingRateModel(min_samples=1))
+        tts.speaking_rate.add(
+            voice="en_voice", text="0123456789", speed=1.0, duration=1.0
+        )
+        utterance_metadata = self._get_dub_metadata()[:1]
+        utterance_metadata[0]["end"] = 0.5
+        speeds = []
+
+        def convert(**kwargs):
+            speeds.append(kwargs["speed"])
+            return kwargs["output_filename"]
+
+        def load_audio(dubbed_file):
+            return Mock(duration_seconds=10 / characters_per_second / speeds[-1])
+
+        with patch.object(
+            tts, "_does_voice_supports_speeds", return_value=True
+        ), patch.object(
+            tts, "_convert_text_to_speech_without_end_silence", side_effect=convert
+        ), patch.object(
+            tts, "_load_audio", side_effect=load_audio
+        ):
+            result = tts.dub_utterances(
+                utterance_metadata=utterance_metadata,
+                output_directory="/output",
+                target_language="eng",
+                audio_file="",
+            )
+
+        assert expected_speeds == speeds
+        assert expected_speeds[-1] == result[0]["speed"]
+        assert 1 == tts.speaking_rate.predictions
+        assert len(expected_speeds) - 1 == tts.speaking_rate.misses
+
+    def test_dub_utterances_in_batch_warm_up(self):
+        tts = TextToSpeechUT()
+        tts.set_speaking_rate_model(SpeakingRateModel(min_samples=1))
+        utterance_metadata = self._get_dub_metadata()
+        utterance_metadata[1]["path"] = "some/path/file2.mp3"
+        utterance_metadata[1]["end"] = 5.5
+        batches = []
+
+        def convert_batch(requests):
+            batches.append([(r.text, r.speed) for r in requests])
+            return [r.output_filename for r in requests]
+
+        with patch.object(tts, "_supports_batching", return_value=True), patch.object(
+            tts, "_does_voice_supports_speeds", return_value=True
+        ), patch.object(
+            tts, "_convert_text_to_speech_batch", side_effect=convert_batch
+        ), patch.object(
+            tts, "_remove_end_silence", side_effect=lambda dubbed_file: dubbed_file
+        ), patch.object(
+            tts, "_load_audio", return_value=Mock(duration_seconds=1.0)
+        ):
+            tts.dub_utterances(
+                utterance_metadata=utterance_metadata,
+                output_directory="/output",
+                target_language="eng",
+                audio_file="",
+            )
+
+        # "Hello world" is said in 1 second, so "How are you?" needs 2 speed
+        assert [[("Hello world", 1.0)], [("How are you?", 2.0)]] == batches
+
+    def test_remove_end_silence(self, tmp_path):
+        tts = TextToSpeechUT()
+        tone = AudioSegment(
+            data=bytes([0, 64] * 8000),
+            sample_width=2,
+            frame_rate=16000,
+            channels=1,
+        )
+        silence = AudioSegment.silent(duration=1000, frame_rate=16000)
+        dubbed_file = str(tmp_path / "dubbed.wav")
+        tone._spawn(tone.raw_data + silence.raw_data + tone.raw_data).export(
+            dubbed_file, format="wav"
+        )
+
+        assert dubbed_file == tts._remove_end_silence(dubbed_file)
+
+        # The silence is shortened to 0.1 secs plus the 0.02 secs RMS window
+        assert 1120 == len(AudioSegment.from_file(dubbed_file))
+
+    def test_supports_samples(self):
+        assert not TextToSpeechUT()._supports_samples()
+        assert TextToSpeechSamplesUT()._supports_samples()
+
+    @pytest.mark.parametrize("keep_intermediate_files", [False, True])
+    def test_dub_utterances_samples(self, tmp_path, keep_intermediate_files):
+        tts = TextToSpeechSamplesUT()
+        tts.set_keep_intermediate_files(keep_intermediate_files)
+        utterance_metadata = self._get_dub_metadata()[:1]
+        utterance_metadata[0]["end"] = 0.5
+
+        result = tts.dub_utterances(
+            utterance_metadata=utterance_metadata,
+            output_directory=str(tmp_path),
+            target_language="eng",
+            audio_file="",
+        )
+
+        dubbed_path = result[0]["dubbed_path"]
+        # 1.12 secs without end silence in 0.5 secs
+        assert 2.3 == result[0]["speed"]
+        assert 487 == len(tts.dubbed_audio[dubbed_path])
+        assert keep_intermediate_files == os.path.exists(dubbed_path)
+        if keep_intermediate_files:
+            assert 487 == pytest.approx(len(AudioSegment.from_file(dubbed_path)), abs=1)
+
+    def test_get_output_filename_intermediate_format(self):
+        tts = TextToSpeechUT()
+        tts.set_intermediate_format("wav")
+        utterance = self._get_dub_metadata()[0]
+
+        assert os.path.join("/output", "dubbed_file.wav") == tts._get_output_filename(
+            utterance=utterance, output_directory="/output"
+        )
+
+    def test_convert_to_output_format_same_format(self, tmp_path):
+        tts = TextToSpeechUT()
+        wav_file = str(tmp_path / "synthesized.wav")
+        AudioSegment.silent(duration=500).export(wav_file, format="wav")
+        output_file = str(tmp_path / "dubbed.wav")
+
+        with patch("open_dubbing.text_to_speech.FFmpeg") as mock_ffmpeg:
+            tts._convert_to_output_format(wav_file, output_file)
+
+        mock_ffmpeg.assert_not_called()
+        assert not os.path.exists(wav_file)
+        assert 500 == len(AudioSegment.from_file(output_file))
+
+    def test_dub_utterances_parallel(self):
+        tts = TextToSpeechUT()
+        tts.set_max_workers(4)
+        utterance_metadata = []
+        for copy in range(3):
+            for utterance in self._get_dub_metadata():
+                utterance["translated_text"] += f" {copy}"
+                utterance_metadata.append(utterance)
+        threads = set()
+
+        def convert(**kwargs):
+            threads.add(threading.get_ident())
+            # Earlier utterances finish later to check that the order is kept
+            time.sleep(0.01 * (6 - len(threads)))
+            return kwargs["text"]
+
+        with patch.object(tts, "_is_thread_safe", return_value=True), patch.object(
+            tts, "_convert_text_to_speech_without_end_silence", side_effect=convert
+        ), patch.object(
+            tts, "_calculate_target_utterance_speed", return_value=1.0
+        ), patch.object(
+            tts, "_load_audio"
+        ):
+            result = tts.dub_utterances(
+                utterance_metadata=utterance_metadata,
+                output_directory="/output",
+                target_language="eng",
+                audio_file="",
+            )
+
+        assert [
+            f"{text} {copy}"
+            for copy in range(3)
+            for text in ["Hello world", "How are you?"]
+        ] == [utterance["dubbed_path"] for utterance in result]
+        assert len(threads) > 1
+
     @pytest.mark.parametrize(
         "test_name, utterance_metadata, expected_result",
         [
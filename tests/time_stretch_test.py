@@ -0,0 +1,63 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from open_dubbing.pydub_audio_segment import AudioSegment
+from open_dubbing.time_stretch import time_stretch, time_stretch_samples
+
+
+class TestTimeStretch:
+
+    def _get_tone(self, seconds=2, frequency=220, frame_rate=24000, channels=1):
+        time = np.arange(int(frame_rate * seconds)) / frame_rate
+        tone = 0.5 * np.sin(2 * np.pi * frequency * time)
+        return np.repeat(tone[:, None], channels, axis=1)
+
+    def _get_frequency(self, samples, frame_rate=24000):
+        spectrum = np.abs(np.fft.rfft(samples[:, 0]))
+        return np.fft.rfftfreq(len(samples), 1 / frame_rate)[np.argmax(spectrum)]
+
+    @pytest.mark.parametrize("speed", [1.1, 1.3, 1.7, 2.0, 2.5])
+    def test_duration_and_pitch(self, speed):
+        samples = self._get_tone()
+
+        stretched = time_stretch_samples(samples, frame_rate=24000, speed=speed)
+
+        assert round(len(samples) / speed) == len(stretched)
+        assert 220 == pytest.approx(self._get_frequency(stretched), abs=1)
+        assert 0.5 == pytest.approx(np.abs(stretched).max(), abs=0.01)
+
+    def test_same_speed(self):
+        samples = self._get_tone()
+
+        stretched = time_stretch_samples(samples, frame_rate=24000, speed=1.0)
+
+        assert np.array_equal(samples, stretched)
+
+    def test_time_stretch_audio_segment(self):
+        samples = self._get_tone(channels=2) * 32767
+        audio = AudioSegment(
+            data=samples.astype(np.int16).tobytes(),
+            sample_width=2,
+            frame_rate=24000,
+            channels=2,
+        )
+
+        stretched = time_stretch(audio, speed=2.0)
+
+        assert 2 == stretched.channels
+        assert 24000 == stretched.frame_rate
+        assert 1000 == len(stretched)
@@ -12,62 +12,111 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-
-from unittest.mock import MagicMock, patch
+import threading
+import time
 
 from open_dubbing.translation_apertium import TranslationApertium
 
 
 class TestTranslationApertium:
-    def test_translate_text(self):
+    def test_translate_text(self, stand_in_server):
+        stand_in_server.handler = lambda method, path, params, body: (
+            200,
+            {"responseData": {"translatedText": "Hola món"}},
+        )
         translation_apertium = TranslationApertium()
+        translation_apertium.set_server(stand_in_server.url)
 
-        with patch("urllib.request.urlopen") as mock_urlopen:
-            mock_response = MagicMock()
-            expected_response = {"responseData": {"translatedText": "Hola món"}}
-            mock_response.read.return_value = json.dumps(expected_response).encode(
-                "utf-8"
-            )
-            mock_urlopen.return_value = mock_response
-
-            # Test data
-            source_language = "eng"
-            target_language = "cat"
-            text = "Hello World"
-            translation_apertium.set_server("http://fake-server/")
-
-            translated_text = translation_apertium._translate_text(
-                source_language, target_language, text
-            )
+        translated_text = translation_apertium._translate_text(
+            "eng", "cat", "Hello World"
+        )
 
-            # Verify the correct URL is generated and check the translation result
-            mock_urlopen.assert_called_once_with(
-                "http://fake-server/translate?q=Hello+World&langpair=eng|cat&markUnknown=no"
-            )
-            assert translated_text == "Hola món"
-
-    def test_get_language_pairs(self):
-
-        translation_apertium = TranslationApertium()
+        assert translated_text == "Hola món"
+        method, path, params, _ = stand_in_server.requests[0]
+        assert "POST" == method
+        assert "/translate" == path
+        assert {
+            "q": "Hello World",
+            "langpair": "eng|cat",
+            "markUnknown": "no",
+        } == params
 
-        with patch("urllib.request.urlopen") as mock_urlopen:
-            mock_response = MagicMock()
-            expected_response = {
+    def test_get_language_pairs(self, stand_in_server):
+        stand_in_server.handler = lambda method, path, params, body: (
+            200,
+            {
                 "responseData": [
                     {"sourceLanguage": "eng", "targetLanguage": "cat"},
                     {"sourceLanguage": "cat", "targetLanguage": "fra"},
+                    {"sourceLanguage": "en", "targetLanguage": "ca"},
                 ]
+            },
+        )
+        translation_apertium = TranslationApertium()
+        translation_apertium.set_server(stand_in_server.url)
+
+        language_pairs = translation_apertium.get_language_pairs()
+
+        assert "/listPairs" == stand_in_server.requests[0][1]
+        assert language_pairs == {("eng", "cat"), ("cat", "fra")}
+
+    def test_translate_texts_concurrently(self, stand_in_server):
+        in_flight = 0
+        max_in_flight = 0
+        lock = threading.Lock()
+
+        def handler(method, path, params, body):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            # Later segments answer first to check that the order is kept
+            time.sleep(0.01 * (10 - int(params["q"])))
+            with lock:
+                in_flight -= 1
+            return 200, {"responseData": {"translatedText": f"T{params['q']}"}}
+
+        stand_in_server.handler = handler
+        translation_apertium = TranslationApertium(max_in_flight=3, max_request_chars=0)
+        translation_apertium.set_server(stand_in_server.url)
+        texts = [str(i) for i in range(10)]
+
+        translations = translation_apertium._translate_texts("eng", "cat", texts)
+
+        assert [f"T{i}" for i in range(10)] == translations
+        assert 1 < max_in_flight <= 3
+        # Connections are kept alive and reused between segments
+        assert len(stand_in_server.connections) <= 3
+
+    def test_translate_texts_packed(self, stand_in_server):
+        stand_in_server.handler = lambda method, path, params, body: (
+            200,
+            {"responseData": {"translatedText": params["q"].upper()}},
+        )
+        translation_apertium = TranslationApertium(max_request_chars=14)
+        translation_apertium.set_server(stand_in_server.url)
+        texts = ["Yes.", "No.", "Thanks", "Hello"]
+
+        translations = translation_apertium._translate_texts("eng", "cat", texts)
+
+        assert ["YES.", "NO.", "THANKS", "HELLO"] == translations
+        queries = sorted(params["q"] for _, _, params, _ in stand_in_server.requests)
+        assert ["Thanks\nHello", "Yes.\nNo."] == queries
+
+    def test_translate_texts_packed_count_mismatch(self, stand_in_server):
+        def handler(method, path, params, body):
+            # Joins the lines, so the segments cannot be split back
+            return 200, {
+                "responseData": {"translatedText": params["q"].replace("\n", " ")}
             }
-            mock_response.read.return_value = json.dumps(expected_response).encode(
-                "utf-8"
-            )
-            mock_urlopen.return_value = mock_response
-
-            # Set the server and get the language pairs
-            translation_apertium.set_server("http://fake-server/")
-            language_pairs = translation_apertium.get_language_pairs()
-
-            # Check that the correct URL is generated and assert the results
-            mock_urlopen.assert_called_once_with("http://fake-server/listPairs")
-            assert language_pairs == {("eng", "cat"), ("cat", "fra")}
+
+        stand_in_server.handler = handler
+        translation_apertium = TranslationApertium(max_request_chars=100)
+        translation_apertium.set_server(stand_in_server.url)
+
+        translations = translation_apertium._translate_texts(
+            "eng", "cat", ["Yes.", "No."]
+        )
+
+        assert ["Yes.", "No."] == translations
+        assert 3 == len(stand_in_server.requests)
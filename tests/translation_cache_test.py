@@ -0,0 +1,61 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import patch
+
+from open_dubbing.translation_cache import TranslationCache, TranslationCacheKey
+
+
+class TestTranslationCache:
+
+    def _get_key(self, text, engine="TranslationNLLB"):
+        return TranslationCacheKey(engine, "nllb-200-1.3B", "eng", "cat", text)
+
+    def test_get_all_and_put_all(self, tmp_path):
+        cache = TranslationCache(directory=str(tmp_path))
+        cache.put_all([(self._get_key("Hello"), "Hola")])
+
+        translations = cache.get_all(
+            [self._get_key("Hello"), self._get_key("Hello", engine="Other")]
+        )
+
+        assert ["Hola", None] == translations
+        assert 1 == cache.hits
+        assert 1 == cache.misses
+
+    def test_persistent(self, tmp_path):
+        cache = TranslationCache(directory=str(tmp_path))
+        cache.put_all([(self._get_key("Hello"), "Hola")])
+        cache.close()
+
+        cache = TranslationCache(directory=str(tmp_path))
+        assert ["Hola"] == cache.get_all([self._get_key("Hello")])
+
+    def test_normalize_text(self):
+        assert "Hello world" == TranslationCache.normalize_text(" Hello \n world ")
+
+    def test_evict_least_recently_used(self, tmp_path):
+        cache = TranslationCache(directory=str(tmp_path), max_entries=2)
+        with patch(
+            "open_dubbing.translation_cache.time.time", side_effect=[1, 2, 3, 4]
+        ):
+            cache.put_all([(self._get_key("One"), "U")])
+            cache.put_all([(self._get_key("Two"), "Dos")])
+            cache.get_all([self._get_key("One")])
+            cache.put_all([(self._get_key("Three"), "Tres")])
+
+        assert 2 == len(cache)
+        assert ["U", None, "Tres"] == cache.get_all(
+            [self._get_key("One"), self._get_key("Two"), self._get_key("Three")]
+        )
@@ -0,0 +1,110 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+
+from unittest.mock import MagicMock, patch
+
+from open_dubbing.translation_nllb_ctranslate2 import TranslationNLLBCTranslate2
+
+
+class TestTranslationNLLBCTranslate2:
+
+    def _get_tokenizer(self):
+        tokenizer = MagicMock()
+        tokenizer.additional_special_tokens = ["cat_Latn", "eng_Latn"]
+        tokenizer.encode.side_effect = lambda text: text.split()
+        tokenizer.convert_ids_to_tokens.side_effect = lambda ids: ids
+        tokenizer.convert_tokens_to_ids.side_effect = lambda tokens: tokens
+        tokenizer.decode.side_effect = lambda ids, skip_special_tokens: " ".join(ids)
+        return tokenizer
+
+    def test_translate_texts(self):
+        translation = TranslationNLLBCTranslate2(batch_size=4)
+        translation.tokenizer = self._get_tokenizer()
+        translator = MagicMock()
+        translator.translate_batch.side_effect = lambda sources, **kwargs: [
+            MagicMock(hypotheses=[["cat_Latn"] + [t.upper() for t in source]])
+            for source in sources
+        ]
+
+        with patch.object(translation, "_get_translator", return_value=translator):
+            translations = translation._translate_texts(
+                "eng", "cat", ["hello world", "bye"]
+            )
+
+        assert ["HELLO WORLD", "BYE"] == translations
+        assert "eng_Latn" == translation.tokenizer.src_lang
+        kwargs = translator.translate_batch.call_args.kwargs
+        assert [["cat_Latn"], ["cat_Latn"]] == kwargs["target_prefix"]
+        assert 4 == kwargs["max_batch_size"]
+
+    def _convert(self, output_dir, quantization, force=False):
+        # Like CTranslate2, force replaces an existing output directory
+        if force and os.path.exists(output_dir):
+            shutil.rmtree(output_dir)
+        os.makedirs(output_dir)
+        with open(os.path.join(output_dir, "model.bin"), "w") as file:
+            file.write("model")
+
+    def test_get_translator_converts_once(self, tmp_path):
+        with patch(
+            "open_dubbing.translation_nllb.TranslationNLLB._get_tokenizer_nllb"
+        ), patch(
+            "open_dubbing.translation_nllb_ctranslate2.ctranslate2"
+        ) as mock_ctranslate2:
+            converter = mock_ctranslate2.converters.TransformersConverter
+            converter.return_value.convert.side_effect = self._convert
+            translation = TranslationNLLBCTranslate2(
+                cpu_threads=3, models_directory=str(tmp_path)
+            )
+            translation.load_model("nllb-200-1.3B")
+            translation._get_translator("eng", "cat")
+            translation._get_translator("cat", "eng")
+
+        converter = mock_ctranslate2.converters.TransformersConverter
+        converter.assert_called_once_with("facebook/nllb-200-1.3B")
+        mock_ctranslate2.Translator.assert_called_once_with(
+            str(tmp_path / "nllb-200-1.3B-int8"),
+            device="cpu",
+            compute_type="int8",
+            intra_threads=3,
+        )
+
+    def test_get_translator_replaces_partial_conversion(self, tmp_path):
+        # Left behind by an interrupted conversion
+        model_path = tmp_path / "nllb-200-1.3B-int8"
+        model_path.mkdir()
+        (model_path / "config.json").write_text("{}")
+        temp_path = tmp_path / "nllb-200-1.3B-int8.tmp"
+        temp_path.mkdir()
+        (temp_path / "shared_vocabulary.json").write_text("[]")
+
+        with patch(
+            "open_dubbing.translation_nllb.TranslationNLLB._get_tokenizer_nllb"
+        ), patch(
+            "open_dubbing.translation_nllb_ctranslate2.ctranslate2"
+        ) as mock_ctranslate2:
+            converter = mock_ctranslate2.converters.TransformersConverter
+            converter.return_value.convert.side_effect = self._convert
+            translation = TranslationNLLBCTranslate2(models_directory=str(tmp_path))
+            translation.load_model("nllb-200-1.3B")
+            translation._get_translator("eng", "cat")
+
+        converter.return_value.convert.assert_called_once_with(
+            str(temp_path), quantization="int8", force=True
+        )
+        assert ["model.bin"] == sorted(os.listdir(model_path))
+        assert not temp_path.exists()
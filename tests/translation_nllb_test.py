@@ -66,3 +66,43 @@ class TestTranslationNLLB:
 
         assert len(pairs) == 6
         assert pairs == expected_pairs
+
+    def test_translate_texts_batches_by_length(self):
+        translation = TranslationNLLB(batch_size=2)
+        translation.tokenizer = MagicMock(
+            side_effect=lambda text: {"input_ids": text.split()}
+        )
+        translator = MagicMock(
+            side_effect=lambda texts, batch_size: [
+                {"translation_text": text.upper()} for text in texts
+            ]
+        )
+        texts = ["one two three", "one", "one two three four", "one two"]
+
+        with patch.object(translation, "_get_translator", return_value=translator):
+            translations = translation._translate_texts("eng", "cat", texts)
+
+        assert [text.upper() for text in texts] == translations
+        batches = [call.args[0] for call in translator.call_args_list]
+        assert [
+            ["one", "one two"],
+            ["one two three", "one two three four"],
+        ] == batches
+
+    def test_language_pairs_do_not_reload_tokenizer(self):
+        with patch(
+            "open_dubbing.translation_nllb.TranslationNLLB._get_tokenizer_nllb"
+        ) as mock_get_tokenizer_nllb:
+            mock_tokenizer = MagicMock()
+            mock_tokenizer.additional_special_tokens = ["cat_Latn", "eng_Latn"]
+            mock_get_tokenizer_nllb.return_value = mock_tokenizer
+
+            translation = TranslationNLLB()
+            translation.load_model()
+            pairs = translation.get_language_pairs()
+
+            assert ("cat", "eng") in pairs
+            assert ("cat", "cat") not in pairs
+            assert ("cat", "fra") not in pairs
+            assert translation._get_nllb_language("eng") == "eng_Latn"
+            assert mock_get_tokenizer_nllb.call_count == 1
@@ -0,0 +1,71 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from open_dubbing.translation_sotra import TranslationSotra
+
+
+class TestTranslationSotra:
+
+    def test_translate_texts(self, stand_in_server):
+        def handler(method, path, params, body):
+            text = json.loads(body)["text"]
+            return 200, {"translation": f"{text.upper()} "}
+
+        stand_in_server.handler = handler
+        translation_sotra = TranslationSotra(max_in_flight=2)
+        translation_sotra.set_server(stand_in_server.url)
+
+        translations = translation_sotra._translate_texts(
+            "deu", "hsb", ["eins", "zwei", "drei"]
+        )
+
+        assert ["EINS", "ZWEI", "DREI"] == translations
+        assert {"POST"} == {method for method, _, _, _ in stand_in_server.requests}
+        assert len(stand_in_server.connections) <= 2
+
+    def test_translate_texts_one_request_per_segment(self, stand_in_server):
+        def handler(method, path, params, body):
+            text = json.loads(body)["text"]
+            return 200, {"translation": text.upper()}
+
+        stand_in_server.handler = handler
+        translation_sotra = TranslationSotra()
+        translation_sotra.set_server(stand_in_server.url)
+
+        translations = translation_sotra._translate_texts(
+            "deu", "hsb", ["eins", "zwei", "drei"]
+        )
+
+        assert ["EINS", "ZWEI", "DREI"] == translations
+        texts = [json.loads(body)["text"] for _, _, _, body in stand_in_server.requests]
+        assert ["drei", "eins", "zwei"] == sorted(texts)
+
+    def test_translate_texts_packed(self, stand_in_server):
+        def handler(method, path, params, body):
+            text = json.loads(body)["text"]
+            return 200, {"translation": text.upper()}
+
+        stand_in_server.handler = handler
+        translation_sotra = TranslationSotra(max_request_chars=100)
+        translation_sotra.set_server(stand_in_server.url)
+
+        translations = translation_sotra._translate_texts(
+            "deu", "hsb", ["eins", "zwei", "drei"]
+        )
+
+        assert ["EINS", "ZWEI", "DREI"] == translations
+        texts = [json.loads(body)["text"] for _, _, _, body in stand_in_server.requests]
+        assert ["eins\nzwei\ndrei"] == texts
@@ -14,9 +14,12 @@
 
 """Tests for utility functions in translation.py."""
 
+from unittest.mock import patch
+
 import pytest
 
 from open_dubbing.translation import Translation
+from open_dubbing.translation_cache import TranslationCache
 
 
 class TranslationUT(Translation):
@@ -154,3 +157,38 @@ class TestTranslation:
             translated_script=translated_script,
         )
         assert updated_metadata == expected_translated_metadata
+
+    def test_translate_script_with_cache(self, tmp_path):
+        translation = TranslationUT()
+        translation.set_cache(TranslationCache(directory=str(tmp_path)))
+        script = "<BREAK>Hello<BREAK>World<BREAK>"
+
+        translation._translate_script(
+            script=script, source_language="eng", target_language="cat"
+        )
+        with patch.object(
+            translation, "_translate_text", side_effect=lambda **kwargs: "New"
+        ) as mock_translate_text:
+            result = translation._translate_script(
+                script="<BREAK>Hello<BREAK>Again<BREAK>",
+                source_language="eng",
+                target_language="cat",
+            )
+
+        assert "<BREAK>Hello<BREAK>New<BREAK>" == result
+        assert 1 == mock_translate_text.call_count
+        assert 1 == translation.cache.hits
+        assert 3 == translation.cache.misses
+
+    @pytest.mark.parametrize(
+        "texts, max_chars, expected_groups",
+        [
+            (["a", "b", "c"], 4, [["a", "b"], ["c"]]),
+            (["a", "long text", "b"], 4, [["a"], ["long text"], ["b"]]),
+            (["a", "b\nc", "d"], 100, [["a"], ["b\nc"], ["d"]]),
+            ([], 100, []),
+        ],
+    )
+    def test_pack_texts(self, texts, max_chars, expected_groups):
+        groups = TranslationUT()._pack_texts(texts, max_chars, "\n")
+        assert expected_groups == groups
@@ -0,0 +1,75 @@
+# Copyright 2025 Jordi Mas i Hernàndez <jmas@softcatala.org>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Compares the in-process time stretch with ffmpeg's atempo filter.
+#
+# When dubbing, the clip is already decoded to measure its duration, so the
+# in-process path is timed from the decoded clip to the written file and
+# the atempo path from the file on disk to the written file.
+#
+# Usage: python tools/benchmark_time_stretch.py [audio_file] [repetitions]
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from open_dubbing.ffmpeg import FFmpeg
+from open_dubbing.pydub_audio_segment import AudioSegment
+from open_dubbing.time_stretch import time_stretch
+
+SPEEDS = [1.1, 1.3, 1.5, 2.0, 2.5]
+FORMATS = ["mp3", "wav"]
+
+
+def _atempo(source, audio, speed, target):
+    shutil.copyfile(source, target)
+    FFmpeg().adjust_audio_speed(filename=target, speed=speed)
+
+
+def _in_process(source, audio, speed, target):
+    extension = os.path.splitext(target)[1][1:]
+    time_stretch(audio, speed=speed).export(target, format=extension)
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "tests/data/this_is_a_test.mp3"
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    audio = AudioSegment.from_file(filename)
+    duration = len(audio)
+    print(f"File: {filename} ({duration} ms), {repetitions} repetitions")
+    print("format | speed | method     | time per clip | duration | error")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in FORMATS:
+            source = os.path.join(directory, f"source.{extension}")
+            audio.export(source, format=extension)
+            target = os.path.join(directory, f"target.{extension}")
+            for speed in SPEEDS:
+                expected = duration / speed
+                for name, method in (("atempo", _atempo), ("in-process", _in_process)):
+                    start = time.perf_counter()
+                    for _ in range(repetitions):
+                        method(source, audio, speed, target)
+                    elapsed = (time.perf_counter() - start) / repetitions
+                    result = len(AudioSegment.from_file(target))
+                    error = result - expected
+                    print(
+                        f"{extension:6} | {speed:5.1f} | {name:10} | {elapsed * 1000:10.1f} ms | {result:5d} ms | {error:+6.1f} ms"
+                    )
+
+
+if __name__ == "__main__":
+    main()